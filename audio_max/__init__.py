@@ -8,31 +8,31 @@ bl_info = {
     "category": "Animation",
 }
 
-import bpy
+try:
+    import bpy
+except ImportError:
+    # Processos worker (core.batch) importam o pacote fora do Blender
+    bpy = None
 
-from .ui.panels import PANEL_CLASSES
-from .ui.operators import OPERATOR_CLASSES
-from .core import global_cache
+if bpy is not None:
+    from .ui.panels import PANEL_CLASSES
+    from .ui.operators import OPERATOR_CLASSES
 
-# detect_all_audio_hosts e detect_daw removidos daqui —
-# nunca foram usados diretamente neste arquivo e causavam
-# circular import na inicialização do addon
+    # detect_all_audio_hosts e detect_daw removidos daqui —
+    # nunca foram usados diretamente neste arquivo e causavam
+    # circular import na inicialização do addon
 
-CLASSES = (
-    *PANEL_CLASSES,
-    *OPERATOR_CLASSES,
-)
+    CLASSES = (
+        *PANEL_CLASSES,
+        *OPERATOR_CLASSES,
+    )
 
 
 def initialize_system():
     print("Audio Max: Inicializando sistema...")
 
-    def detect_daws_callback():
-        global_cache.update_daw_cache()
-        print("DAWs detectadas:", global_cache.get_cached_daws())
-        return None
-
-    bpy.app.timers.register(detect_daws_callback, first_interval=1.0)
+    # Nada pesado aqui: pydub, NumPy e a detecção de DAWs só carregam no
+    # primeiro uso (a detecção começa quando um painel mostra os hosts)
 
 
 def register():
@@ -46,6 +46,13 @@ def register():
 
 
 def unregister():
+    from .ui.operators import shutdown_jobs, stop_host_discovery
+    stop_host_discovery()
+    shutdown_jobs()
+
+    from .external.osc_pool import shutdown_pools
+    shutdown_pools()
+
     for cls in reversed(CLASSES):
         bpy.utils.unregister_class(cls)
 
@@ -0,0 +1,507 @@
+"""
+Linha de comando do Audio Max (fora do Blender).
+
+    python -m audio_max sons/ -o saida/ --step normalize --step gain:db=-3
+    python -m audio_max "sons/**/*.wav" --analyze silences:min_silence_len=300 --report rel.csv
+    python -m audio_max sons/ -o saida/ --chain cadeia.json --workers 8
+    python -m audio_max entregas/ -o r128/ --step loudness:target=-23 --analyze loudness
+
+Cadeia em JSON (para parâmetros que não cabem na linha, ex.: bandas):
+
+    {"steps":   [{"op": "highpass", "cutoff": 80}, {"op": "normalize"}],
+     "analyze": [{"op": "silences", "silence_thresh": -45}]}
+
+Arquivos cuja saída já está em dia (mesma entrada, mesma cadeia) são
+pulados; o estado fica em <saída>/.amax_manifest.json.
+"""
+import argparse
+import csv
+import glob
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+
+from .core.batch import default_workers, run_parallel
+from .core.chain import STAGES, ProcessingChain
+
+
+# -------------------------------------------------
+# REGISTRY
+# -------------------------------------------------
+# Passos: os estágios da core.chain (float32, decodifica/codifica uma vez).
+# Análises: nome na linha de comando -> (módulo, função), resolvido no
+# worker, então só o nome viaja entre processos.
+
+PROCESSORS = STAGES
+
+ANALYSES = {
+    "peaks": ("core.peaks", "detect_peak_regions"),
+    "clipping": ("core.peaks", "detect_clipping_regions"),
+    "silences": ("core.peaks", "detect_silences"),
+    "rms": ("core.peaks", "get_rms_over_time"),
+    "loudness": ("core.loudness", "measure_loudness"),
+}
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".ogg", ".opus", ".aif", ".aiff", ".m4a", ".aac", ".wma")
+
+MANIFEST_NAME = ".amax_manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_REPORT = "amax_report.json"
+
+
+def _resolve(registry: dict, op: str):
+    module, name = registry[op]
+    return getattr(importlib.import_module(f".{module}", __package__), name)
+
+
+# -------------------------------------------------
+# CHAIN SPEC
+# -------------------------------------------------
+
+def _parse_value(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_spec(text: str) -> dict:
+    """
+    "gain:db=-3" -> {"op": "gain", "db": -3}
+    "eq3:low_gain=2,high_gain=-1" -> {"op": "eq3", "low_gain": 2, "high_gain": -1}
+    """
+    op, _, params = text.partition(":")
+    spec = {"op": op.strip()}
+
+    for item in filter(None, (p.strip() for p in params.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"parâmetro sem valor em '{text}': {item}")
+        spec[key.strip()] = _parse_value(value.strip())
+
+    return spec
+
+
+def _validate(specs: list, registry: dict, kind: str):
+    for spec in specs:
+        if spec.get("op") not in registry:
+            known = ", ".join(sorted(registry))
+            raise ValueError(f"{kind} desconhecido: {spec.get('op')!r} (disponíveis: {known})")
+
+
+def chain_signature(steps: list, analyses: list) -> str:
+    """
+    Muda quando a cadeia ou os parâmetros mudam: saídas antigas deixam
+    de estar em dia.
+    """
+    payload = json.dumps({"steps": steps, "analyze": analyses}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _labels(specs: list) -> list:
+    """
+    Nome de cada análise no relatório (repetidas ganham #2, #3...).
+    """
+    labels, seen = [], {}
+    for spec in specs:
+        count = seen[spec["op"]] = seen.get(spec["op"], 0) + 1
+        labels.append(spec["op"] if count == 1 else f"{spec['op']}#{count}")
+    return labels
+
+
+# -------------------------------------------------
+# INPUTS
+# -------------------------------------------------
+
+def _glob_root(pattern: str) -> str:
+    """
+    Parte do padrão antes do primeiro curinga ("sons/**/*.wav" -> "sons").
+    """
+    parts = []
+    for part in os.path.normpath(pattern).split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+
+    root = os.sep.join(parts) or os.curdir
+    return root if os.path.isdir(root) else os.path.dirname(root) or os.curdir
+
+
+def _is_under(path: str, roots: list) -> bool:
+    return any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in roots)
+
+
+def collect_inputs(inputs: list, recursive: bool = True, extensions=AUDIO_EXTENSIONS,
+                   exclude=()) -> list:
+    """
+    Pastas, arquivos ou globs -> lista ordenada de (caminho, relativo).
+    O relativo define onde a saída fica dentro da pasta de saída.
+
+    Nada dentro de `exclude` (pastas ou arquivos) entra, nem em subpastas:
+    com a pasta de saída aqui, "in -o in/out" não reprocessa as saídas.
+    """
+    found = {}
+    exclude = [os.path.normcase(os.path.abspath(p)) for p in exclude]
+
+    def excluded(path):
+        return _is_under(os.path.normcase(os.path.abspath(path)), exclude)
+
+    for item in inputs:
+        if os.path.exists(item) and excluded(item):
+            raise ValueError(f"entrada dentro da pasta de saída: {item}")
+
+        if os.path.isdir(item):
+            root = item
+            if recursive:
+                paths = []
+                for directory, subdirs, files in os.walk(item):
+                    subdirs[:] = [d for d in subdirs if not excluded(os.path.join(directory, d))]
+                    paths.extend(os.path.join(directory, f) for f in files)
+            else:
+                paths = [os.path.join(item, f) for f in os.listdir(item)]
+        elif os.path.isfile(item):
+            root, paths = os.path.dirname(item) or os.curdir, [item]
+        else:
+            root, paths = _glob_root(item), glob.glob(item, recursive=True)
+
+        for path in paths:
+            if not os.path.isfile(path) or not path.lower().endswith(extensions):
+                continue
+            if excluded(path):
+                continue
+
+            path = os.path.abspath(path)
+            relative = os.path.relpath(path, os.path.abspath(root))
+
+            other = found.get(relative)
+            if other is not None and other != path:
+                raise ValueError(f"duas entradas geram a mesma saída '{relative}': {other} e {path}")
+            found[relative] = path
+
+    return sorted((path, relative) for relative, path in found.items())
+
+
+# -------------------------------------------------
+# MANIFEST
+# -------------------------------------------------
+
+def load_manifest(output_dir: str) -> dict:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_manifest(output_dir: str, files: dict):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    temp = f"{path}.tmp"
+
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": files}, f)
+    os.replace(temp, path)
+
+
+def _is_up_to_date(entry, path: str, output, signature: str) -> bool:
+    if not entry or entry.get("signature") != signature:
+        return False
+
+    stat = os.stat(path)
+    if entry.get("mtime_ns") != stat.st_mtime_ns or entry.get("size") != stat.st_size:
+        return False
+
+    return output is None or os.path.isfile(output)
+
+
+# -------------------------------------------------
+# WORKER
+# -------------------------------------------------
+
+def process_file(path: str, relative: str, output, steps: list, analyses: list) -> dict:
+    """
+    Executado no processo worker: carrega, roda a cadeia, exporta (se
+    houver passos) e roda as análises sobre o resultado.
+    """
+    from .core.audio_processing import load_audio, export_audio
+
+    started = time.perf_counter()
+    result = {"path": path, "relative": relative, "output": output, "status": "processed",
+              "error": None, "seconds": 0.0, "duration_ms": None, "analysis": {}, "timings": []}
+
+    try:
+        segment = load_audio(path)
+
+        if steps:
+            processing = ProcessingChain(steps)
+            segment = processing.process_segment(segment)
+            result["timings"] = processing.timings
+        result["duration_ms"] = len(segment)
+
+        if output:
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            # Escreve ao lado e troca: uma saída interrompida nunca
+            # parece "em dia" na próxima execução
+            partial = f"{output}.part"
+            export_audio(segment, path, partial)
+            os.replace(partial, output)
+
+        for label, spec in zip(_labels(analyses), analyses):
+            func = _resolve(ANALYSES, spec["op"])
+            result["analysis"][label] = func(segment, **{k: v for k, v in spec.items() if k != "op"})
+
+    except Exception as e:
+        result.update(status="failed", error=f"{type(e).__name__}: {e}",
+                      traceback=traceback.format_exc())
+
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+# -------------------------------------------------
+# RUN
+# -------------------------------------------------
+
+def run(inputs: list,
+        output_dir: str,
+        steps: list = (),
+        analyses: list = (),
+        workers: int = None,
+        force: bool = False,
+        recursive: bool = True,
+        progress=None,
+        exclude=()) -> list:
+    """
+    Processa tudo e retorna um resultado por arquivo (ordem dos caminhos).
+    status: "processed", "skipped" (já em dia) ou "failed".
+    A pasta de saída (e o que vier em `exclude`) nunca entra como entrada.
+    """
+    steps, analyses = list(steps), list(analyses)
+    _validate(steps, PROCESSORS, "passo")
+    _validate(analyses, ANALYSES, "análise")
+
+    output_dir = os.path.abspath(output_dir)
+    files = collect_inputs(inputs, recursive, exclude=[output_dir, *exclude])
+    signature = chain_signature(steps, analyses)
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = {} if force else load_manifest(output_dir)
+    results = [None] * len(files)
+    jobs, pending = [], []
+
+    for index, (path, relative) in enumerate(files):
+        output = os.path.join(output_dir, relative) if steps else None
+        if output and os.path.abspath(output) == path:
+            raise ValueError(f"a saída sobrescreveria a entrada: {path}")
+
+        entry = manifest.get(relative)
+        if _is_up_to_date(entry, path, output, signature):
+            results[index] = {"path": path, "relative": relative, "output": output,
+                              "status": "skipped", "error": None, "seconds": 0.0,
+                              "duration_ms": entry.get("duration_ms"),
+                              "analysis": entry.get("analysis", {})}
+            if progress:
+                progress(index + 1, len(files), results[index])
+            continue
+
+        jobs.append((path, relative, output, steps, analyses))
+        pending.append(index)
+
+    skipped = len(files) - len(jobs)
+
+    def report_progress(done, total, result):
+        if progress:
+            progress(skipped + done, len(files), result)
+
+    workers = workers or default_workers()
+    if workers == 1 or len(jobs) <= 1:
+        # Sem pool: mais fácil de depurar e sem custo de subir processos
+        processed = []
+        for done, job in enumerate(jobs, 1):
+            processed.append(process_file(*job))
+            report_progress(done, len(jobs), processed[-1])
+    else:
+        processed = run_parallel(process_file, jobs, workers=min(workers, len(jobs)),
+                                 progress=report_progress)
+
+    for index, result in zip(pending, processed):
+        result.setdefault("relative", files[index][1])
+        result.setdefault("status", "failed" if result.get("error") else "processed")
+        result.setdefault("analysis", {})
+        results[index] = result
+
+        path, relative = files[index]
+        if result["status"] == "processed":
+            stat = os.stat(path)
+            manifest[relative] = {"signature": signature, "mtime_ns": stat.st_mtime_ns,
+                                  "size": stat.st_size, "duration_ms": result.get("duration_ms"),
+                                  "analysis": result["analysis"]}
+        else:
+            manifest.pop(relative, None)
+
+    save_manifest(output_dir, manifest)
+    return results
+
+
+# -------------------------------------------------
+# REPORT
+# -------------------------------------------------
+
+def _summary(results: list, seconds: float) -> dict:
+    counts = {"processed": 0, "skipped": 0, "failed": 0}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    return {"files": len(results), **counts, "seconds": seconds}
+
+
+def write_report(path: str, results: list, meta: dict):
+    """
+    .csv: uma linha por arquivo (listas viram contagens; medições como
+    a de loudness viram uma coluna por valor, ex.: loudness.integrated).
+    Qualquer outra extensão: JSON completo, com os resultados das análises.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if path.lower().endswith(".csv"):
+        columns = _csv_columns(results)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["path", "output", "status", "seconds", "duration_ms", "error",
+                             *[f"{label}.{key}" if key else label for label, key in columns]])
+            for r in results:
+                analysis = r.get("analysis", {})
+                writer.writerow([r["path"], r.get("output") or "", r["status"],
+                                 f"{r.get('seconds', 0.0):.3f}", r.get("duration_ms") or "",
+                                 r.get("error") or "",
+                                 *[_csv_cell(analysis.get(label), key) for label, key in columns]])
+        return
+
+    files = [{k: v for k, v in r.items() if k != "traceback"} for r in results]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "files": files}, f, indent=2)
+
+
+def _csv_columns(results: list) -> list:
+    columns = {}
+    for r in results:
+        for label, value in r.get("analysis", {}).items():
+            keys = columns.setdefault(label, set())
+            if isinstance(value, dict):
+                keys.update(value)
+
+    return [(label, key) for label in sorted(columns)
+            for key in (sorted(columns[label]) or [None])]
+
+
+def _csv_cell(value, key):
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        cell = value.get(key)
+        return "" if cell is None else cell
+    return len(value)
+
+
+# -------------------------------------------------
+# MAIN
+# -------------------------------------------------
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m audio_max",
+        description="Processamento e análise em lote do Audio Max, sem Blender.",
+    )
+    parser.add_argument("inputs", nargs="+", help="pastas, arquivos ou globs (use aspas)")
+    parser.add_argument("-o", "--output-dir", default="amax_output",
+                        help="pasta de saída (padrão: ./amax_output)")
+    parser.add_argument("--step", action="append", default=[], metavar="OP[:k=v,...]",
+                        help="passo de processamento, em ordem: " + ", ".join(PROCESSORS))
+    parser.add_argument("--analyze", action="append", default=[], metavar="OP[:k=v,...]",
+                        help="análise sobre o resultado: " + ", ".join(ANALYSES))
+    parser.add_argument("--chain", help="JSON com {\"steps\": [...], \"analyze\": [...]}")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help=f"processos (padrão: {default_workers()})")
+    parser.add_argument("--report", help="relatório .json ou .csv (padrão: <saída>/amax_report.json)")
+    parser.add_argument("--force", action="store_true", help="reprocessa mesmo o que está em dia")
+    parser.add_argument("--no-recursive", dest="recursive", action="store_false",
+                        help="não desce em subpastas")
+    parser.add_argument("-q", "--quiet", action="store_true", help="só o resumo final")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log de debug do addon")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    from .utils.logging import set_debug, set_log_to_console
+    set_debug(args.verbose)
+    set_log_to_console(args.verbose)
+
+    try:
+        steps, analyses = [], []
+        if args.chain:
+            with open(args.chain, "r", encoding="utf-8") as f:
+                declared = json.load(f)
+            steps += declared.get("steps", [])
+            analyses += declared.get("analyze", [])
+
+        steps += [parse_spec(s) for s in args.step]
+        analyses += [parse_spec(a) for a in args.analyze]
+        _validate(steps, PROCESSORS, "passo")
+        _validate(analyses, ANALYSES, "análise")
+
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    if not steps and not analyses:
+        parser.error("nada a fazer: use --step, --analyze ou --chain")
+
+    def progress(done, total, result):
+        if args.quiet:
+            return
+        status = result.get("status") or ("failed" if result.get("error") else "processed")
+        line = f"[{done}/{total}] {status:<9} {result.get('relative', result['path'])}"
+        if status == "processed":
+            line += f" ({result['seconds']:.2f} s)"
+        elif status == "failed":
+            line += f": {result['error']}"
+        print(line, flush=True)
+
+    report = args.report or os.path.join(args.output_dir, DEFAULT_REPORT)
+
+    started = time.perf_counter()
+    try:
+        results = run(args.inputs, args.output_dir, steps, analyses,
+                      workers=args.workers, force=args.force,
+                      recursive=args.recursive, progress=progress, exclude=[report])
+    except (OSError, ValueError) as e:
+        print(f"erro: {e}", file=sys.stderr)
+        return 2
+
+    summary = _summary(results, time.perf_counter() - started)
+    write_report(report, results, {
+        "inputs": args.inputs,
+        "output_dir": os.path.abspath(args.output_dir),
+        "steps": steps,
+        "analyze": analyses,
+        "signature": chain_signature(steps, analyses),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "summary": summary,
+    })
+
+    print(f"{summary['files']} arquivos: {summary['processed']} processados, "
+          f"{summary['skipped']} em dia, {summary['failed']} com falha "
+          f"em {summary['seconds']:.1f} s. Relatório: {report}")
+
+    return 1 if summary["failed"] else 0
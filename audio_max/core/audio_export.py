@@ -1,8 +1,23 @@
 # core/audio_export.py
 import bpy
 import os
-from ..utils.paths import get_temp_dir
+import time
+import uuid
+from .scratch import get_scratch_store
 from ..utils.logging import info, error
+from ..utils.profiling import traced
+
+
+# Formatos do bpy.ops.sound.mixdown
+FORMAT_MAP = {
+    'WAV':  {'container': 'WAV',  'codec': 'PCM'},
+    'MP3':  {'container': 'MP3',  'codec': 'MP3'},
+    'FLAC': {'container': 'FLAC', 'codec': 'FLAC'},
+    'OGG':  {'container': 'OGG',  'codec': 'VORBIS'},
+}
+
+DEFAULT_MIXRATE = 44100
+DEFAULT_SAMPLE_FORMAT = 'S16'
 
 
 def get_audio_strips():
@@ -55,12 +70,34 @@ def get_free_channel():
     return channel
 
 
-def export_vse_audio(format='WAV'):
+@traced
+def export_vse_audio(format='WAV', filename=None, incremental=False):
     """
     Exporta os strips de áudio do VSE em WAV ou MP3.
     Usa bpy.ops.sound.mixdown() — método correto para áudio no Blender.
     Após exportar, adiciona o arquivo resultante de volta ao VSE
     no primeiro canal livre.
+    incremental=True re-renderiza só os trechos da timeline que mudaram
+    (ver core.incremental_mixdown).
+    Retorna o caminho do arquivo exportado ou None.
+    """
+    filepath = mixdown_vse_audio(format, filename, incremental)
+    if not filepath:
+        return None
+
+    # Adiciona o áudio exportado de volta ao VSE no primeiro canal livre
+    _add_audio_to_vse(filepath)
+
+    return filepath
+
+
+@traced
+def mixdown_vse_audio(format='WAV', filename=None, incremental=False,
+                      mixrate=DEFAULT_MIXRATE, sample_format=DEFAULT_SAMPLE_FORMAT):
+    """
+    Só a parte de render: bpy.ops.sound.mixdown() para a área de rascunho
+    (core.scratch), com nome único e escrita atômica.
+    sample_format: S16, S24, S32, F32... (enum `format` do mixdown).
     Retorna o caminho do arquivo exportado ou None.
     """
     strips = get_audio_strips()
@@ -68,52 +105,24 @@ def export_vse_audio(format='WAV'):
         error("Nenhum áudio encontrado no VSE")
         return None
 
-    # Cria caminho temporário
-    temp_dir = get_temp_dir()
-    os.makedirs(temp_dir, exist_ok=True)
-
     format_upper = format.upper()
-    filename = f"audiomax_export.{format.lower()}"
-    filepath = os.path.join(temp_dir, filename)
-
-    FORMAT_MAP = {
-        'WAV':  {'container': 'WAV',  'codec': 'PCM'},
-        'MP3':  {'container': 'MP3',  'codec': 'MP3'},
-        'FLAC': {'container': 'FLAC', 'codec': 'FLAC'},
-        'OGG':  {'container': 'OGG',  'codec': 'VORBIS'},
-    }
-
     if format_upper not in FORMAT_MAP:
         error(f"Formato não suportado: {format}. Use WAV, MP3, FLAC ou OGG.")
         return None
 
     fmt = FORMAT_MAP[format_upper]
+    filepath = _scratch_path(format.lower(), filename)
 
     try:
-        result = bpy.ops.sound.mixdown(
-            filepath=filepath,
-            check_existing=False,
-            relative_path=False,
-            accuracy=1024,
-            container=fmt['container'],
-            codec=fmt['codec'],
-            format='S16',
-            mixrate=44100,
-        )
-
-        if 'FINISHED' not in result:
-            error(f"mixdown retornou: {result}")
-            return None
-
-        if not os.path.exists(filepath):
-            error(f"Arquivo não foi gerado em: {filepath}")
-            return None
+        with get_scratch_store().write(filepath) as part:
+            if incremental:
+                from .incremental_mixdown import incremental_mixdown
+                if not incremental_mixdown(part, mixrate=mixrate, sample_format=sample_format):
+                    raise RuntimeError("mixdown incremental falhou")
+            else:
+                _mixdown(part, fmt, mixrate, sample_format)
 
         info(f"Áudio exportado para {filepath}")
-
-        # Adiciona o áudio exportado de volta ao VSE no primeiro canal livre
-        _add_audio_to_vse(filepath)
-
         return filepath
 
     except Exception as e:
@@ -121,6 +130,46 @@ def export_vse_audio(format='WAV'):
         return None
 
 
+def _mixdown(filepath, fmt, mixrate, sample_format):
+    result = bpy.ops.sound.mixdown(
+        filepath=filepath,
+        check_existing=False,
+        relative_path=False,
+        accuracy=1024,
+        container=fmt['container'],
+        codec=fmt['codec'],
+        format=sample_format,
+        mixrate=mixrate,
+    )
+
+    if 'FINISHED' not in result:
+        raise RuntimeError(f"mixdown retornou: {result}")
+
+    if not os.path.exists(filepath):
+        raise RuntimeError(f"Arquivo não foi gerado em: {filepath}")
+
+
+def _scratch_path(ext, filename=None):
+    """
+    Caminho de saída na área de rascunho. Antes de gravar, atualiza a
+    lista de arquivos usados pelo VSE (não podem ser despejados).
+    """
+    store = get_scratch_store()
+    store.sync_references(vse_sound_paths())
+
+    if filename:
+        return os.path.join(store.directory, filename)
+    return store.new_path(ext, "audiomax_export")
+
+
+def vse_sound_paths():
+    """
+    Arquivos usados por sons do .blend (strips de som de todas as cenas).
+    """
+    return [bpy.path.abspath(sound.filepath) for sound in bpy.data.sounds if sound.filepath]
+
+
+@traced
 def _add_audio_to_vse(filepath: str):
     """
     Adiciona o arquivo de áudio exportado ao VSE
@@ -142,6 +191,187 @@ def _add_audio_to_vse(filepath: str):
         )
 
         info(f"Áudio adicionado ao VSE no canal {channel}")
+        get_scratch_store().sync_references(vse_sound_paths())
 
     except Exception as e:
-        error(f"Erro ao adicionar áudio ao VSE: {str(e)}")
\ No newline at end of file
+        error("Erro ao adicionar áudio ao VSE: %s", e)
+
+
+# -------------------------------------------------
+# BACKGROUND JOB
+# -------------------------------------------------
+
+def create_export_job(format='WAV', steps=None, daw_path=None, incremental=False):
+    """
+    Monta o job de exportação em etapas para a fila (core.jobs):
+    - Mixdown       (thread principal, bpy; por segmento se incremental)
+    - Post-process  (thread worker, opcional: cadeia de core.batch)
+    - Add to VSE    (thread principal, bpy)
+    - Send to DAW   (thread worker, opcional)
+    """
+    from .jobs import Job, Stage
+
+    ext = format.lower()
+
+    def mixdown(job):
+        if incremental:
+            return incremental_stage(job, _scratch_path(ext))
+
+        path = mixdown_vse_audio(format)
+        if not path:
+            raise RuntimeError("Falha ao exportar o áudio")
+        job.data["audio_file"] = path
+        return path
+
+    def incremental_stage(job, filepath):
+        # Um segmento por tick: a UI redesenha e o cancelamento vale entre segmentos
+        from .incremental_mixdown import iter_incremental_mixdown
+
+        if not get_audio_strips():
+            raise RuntimeError("Nenhum áudio encontrado no VSE")
+
+        with get_scratch_store().write(filepath) as part:
+            yield from iter_incremental_mixdown(part)
+
+        job.data["audio_file"] = filepath
+        return filepath
+
+    stages = [Stage("Mixdown", mixdown, weight=3.0)]
+
+    if steps:
+        from .batch import chain
+        steps = chain(*steps)
+        stages.append(Stage("Post-process", lambda job: _post_process(job, steps), threaded=True, weight=2.0))
+
+    stages.append(Stage("Add to VSE", _add_to_vse_stage, weight=0.2))
+
+    if daw_path:
+        stages.append(Stage("Send to DAW", lambda job: _send_to_daw(job, daw_path), threaded=True, weight=0.2))
+
+    return Job(f"Export {format.upper()}", stages, data={"kind": "export", "daw_path": daw_path})
+
+
+def create_multi_export_job(targets, steps=None, daw_path=None, incremental=False, workers=None):
+    """
+    Exporta vários formatos com um único render da timeline:
+    - Mixdown       (thread principal: master WAV float no maior sample rate pedido)
+    - Post-process  (thread worker, opcional: aplicado uma vez, no master)
+    - Encode        (thread worker: um ffmpeg por formato, em paralelo)
+    - Add to VSE    (thread principal: o primeiro formato)
+    - Send to DAW   (thread worker, opcional)
+
+    targets: formatos ("FLAC") ou dicts com sample_rate / bit_depth /
+    float / bitrate por formato (ver core.export_targets.parse_target).
+    Tempo de cada formato em job.data["timings"] (segundos).
+    """
+    from .jobs import Job, Stage
+    from .export_targets import encode_targets, master_layout, parse_target, plan_outputs
+
+    targets = [parse_target(t) for t in targets]
+    if not targets:
+        raise ValueError("Nenhum formato de exportação")
+
+    mixrate, sample_format = master_layout(targets)
+    token = uuid.uuid4().hex[:12]
+
+    def mixdown(job):
+        filename = f"audiomax_master_{token}.wav"
+        job.data["started"] = time.perf_counter()
+
+        if incremental:
+            return incremental_stage(job, _scratch_path("wav", filename))
+
+        path = mixdown_vse_audio('WAV', filename=filename, mixrate=mixrate, sample_format=sample_format)
+        if not path:
+            raise RuntimeError("Falha ao exportar o áudio")
+        return finish_master(job, path)
+
+    def incremental_stage(job, filepath):
+        from .incremental_mixdown import iter_incremental_mixdown
+
+        if not get_audio_strips():
+            raise RuntimeError("Nenhum áudio encontrado no VSE")
+
+        with get_scratch_store().write(filepath) as part:
+            yield from iter_incremental_mixdown(part, mixrate=mixrate, sample_format=sample_format)
+
+        return finish_master(job, filepath)
+
+    def finish_master(job, path):
+        job.data["audio_file"] = job.data["master"] = path
+        job.data["timings"] = {"render": time.perf_counter() - job.data.pop("started")}
+        return path
+
+    def encode(job):
+        master = job.data["audio_file"]
+        plan = plan_outputs(targets, os.path.dirname(master), f"audiomax_export_{token}")
+
+        def progress(fraction):
+            job.report(fraction)
+            job.check_cancelled()  # encerra os ffmpeg em andamento
+
+        results = encode_targets(master, plan, workers, progress=progress)
+
+        for result in results:
+            job.data["timings"][result["label"]] = result["seconds"]
+
+        failed = [r for r in results if r["error"]]
+        if len(failed) == len(results):
+            raise RuntimeError(f"Nenhum formato foi gerado: {failed[0]['error']}")
+
+        # Só serviam de fonte para os encodes: o master float e, com
+        # pós-processamento, a cópia _processed (que é o `master` aqui)
+        for path in {master, job.data["master"]}:
+            if os.path.exists(path):
+                os.remove(path)
+        job.data["audio_file"] = next(r["output"] for r in results if not r["error"])
+        job.data["outputs"] = results
+        return results
+
+    stages = [Stage("Mixdown", mixdown, weight=3.0)]
+
+    if steps:
+        from .batch import chain
+        steps = chain(*steps)
+        stages.append(Stage("Post-process", lambda job: _post_process(job, steps), threaded=True, weight=2.0))
+
+    stages.append(Stage("Encode", encode, threaded=True, weight=2.0))
+    stages.append(Stage("Add to VSE", _add_to_vse_stage, weight=0.2))
+
+    if daw_path:
+        stages.append(Stage("Send to DAW", lambda job: _send_to_daw(job, daw_path), threaded=True, weight=0.2))
+
+    name = "Export " + " + ".join(t["format"] for t in targets)
+    return Job(name, stages, data={"kind": "export", "daw_path": daw_path, "targets": targets})
+
+
+def _post_process(job, steps):
+    from .audio_processing import load_audio, export_audio
+    from .batch import run_chain
+
+    path = job.data["audio_file"]
+    segment = load_audio(path)
+    job.report(0.3)
+    job.check_cancelled()
+
+    processed = run_chain(segment, steps)
+    job.report(0.7)
+    job.check_cancelled()
+
+    stem, suffix = os.path.splitext(path)
+    output = export_audio(processed, path, f"{stem}_processed{suffix}")
+    job.data["audio_file"] = output
+    return output
+
+
+def _add_to_vse_stage(job):
+    _add_audio_to_vse(job.data["audio_file"])
+    return job.data["audio_file"]
+
+
+def _send_to_daw(job, daw_path):
+    import subprocess
+
+    subprocess.Popen([daw_path, job.data["audio_file"]])
+    info("Áudio enviado para %s", daw_path)
+    return daw_path
\ No newline at end of file
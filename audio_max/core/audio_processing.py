@@ -1,42 +1,105 @@
+from __future__ import annotations
+
 import os
-import tempfile
-from pydub import AudioSegment
+import time
+import uuid
+from typing import TYPE_CHECKING
+
+from .result_cache import get_result_cache, operation_name
+from .scratch import get_scratch_store
+from .streaming import DEFAULT_BLOCK_FRAMES, iter_blocks, probe_audio, stream_process
+from .wavfile import WavWriter, load_segment, open_wav, write_segment
+from ..utils.profiling import traced
+
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 
 # -------------------------------------------------
 # LOAD
 # -------------------------------------------------
 
-def load_audio(path: str) -> AudioSegment:
+@traced
+def load_audio(path: str, start_ms: float = None, end_ms: float = None) -> AudioSegment:
     """
     Carrega qualquer formato suportado pelo ffmpeg.
+
+    WAV (PCM, float, RF64) é lido direto pelo core.wavfile, sem ffmpeg;
+    com start_ms/end_ms só o trecho pedido é lido do disco.
+    """
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+
+    segment = load_segment(path, start_ms, end_ms)
+    if segment is not None:
+        return segment
+
+    from pydub import AudioSegment
+    segment = AudioSegment.from_file(path)
+
+    if start_ms is None and end_ms is None:
+        return segment
+    return segment[start_ms or 0:end_ms]
+
+
+def load_audio_stream(path: str, block_frames: int = DEFAULT_BLOCK_FRAMES):
+    """
+    Versão em streaming de load_audio para arquivos longos.
+    Retorna (info, gerador de blocos float32 (frames, canais)).
     """
     if not path or not os.path.exists(path):
         raise FileNotFoundError(f"Arquivo não encontrado: {path}")
 
-    return AudioSegment.from_file(path)
+    info = probe_audio(path)
+    blocks = iter_blocks(path, block_frames, info["sample_rate"], info["channels"])
+
+    return info, blocks
 
 
 # -------------------------------------------------
 # EXPORT
 # -------------------------------------------------
 
-def export_audio(segment: AudioSegment, original_path: str) -> str:
+@traced
+def export_audio(segment: AudioSegment, original_path: str, output_path: str = None) -> str:
     """
     Exporta o áudio processado mantendo formato original.
-    Retorna o novo caminho.
+    Sem output_path, grava na área de rascunho (core.scratch).
+    A escrita é atômica. Retorna o novo caminho.
     """
+    ext = _output_format(original_path)
+    output_path = output_path or _output_path(ext)
+
+    with get_scratch_store().write(output_path) as part:
+        if ext == "wav":
+            write_segment(segment, part)
+        else:
+            segment.export(part, format=ext)
+
+    return output_path
+
+
+def _output_format(original_path: str) -> str:
     ext = os.path.splitext(original_path)[1].replace(".", "").lower()
+    return ext or "wav"
 
-    if not ext:
-        ext = "wav"
 
-    temp_dir = tempfile.gettempdir()
-    output_path = os.path.join(temp_dir, f"amax_processed.{ext}")
+def _output_path(ext: str, key: str = None) -> str:
+    return get_scratch_store().new_path(ext, "amax_processed", key)
 
-    segment.export(output_path, format=ext)
 
-    return output_path
+def unique_output_path(original_path: str, output_dir: str = None) -> str:
+    """
+    Caminho de saída exclusivo por job (evita que jobs paralelos
+    sobrescrevam o mesmo arquivo). Sem output_dir, na área de rascunho.
+    """
+    ext = _output_format(original_path)
+    stem = os.path.splitext(os.path.basename(original_path))[0]
+
+    if not output_dir:
+        return get_scratch_store().new_path(ext, f"amax_{stem}")
+
+    return os.path.join(output_dir, f"amax_{stem}_{uuid.uuid4().hex[:8]}.{ext}")
 
 
 # -------------------------------------------------
@@ -47,6 +110,15 @@ def normalize(segment: AudioSegment) -> AudioSegment:
     return segment.normalize()
 
 
+def normalize_loudness(segment: AudioSegment, target: float = -23.0, true_peak: float = -1.0) -> AudioSegment:
+    """
+    Normaliza por loudness integrado (EBU R128) em vez do pico, com teto
+    de true peak em dBTP. Ver core.loudness.
+    """
+    from .loudness import normalize_loudness as _normalize_loudness
+    return _normalize_loudness(segment, target, true_peak)
+
+
 def apply_gain(segment: AudioSegment, db: float) -> AudioSegment:
     return segment + db
 
@@ -59,6 +131,7 @@ def trim(segment: AudioSegment, start_ms: int, end_ms: int) -> AudioSegment:
 # SAFE PROCESS WRAPPER
 # -------------------------------------------------
 
+@traced
 def process_safe(path: str, processor_func, *args, **kwargs) -> str:
     """
     Wrapper seguro:
@@ -68,4 +141,118 @@ def process_safe(path: str, processor_func, *args, **kwargs) -> str:
     """
     segment = load_audio(path)
     processed = processor_func(segment, *args, **kwargs)
-    return export_audio(processed, path)
\ No newline at end of file
+    return export_audio(processed, path)
+
+
+@traced
+def process_chain(path: str, steps, output_path: str = None) -> str:
+    """
+    Vários passos com uma única decodificação e uma única codificação:
+
+        process_chain(path, [{"op": "normalize"}, {"op": "eq3", "low_gain": 2},
+                             {"op": "gain", "db": -3}])
+
+    steps: lista de passos ou um core.chain.ProcessingChain. Os tempos
+    por estágio (incluindo "decode" e "encode") ficam em chain.timings.
+    Entre os passos tudo é float32; WAV mantém a resolução original.
+    """
+    from .chain import ProcessingChain
+
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+
+    chain = steps if isinstance(steps, ProcessingChain) else ProcessingChain(steps)
+    ext = _output_format(path)
+    output_path = output_path or _output_path(ext, _chain_key(path, chain))
+
+    started = time.perf_counter()
+    wav = open_wav(path)
+
+    if wav is not None and ext == "wav":
+        with wav:
+            samples = wav.read_float()
+            layout = (wav.sample_rate, wav.channels, wav.sample_width, wav.is_float)
+        decoded = time.perf_counter()
+
+        processed = chain.process(samples, layout[0])
+
+        encoding = time.perf_counter()
+        with get_scratch_store().write(output_path) as part:
+            with WavWriter(part, *layout) as writer:
+                writer.write(processed)
+    else:
+        if wav is not None:
+            wav.close()
+        segment = load_audio(path)
+        decoded = time.perf_counter()
+
+        processed = chain.process_segment(segment)
+
+        encoding = time.perf_counter()
+        export_audio(processed, path, output_path)
+
+    chain.timings.insert(0, {"stage": "decode", "ms": (decoded - started) * 1000, "frames": None})
+    chain.timings.append({"stage": "encode", "ms": (time.perf_counter() - encoding) * 1000, "frames": None})
+
+    return output_path
+
+
+def _chain_key(path: str, chain) -> str:
+    """
+    Nome pelo conteúdo só para cadeias declarativas (dicts/tuplas):
+    funções e Stages não têm uma representação estável.
+    """
+    if all(isinstance(step, (dict, tuple, list)) for step in chain.steps):
+        return get_scratch_store().make_key(path, "process_chain", chain.steps)
+    return None
+
+
+@traced
+def process_stream(path: str, stages, block_frames: int = DEFAULT_BLOCK_FRAMES) -> str:
+    """
+    Equivalente em streaming de process_safe:
+    - decodifica em blocos pelo pipe do ffmpeg
+    - passa cada bloco pelos estágios (ver core.streaming)
+    - codifica a saída incrementalmente
+
+    O pico de memória depende de block_frames, não da duração do arquivo.
+    """
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+
+    output_path = _output_path(_output_format(path))
+
+    with get_scratch_store().write(output_path) as part:
+        stream_process(path, part, stages, block_frames)
+
+    return output_path
+
+
+@traced
+def process_cached(path: str, processor_func, *args, **kwargs) -> str:
+    """
+    process_safe com cache: se o mesmo conteúdo já foi processado com o
+    mesmo processor_func e argumentos, retorna o arquivo já gerado.
+    """
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+
+    cache = get_result_cache()
+    ext = _output_format(path)
+    key = cache.make_key(
+        path,
+        operation_name(processor_func),
+        {"args": args, "kwargs": kwargs},
+    )
+    if key is None:
+        # lambda/closure ou parâmetros sem representação estável
+        return process_safe(path, processor_func, *args, **kwargs)
+
+    cached = cache.get_file(key, ext)
+    if cached:
+        return cached
+
+    output_path = process_safe(path, processor_func, *args, **kwargs)
+    cached = cache.put_file(key, output_path, ext)
+    os.remove(output_path)  # a cópia do cache é a que fica
+    return cached
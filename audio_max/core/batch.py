@@ -0,0 +1,159 @@
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from ..utils.logging import info, error
+
+
+# -------------------------------------------------
+# CHAIN
+# -------------------------------------------------
+
+def chain(*steps) -> tuple:
+    """
+    Monta uma cadeia de processamento serializável (picklable).
+
+    Cada passo pode ser:
+    - func
+    - (func, args)
+    - (func, args, kwargs)
+
+    As funções precisam ser de nível de módulo (ex.: normalize,
+    apply_gain, core.eq.apply_3band_eq) para irem ao processo worker.
+    """
+    normalized = []
+
+    for step in steps:
+        if callable(step):
+            normalized.append((step, (), {}))
+            continue
+
+        func, args, kwargs = (tuple(step) + ((), {}))[:3]
+        normalized.append((func, tuple(args), dict(kwargs)))
+
+    return tuple(normalized)
+
+
+def run_chain(segment, steps):
+    for func, args, kwargs in steps:
+        segment = func(segment, *args, **kwargs)
+    return segment
+
+
+# -------------------------------------------------
+# WORKER
+# -------------------------------------------------
+
+def _run_job(path: str, steps, output_dir: str) -> dict:
+    """
+    Executado no processo worker: carrega, processa, exporta.
+    Qualquer erro vira parte do resultado, não derruba o lote.
+    """
+    from .audio_processing import load_audio, export_audio, unique_output_path
+
+    started = time.perf_counter()
+    try:
+        segment = load_audio(path)
+        processed = run_chain(segment, steps)
+        output = export_audio(processed, path, unique_output_path(path, output_dir))
+
+        return {"path": path, "output": output, "error": None,
+                "seconds": time.perf_counter() - started}
+
+    except Exception as e:
+        return {"path": path, "output": None,
+                "error": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(),
+                "seconds": time.perf_counter() - started}
+
+
+# -------------------------------------------------
+# BATCH
+# -------------------------------------------------
+
+def default_workers() -> int:
+    """
+    Deixa um núcleo livre para o Blender.
+    """
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def process_batch(paths: list,
+                  steps,
+                  workers: int = None,
+                  progress=None,
+                  output_dir: str = None) -> list:
+    """
+    Processa vários arquivos em paralelo (ProcessPoolExecutor).
+
+    steps: cadeia criada com chain(...)
+    progress: callback(done, total, result) chamado no processo atual
+    output_dir: pasta de saída (padrão: temp do sistema)
+
+    Retorna uma lista de resultados na MESMA ordem de `paths`:
+    {"path", "output", "error", "seconds"}
+    """
+    steps = chain(*steps)
+
+    if paths and output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    return run_parallel(
+        _run_job,
+        [(path, steps, output_dir) for path in paths],
+        workers=workers,
+        progress=progress,
+    )
+
+
+def run_parallel(worker, jobs: list, workers: int = None, progress=None) -> list:
+    """
+    Roda worker(*job) para cada job em um ProcessPoolExecutor.
+
+    worker: função de nível de módulo que retorna um dict com "path"
+    e "error" (None quando deu certo)
+    jobs: lista de tuplas de argumentos; job[0] é o caminho do arquivo
+
+    Retorna os resultados na MESMA ordem de `jobs`.
+    """
+    total = len(jobs)
+    results = [None] * total
+
+    if not total:
+        return results
+
+    workers = workers or default_workers()
+    info("Lote: %s arquivos em %s processos", total, workers)
+
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(worker, *job): index
+            for index, job in enumerate(jobs)
+        }
+
+        for future in as_completed(futures):
+            index = futures[future]
+            path = jobs[index][0]
+
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                result = {"path": path, "output": None,
+                          "error": f"Worker encerrado: {e}", "seconds": 0.0}
+            except Exception as e:
+                result = {"path": path, "output": None,
+                          "error": f"{type(e).__name__}: {e}", "seconds": 0.0}
+
+            if result["error"]:
+                error("Falha em %s: %s", path, result['error'])
+
+            results[index] = result
+            done += 1
+
+            if progress:
+                progress(done, total, result)
+
+    return results
@@ -0,0 +1,431 @@
+"""
+Cadeia de processamento em float32, em memória.
+
+    chain = ProcessingChain([
+        {"op": "highpass", "cutoff": 80},
+        {"op": "eq3", "low_gain": 2.0},
+        {"op": "gain", "db": -3},
+        {"op": "normalize"},
+    ])
+    samples = chain.process(samples, sample_rate)   # (frames, canais) float32
+    chain.timings                                   # tempo por estágio
+
+Decodifica uma vez, quantiza uma vez: entre os estágios nada é
+arredondado para inteiro nem cortado em 0 dBFS. Antes de rodar, os
+estágios são fundidos:
+- ganhos seguidos viram um só;
+- ganho depois de um filtro/EQ entra na escala de saída dele (e antes,
+  na de entrada — são lineares);
+- biquads seguidos viram uma cascata única (uma passada);
+- ganho logo antes de normalize/loudness é descartado (eles reescalam tudo).
+"""
+import time
+
+import numpy as np
+
+from .crossover import bands_to_crossovers, db_to_gain, run_filterbank
+from .filters import (
+    SOSFilter,
+    design_lowpass,
+    design_highpass,
+    design_peaking,
+    design_lowshelf,
+    design_highshelf,
+    design_notch,
+)
+from .fir import FIR_TAPS, design_fir, fir_filter
+from ..utils.logging import debug
+from ..utils.profiling import span
+
+
+# -------------------------------------------------
+# STAGES
+# -------------------------------------------------
+
+class Stage:
+    """
+    Um passo da cadeia. process() pode alterar `samples` no lugar.
+    """
+
+    name = "stage"
+    linear = False  # comuta com um ganho escalar (pode absorvê-lo)
+
+    def __init__(self):
+        self.fused = []
+
+    @property
+    def label(self) -> str:
+        return "+".join([self.name, *self.fused])
+
+    def absorb(self, other) -> bool:
+        """
+        Tenta incorporar o estágio seguinte; True se conseguiu.
+        """
+        if isinstance(other, GainStage) and self.linear:
+            self.scale(other.factor)
+            return True
+        return False
+
+    def scale(self, factor: float):
+        raise NotImplementedError
+
+    def process(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        raise NotImplementedError
+
+
+class GainStage(Stage):
+    name = "gain"
+    linear = True
+
+    def __init__(self, db: float):
+        super().__init__()
+        self.factor = db_to_gain(db)
+
+    def scale(self, factor: float):
+        self.factor *= factor
+
+    def process(self, samples, sample_rate):
+        if self.factor != 1.0:
+            samples *= np.float32(self.factor)
+        return samples
+
+
+class NormalizeStage(Stage):
+    """
+    Mesmo alvo do AudioSegment.normalize: pico em -headroom dBFS.
+    Um ganho depois dele só muda o fator final.
+    """
+
+    name = "normalize"
+
+    def __init__(self, headroom: float = 0.1):
+        super().__init__()
+        self.headroom = headroom
+        self.post_gain = 1.0
+
+    def absorb(self, other) -> bool:
+        if isinstance(other, GainStage):
+            self.post_gain *= other.factor
+            return True
+        if isinstance(other, NormalizeStage):
+            self.headroom, self.post_gain = other.headroom, other.post_gain
+            return True
+        return False
+
+    def process(self, samples, sample_rate):
+        peak = float(np.max(np.abs(samples))) if samples.size else 0.0
+        if peak == 0.0:
+            return samples
+
+        samples *= np.float32(db_to_gain(-self.headroom) / peak * self.post_gain)
+        return samples
+
+
+class LoudnessStage(Stage):
+    """
+    Loudness integrado no alvo (LUFS), limitado pelo teto de true peak.
+    Mede o próprio sinal já em float (core.loudness), então os estágios
+    anteriores entram na medição.
+    """
+
+    name = "loudness"
+
+    def __init__(self, target: float = -23.0, true_peak: float = -1.0):
+        super().__init__()
+        self.target = target
+        self.true_peak = true_peak
+        self.post_gain = 1.0
+
+    def absorb(self, other) -> bool:
+        if isinstance(other, GainStage):
+            self.post_gain *= other.factor
+            return True
+        return False
+
+    def process(self, samples, sample_rate):
+        from .loudness import loudness_gain, measure_samples
+
+        gain = loudness_gain(measure_samples(samples, sample_rate), self.target, self.true_peak)
+        if gain is not None:
+            samples *= np.float32(db_to_gain(gain) * self.post_gain)
+        return samples
+
+
+class FilterStage(Stage):
+    """
+    Cascata de biquads (core.filters). Filtros seguidos são concatenados.
+    """
+
+    name = "filter"
+    linear = True
+
+    def __init__(self, name: str, design, *args):
+        super().__init__()
+        self.name = name
+        self._designs = [(design, args)]
+        self._gain = 1.0
+
+    def absorb(self, other) -> bool:
+        if isinstance(other, FilterStage):
+            self._designs.extend(other._designs)
+            self._gain *= other._gain
+            self.fused.append(other.label)
+            return True
+        return super().absorb(other)
+
+    def scale(self, factor: float):
+        self._gain *= factor
+
+    def sections(self, sample_rate: int) -> np.ndarray:
+        sections = np.concatenate([
+            np.atleast_2d(design(*args[:1], sample_rate, *args[1:]))
+            for design, args in self._designs
+        ])
+        # Ganho no numerador da primeira seção: sai de graça na mesma passada
+        sections[0, :3] *= self._gain
+        return sections
+
+    def process(self, samples, sample_rate):
+        return SOSFilter(self.sections(sample_rate), samples.shape[1]).process(samples)
+
+
+class FilterbankStage(Stage):
+    """
+    EQ por crossover (3 bandas ou multibanda); ganho vira ganho das bandas.
+    """
+
+    name = "filterbank"
+    linear = True
+
+    def __init__(self, name: str, crossovers=None, gains=None, bands=None):
+        super().__init__()
+        self.name = name
+        self.crossovers = crossovers
+        self.gains = gains
+        self.bands = bands
+        self._gain = 1.0
+
+    def scale(self, factor: float):
+        self._gain *= factor
+
+    def process(self, samples, sample_rate):
+        crossovers, gains = self.crossovers, self.gains
+        if self.bands is not None:
+            crossovers, gains = bands_to_crossovers(self.bands, sample_rate)
+
+        gains = [g * self._gain for g in gains]
+        return run_filterbank(samples, crossovers, gains, sample_rate)
+
+
+class FirStage(Stage):
+    name = "fir"
+    linear = True
+
+    def __init__(self, bands: list, taps: int = FIR_TAPS):
+        super().__init__()
+        self.bands = bands
+        self.taps = taps
+        self._gain = 1.0
+
+    def scale(self, factor: float):
+        self._gain *= factor
+
+    def process(self, samples, sample_rate):
+        kernel = design_fir(self.bands, sample_rate, self.taps)
+        if self._gain != 1.0:
+            kernel = kernel * self._gain  # o kernel em cache é somente leitura
+        return fir_filter(samples, kernel)
+
+
+class TrimStage(Stage):
+    """
+    Corte em ms (mesmo arredondamento do pydub). É uma view, sem cópia.
+    """
+
+    name = "trim"
+
+    def __init__(self, start_ms: float = 0, end_ms: float = None):
+        super().__init__()
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+
+    def process(self, samples, sample_rate):
+        duration = round(1000 * len(samples) / sample_rate)
+
+        def frame(ms):
+            if ms < 0:
+                ms = duration - abs(ms)
+            return int(min(ms, duration) * sample_rate / 1000.0)
+
+        end = len(samples) if self.end_ms is None else frame(self.end_ms)
+        return samples[frame(self.start_ms or 0):end]
+
+
+class FuncStage(Stage):
+    """
+    Qualquer função float (frames, canais) -> float (frames, canais).
+    """
+
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.name = getattr(func, "__name__", "func")
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def process(self, samples, sample_rate):
+        return self.func(samples, *self.args, **self.kwargs)
+
+
+# -------------------------------------------------
+# REGISTRY
+# -------------------------------------------------
+# Mesmos nomes e parâmetros das funções de audio_processing / eq
+# (e do --step da linha de comando).
+
+def _eq(mode: str = "3band", **kwargs):
+    if mode == "multiband":
+        return FilterbankStage("multiband", bands=kwargs.get("bands", []))
+    if mode == "fir":
+        return FirStage(kwargs.get("bands", []), kwargs.get("taps", FIR_TAPS))
+    return _eq3(**kwargs)
+
+
+def _eq3(low_gain=0.0, mid_gain=0.0, high_gain=0.0):
+    gains = [db_to_gain(low_gain), db_to_gain(mid_gain), db_to_gain(high_gain)]
+    return FilterbankStage("eq3", crossovers=[200, 4000], gains=gains)
+
+
+STAGES = {
+    "gain": lambda db: GainStage(db),
+    "normalize": lambda headroom=0.1: NormalizeStage(headroom),
+    "loudness": lambda target=-23.0, true_peak=-1.0: LoudnessStage(target, true_peak),
+    "trim": lambda start_ms=0, end_ms=None: TrimStage(start_ms, end_ms),
+    "lowpass": lambda cutoff, order=2: FilterStage("lowpass", design_lowpass, cutoff, order),
+    "highpass": lambda cutoff, order=2: FilterStage("highpass", design_highpass, cutoff, order),
+    "peaking": lambda freq, gain, q=1.0: FilterStage("peaking", design_peaking, freq, gain, q),
+    "lowshelf": lambda freq, gain, slope=1.0: FilterStage("lowshelf", design_lowshelf, freq, gain, slope),
+    "highshelf": lambda freq, gain, slope=1.0: FilterStage("highshelf", design_highshelf, freq, gain, slope),
+    "notch": lambda freq, q=10.0: FilterStage("notch", design_notch, freq, q),
+    "eq3": _eq3,
+    "multiband": lambda bands: FilterbankStage("multiband", bands=bands),
+    "fir": lambda bands, taps=FIR_TAPS: FirStage(bands, taps),
+    "eq": _eq,
+}
+
+
+def build_stage(step) -> Stage:
+    """
+    {"op": "gain", "db": -3} | ("gain", {"db": -3}) | Stage | função float.
+    """
+    if isinstance(step, Stage):
+        return step
+
+    if callable(step):
+        return FuncStage(step)
+
+    if isinstance(step, dict):
+        op, params = step.get("op"), {k: v for k, v in step.items() if k != "op"}
+    else:
+        op, params = step[0], dict(step[1]) if len(step) > 1 else {}
+
+    if op not in STAGES:
+        raise ValueError(f"Estágio desconhecido: {op!r} (disponíveis: {', '.join(sorted(STAGES))})")
+
+    return STAGES[op](**params)
+
+
+def fuse(stages: list) -> list:
+    """
+    Junta estágios vizinhos (ver docstring do módulo).
+    """
+    out = []
+
+    for stage in stages:
+        if out and out[-1].absorb(stage):
+            if not isinstance(stage, FilterStage):
+                out[-1].fused.append(stage.label)
+            continue
+        out.append(stage)
+
+    # Ganho que sobrou antes de um estágio linear (ou de normalize/loudness)
+    fused = []
+    for index, stage in enumerate(out):
+        following = out[index + 1] if index + 1 < len(out) else None
+
+        if isinstance(stage, GainStage) and following is not None:
+            if following.linear:
+                following.scale(stage.factor)
+                following.fused.insert(0, stage.label)
+                continue
+            if isinstance(following, (NormalizeStage, LoudnessStage)):
+                following.fused.insert(0, stage.label)
+                continue
+
+        fused.append(stage)
+
+    return fused
+
+
+# -------------------------------------------------
+# CHAIN
+# -------------------------------------------------
+
+class ProcessingChain:
+    """
+    Lista declarativa de estágios. Cada process() monta os estágios de
+    novo (parâmetros podem depender do sample rate) e guarda os tempos
+    em `timings`: [{"stage", "ms", "frames"}].
+    """
+
+    def __init__(self, steps=()):
+        self.steps = list(steps)
+        self.timings = []
+
+    def stages(self) -> list:
+        return fuse([build_stage(step) for step in self.steps])
+
+    def describe(self) -> list:
+        """
+        Rótulos dos estágios depois da fusão (ex.: "highpass+lowpass+gain").
+        """
+        return [stage.label for stage in self.stages()]
+
+    def process(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        samples: float32 (frames, canais). Pode ser alterado no lugar.
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim == 1:
+            samples = samples.reshape(-1, 1)
+
+        self.timings = []
+
+        for stage in self.stages():
+            started = time.perf_counter()
+            with span(f"chain.{stage.name}", fused=stage.label):
+                samples = stage.process(samples, sample_rate)
+
+            self.timings.append({
+                "stage": stage.label,
+                "ms": (time.perf_counter() - started) * 1000,
+                "frames": len(samples),
+            })
+
+        debug("Cadeia: %s", ", ".join(f"{t['stage']} {t['ms']:.1f} ms" for t in self.timings))
+        return samples
+
+    def process_segment(self, segment):
+        """
+        AudioSegment -> AudioSegment, quantizando só no fim.
+        """
+        from .samples import float_to_segment, segment_to_float
+
+        if not len(segment):
+            return segment
+
+        processed = self.process(segment_to_float(segment), segment.frame_rate)
+        return float_to_segment(processed, segment)
+
+    def total_ms(self) -> float:
+        return sum(t["ms"] for t in self.timings)
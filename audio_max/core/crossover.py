@@ -0,0 +1,154 @@
+import math
+
+import numpy as np
+
+from .filters import SOSFilter, MAX_BLOCK_FRAMES, design_allpass, design_linkwitz_riley
+
+
+# -------------------------------------------------
+# FILTERBANK
+# -------------------------------------------------
+
+class CrossoverFilterbank:
+    """
+    Banco de crossovers Linkwitz-Riley (4ª ordem) que separa o sinal
+    em len(crossovers) + 1 bandas, aplica o ganho de cada banda e soma
+    tudo em float na mesma passada.
+
+    Em cada crossover a banda de baixo sai do LP e o resto segue pelo HP.
+    O acumulado das bandas de baixo passa pelo passa-tudo do crossover
+    seguinte, para ficar em fase com as bandas de cima. Com todos os
+    ganhos em 0 dB a magnitude da soma é plana.
+
+    Crossovers fora de (0, Nyquist) são descartados junto com a banda
+    que ficaria vazia (ver clamp_crossovers).
+    """
+
+    def __init__(self, crossovers, gains, sample_rate: int, channels: int):
+        crossovers = sorted(float(f) for f in crossovers)
+        if len(gains) != len(crossovers) + 1:
+            raise ValueError("São necessários len(crossovers) + 1 ganhos.")
+
+        crossovers, gains = clamp_crossovers(crossovers, gains, sample_rate)
+
+        self.crossovers = crossovers
+        self.gains = np.asarray(gains, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.channels = channels
+
+        self._lowpass = [SOSFilter(design_linkwitz_riley(f, sample_rate), channels) for f in crossovers]
+        self._highpass = [SOSFilter(design_linkwitz_riley(f, sample_rate, highpass=True), channels)
+                          for f in crossovers]
+        self._allpass = [SOSFilter(design_allpass(f, sample_rate), channels) for f in crossovers]
+
+    def reset(self):
+        for bank in (self._lowpass, self._highpass, self._allpass):
+            for f in bank:
+                f.reset()
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        Processa um bloco (frames, canais); o estado segue para o próximo.
+        """
+        rest = np.asarray(block, dtype=np.float32)
+        acc = None
+
+        for i in range(len(self.crossovers)):
+            low = self._lowpass[i].process(rest)
+            rest = self._highpass[i].process(rest)
+
+            if acc is not None:
+                acc = self._allpass[i].process(acc)
+                acc += self.gains[i] * low
+            else:
+                low *= self.gains[i]
+                acc = low
+
+        rest *= self.gains[-1]
+        if acc is None:
+            return rest
+
+        acc += rest
+        return acc
+
+
+# -------------------------------------------------
+# HELPERS
+# -------------------------------------------------
+
+def db_to_gain(db: float) -> float:
+    return 10 ** (db / 20.0)
+
+
+def clamp_crossovers(crossovers, gains, sample_rate: int):
+    """
+    Remove crossovers (ordenados) fora de (0, Nyquist) e os ganhos das
+    bandas que deixam de existir. Ex.: [200, 4000] a 8 kHz -> [200],
+    com os ganhos low e mid (a banda high ficaria acima de Nyquist).
+    """
+    nyquist = sample_rate / 2
+    first = sum(1 for f in crossovers if f <= 0)
+    kept = [f for f in crossovers if 0 < f < nyquist]
+
+    return kept, list(gains)[first:first + len(kept) + 1]
+
+
+def run_filterbank(samples: np.ndarray, crossovers, gains, sample_rate: int) -> np.ndarray:
+    """
+    Aplica o banco (ganhos lineares) em um array completo (frames, canais),
+    bloco a bloco.
+    """
+    bank = CrossoverFilterbank(crossovers, gains, sample_rate, samples.shape[1])
+
+    out = np.empty(samples.shape, dtype=np.float32)
+    for lo in range(0, len(samples), MAX_BLOCK_FRAMES):
+        hi = lo + MAX_BLOCK_FRAMES
+        out[lo:hi] = bank.process(samples[lo:hi])
+
+    return out
+
+
+def _band_range(band: dict):
+    kind = band.get("type")
+
+    if kind == "lowpass":
+        return 0.0, float(band["freq"])
+    if kind == "highpass":
+        return float(band["freq"]), math.inf
+    if kind == "band":
+        return float(band["low"]), float(band["high"])
+
+    return None
+
+
+def bands_to_crossovers(bands: list, sample_rate: int):
+    """
+    Converte a lista de bandas de apply_multiband_eq em
+    (crossovers, ganhos lineares por região).
+
+    Cada região entre dois crossovers recebe a soma dos ganhos lineares
+    das bandas que a cobrem (como o overlay antigo), e 0 se nenhuma cobre.
+    """
+    nyquist = sample_rate / 2
+    ranges = []
+
+    for band in bands:
+        span = _band_range(band)
+        if span is None:
+            continue
+        ranges.append((span, db_to_gain(band.get("gain", 0.0))))
+
+    edges = sorted({
+        edge for (lo, hi), _ in ranges
+        for edge in (lo, hi)
+        if 0 < edge < nyquist
+    })
+
+    bounds = [0.0] + edges + [nyquist]
+    gains = []
+
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        center = math.sqrt(max(lo, 1.0) * hi)
+        gains.append(sum(g for (a, b), g in ranges if a <= center <= b))
+
+    return edges, gains
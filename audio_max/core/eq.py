@@ -1,53 +1,115 @@
-from pydub import AudioSegment
-from pydub.effects import low_pass_filter, high_pass_filter
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .filters import (
+    SOSFilter,
+    design_lowpass,
+    design_highpass,
+    design_peaking,
+    design_lowshelf,
+    design_highshelf,
+    design_notch,
+)
+from .fir import FIR_TAPS, design_fir, fir_filter
+from .crossover import bands_to_crossovers, db_to_gain, run_filterbank
+from .samples import segment_to_float, float_to_segment
+from ..utils.profiling import traced
+
+if TYPE_CHECKING:
+    from pydub import AudioSegment
+
+
+# -------------------------------------------------
+# FILTER ENGINE
+# -------------------------------------------------
+
+@traced
+def apply_filter(segment: AudioSegment, sections) -> AudioSegment:
+    """
+    Aplica uma cascata de biquads (core.filters) em todos os canais.
+    """
+    if not len(segment):
+        return segment
+
+    samples = segment_to_float(segment)
+    filtered = SOSFilter(sections, segment.channels).process(samples)
+
+    return float_to_segment(filtered, segment)
 
 
 # -------------------------------------------------
 # BAND EQ
 # -------------------------------------------------
 
-def apply_lowpass(segment: AudioSegment, cutoff: float) -> AudioSegment:
+@traced
+def apply_lowpass(segment: AudioSegment, cutoff: float, order: int = 2) -> AudioSegment:
+    """
+    Aplica filtro passa-baixa Butterworth (6 dB/oct por ordem).
+    """
+    return apply_filter(segment, design_lowpass(cutoff, segment.frame_rate, order))
+
+
+@traced
+def apply_highpass(segment: AudioSegment, cutoff: float, order: int = 2) -> AudioSegment:
+    """
+    Aplica filtro passa-alta Butterworth (6 dB/oct por ordem).
+    """
+    return apply_filter(segment, design_highpass(cutoff, segment.frame_rate, order))
+
+
+@traced
+def apply_peaking(segment: AudioSegment, freq: float, gain: float, q: float = 1.0) -> AudioSegment:
     """
-    Aplica filtro passa-baixa.
+    Aplica filtro peaking (sino) com ganho em dB.
     """
-    return low_pass_filter(segment, cutoff)
+    return apply_filter(segment, design_peaking(freq, segment.frame_rate, gain, q))
+
+
+@traced
+def apply_lowshelf(segment: AudioSegment, freq: float, gain: float, slope: float = 1.0) -> AudioSegment:
+    return apply_filter(segment, design_lowshelf(freq, segment.frame_rate, gain, slope))
+
+
+@traced
+def apply_highshelf(segment: AudioSegment, freq: float, gain: float, slope: float = 1.0) -> AudioSegment:
+    return apply_filter(segment, design_highshelf(freq, segment.frame_rate, gain, slope))
 
 
-def apply_highpass(segment: AudioSegment, cutoff: float) -> AudioSegment:
+@traced
+def apply_notch(segment: AudioSegment, freq: float, q: float = 10.0) -> AudioSegment:
     """
-    Aplica filtro passa-alta.
+    Remove uma frequência estreita (ex.: hum de 50/60 Hz).
     """
-    return high_pass_filter(segment, cutoff)
+    return apply_filter(segment, design_notch(freq, segment.frame_rate, q))
 
 
 # -------------------------------------------------
 # SIMPLE 3-BAND EQ
 # -------------------------------------------------
 
+@traced
 def apply_3band_eq(segment: AudioSegment, low_gain=0.0, mid_gain=0.0, high_gain=0.0):
     """
     Equalizador simples:
     - Low  < 200 Hz
     - Mid  200 - 4000 Hz
     - High > 4000 Hz
-    """
-
-    low = low_pass_filter(segment, 200) + low_gain
-
-    high = high_pass_filter(segment, 4000) + high_gain
 
-    mid = high_pass_filter(segment, 200)
-    mid = low_pass_filter(mid, 4000) + mid_gain
+    Crossover Linkwitz-Riley em uma única passada; com ganhos 0 dB
+    a resposta é plana.
+    """
 
-    combined = low.overlay(mid).overlay(high)
+    gains = [db_to_gain(low_gain), db_to_gain(mid_gain), db_to_gain(high_gain)]
 
-    return combined
+    return _apply_filterbank(segment, [200, 4000], gains)
 
 
 # -------------------------------------------------
 # MULTI BAND EQ (ESCALÁVEL)
 # -------------------------------------------------
 
+@traced
 def apply_multiband_eq(segment: AudioSegment, bands: list):
     """
     bands = [
@@ -55,33 +117,49 @@ def apply_multiband_eq(segment: AudioSegment, bands: list):
         {"type": "band", "low": 200, "high": 2000, "gain": -2},
         {"type": "highpass", "freq": 5000, "gain": 4},
     ]
+
+    Cada região entre as frequências de corte recebe a soma dos ganhos
+    das bandas que a cobrem; tudo é separado e somado em uma passada.
     """
 
-    result = AudioSegment.silent(duration=len(segment))
+    crossovers, gains = bands_to_crossovers(bands, segment.frame_rate)
 
-    for band in bands:
+    return _apply_filterbank(segment, crossovers, gains)
 
-        if band["type"] == "lowpass":
-            processed = low_pass_filter(segment, band["freq"])
 
-        elif band["type"] == "highpass":
-            processed = high_pass_filter(segment, band["freq"])
+def _apply_filterbank(segment: AudioSegment, crossovers, gains) -> AudioSegment:
+    if not len(segment):
+        return segment
 
-        elif band["type"] == "band":
-            processed = high_pass_filter(segment, band["low"])
-            processed = low_pass_filter(processed, band["high"])
+    samples = segment_to_float(segment)
+    processed = run_filterbank(samples, crossovers, gains, segment.frame_rate)
 
-        else:
-            continue
+    return float_to_segment(processed, segment)
 
-        gain = band.get("gain", 0.0)
-        processed = processed + gain
 
-        result = result.overlay(processed)
+# -------------------------------------------------
+# LINEAR PHASE (FIR) EQ
+# -------------------------------------------------
+
+@traced
+def apply_fir_eq(segment: AudioSegment, bands: list, taps: int = FIR_TAPS):
+    """
+    Mesmo formato de bandas do apply_multiband_eq, mas como um único FIR
+    de fase linear aplicado por FFT (overlap-add). O custo não cresce
+    com o número de bandas; bom para masterização de mixdowns longos.
+    """
+
+    if not len(segment):
+        return segment
+
+    kernel = design_fir(bands, segment.frame_rate, taps)
+    processed = fir_filter(segment_to_float(segment), kernel)
+
+    return float_to_segment(processed, segment)
 
-    return result
 
 #aplly EQ
+@traced
 def apply_eq(segment: AudioSegment, mode="3band", **kwargs):
     """
     Wrapper genérico de EQ.
@@ -93,4 +171,7 @@ def apply_eq(segment: AudioSegment, mode="3band", **kwargs):
     if mode == "multiband":
         return apply_multiband_eq(segment, kwargs.get("bands", []))
 
+    if mode == "fir":
+        return apply_fir_eq(segment, kwargs.get("bands", []), kwargs.get("taps", FIR_TAPS))
+
     return segment
\ No newline at end of file
@@ -0,0 +1,321 @@
+"""
+Exportação em vários formatos a partir de um único master.
+
+    targets = [parse_target("WAV"),
+               parse_target({"format": "FLAC", "sample_rate": 96000, "bit_depth": 24}),
+               parse_target({"format": "MP3", "bitrate": "320k"})]
+    rate, sample_format = master_layout(targets)    # render da timeline
+    plan = plan_outputs(targets, out_dir, "audiomax_export")
+    results = encode_targets(master_path, plan)      # tempo por formato
+
+A timeline é renderizada uma vez (float, no maior sample rate pedido);
+cada formato é codificado a partir desse master em um processo ffmpeg
+próprio, todos ao mesmo tempo (external.render_runner). WAV no mesmo
+sample rate do master é convertido em Python (core.wavfile), sem ffmpeg,
+enquanto os outros processos rodam.
+"""
+import os
+import time
+
+from ..utils.logging import info, error
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+DEFAULT_SAMPLE_RATE = 44100
+DEFAULT_BIT_DEPTH = 16
+
+# Master em float: sem clipping nem quantização antes dos encodes
+MASTER_FORMAT = "F32"
+
+# Sample rates do MPEG-1/2/2.5 Layer III: o libmp3lame não passa de 48 kHz
+MP3_SAMPLE_RATES = (8000, 11025, 12000, 16000, 22050, 24000, 32000, 44100, 48000)
+
+# Profundidades aceitas por formato (None = com perdas, não se aplica)
+# e sample rates aceitos (None = qualquer um)
+FORMATS = {
+    "WAV":  {"ext": "wav",  "bit_depths": (16, 24, 32), "sample_rates": None},
+    "FLAC": {"ext": "flac", "bit_depths": (16, 24),     "sample_rates": None},
+    "MP3":  {"ext": "mp3",  "bit_depths": None,         "sample_rates": MP3_SAMPLE_RATES},
+    "OGG":  {"ext": "ogg",  "bit_depths": None,         "sample_rates": None},
+}
+
+_WAV_CODECS = {16: "pcm_s16le", 24: "pcm_s24le", 32: "pcm_s32le"}
+
+# Frames convertidos por vez no caminho nativo
+CONVERT_BLOCK_FRAMES = 262144
+
+
+# -------------------------------------------------
+# TARGETS
+# -------------------------------------------------
+
+def parse_target(spec) -> dict:
+    """
+    "FLAC" | {"format": "FLAC", "sample_rate": 96000, "bit_depth": 24}
+    -> {"format", "sample_rate", "bit_depth", "float", "bitrate"}
+
+    float=True (só WAV) grava float 32 bits; bitrate (MP3/OGG) vai
+    direto para o ffmpeg ("192k"). Sample rate que o formato não
+    suporta (MP3 acima de 48 kHz) levanta ValueError.
+    """
+    if isinstance(spec, str):
+        spec = {"format": spec}
+
+    fmt = str(spec.get("format", "")).upper()
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato não suportado: {fmt!r} (disponíveis: {', '.join(FORMATS)})")
+
+    depths = FORMATS[fmt]["bit_depths"]
+    bit_depth = int(spec.get("bit_depth") or DEFAULT_BIT_DEPTH)
+    is_float = bool(spec.get("float", False))
+
+    if depths is None:
+        bit_depth, is_float = None, False
+    elif is_float and fmt != "WAV":
+        raise ValueError(f"{fmt} não suporta float")
+    elif is_float:
+        bit_depth = 32
+    elif bit_depth not in depths:
+        raise ValueError(f"{fmt} não suporta {bit_depth} bits (use {', '.join(map(str, depths))})")
+
+    sample_rate = int(spec.get("sample_rate") or DEFAULT_SAMPLE_RATE)
+    rates = FORMATS[fmt]["sample_rates"]
+    if sample_rate <= 0:
+        raise ValueError(f"Sample rate inválido: {sample_rate}")
+    if rates is not None and sample_rate not in rates:
+        raise ValueError(f"{fmt} não suporta {sample_rate} Hz (use {', '.join(map(str, rates))})")
+
+    return {
+        "format": fmt,
+        "sample_rate": sample_rate,
+        "bit_depth": bit_depth,
+        "float": is_float,
+        "bitrate": spec.get("bitrate") if depths is None else None,
+    }
+
+
+def master_layout(targets: list) -> tuple:
+    """
+    (sample_rate, format do mixdown) do master: o maior sample rate
+    pedido, para que nenhum formato perca banda por causa do master.
+    """
+    return max(t["sample_rate"] for t in targets), MASTER_FORMAT
+
+
+def describe(target: dict) -> str:
+    """
+    Rótulo curto: "FLAC 96000 Hz 24 bits", "MP3 44100 Hz 320k".
+    """
+    parts = [target["format"], f"{target['sample_rate']} Hz"]
+    if target["float"]:
+        parts.append("float")
+    elif target["bit_depth"]:
+        parts.append(f"{target['bit_depth']} bits")
+    if target["bitrate"]:
+        parts.append(str(target["bitrate"]))
+    return " ".join(parts)
+
+
+def plan_outputs(targets: list, out_dir: str, stem: str) -> list:
+    """
+    [(target, caminho de saída)]. Um formato pedido mais de uma vez
+    ganha sufixo com sample rate e profundidade no nome.
+    """
+    counts = {}
+    for target in targets:
+        counts[target["format"]] = counts.get(target["format"], 0) + 1
+
+    plan = []
+    for target in targets:
+        ext = FORMATS[target["format"]]["ext"]
+        name = f"{stem}.{ext}"
+
+        if counts[target["format"]] > 1:
+            depth = "f32" if target["float"] else target["bit_depth"] or target["bitrate"] or ""
+            name = f"{stem}_{target['sample_rate']}_{depth}.{ext}"
+
+        plan.append((target, os.path.join(out_dir, name)))
+
+    return plan
+
+
+# -------------------------------------------------
+# ENCODERS
+# -------------------------------------------------
+
+def encoder_template(target: dict) -> str:
+    """
+    Template do command_builder ({host} = ffmpeg) para um formato.
+    """
+    args = ["{host}", "-v", "error", "-y", "-i", "{input}", "-ar", str(target["sample_rate"])]
+    fmt = target["format"]
+
+    if fmt == "WAV":
+        args += ["-c:a", "pcm_f32le" if target["float"] else _WAV_CODECS[target["bit_depth"]]]
+    elif fmt == "FLAC":
+        args += ["-c:a", "flac"]
+        if target["bit_depth"] == 24:
+            args += ["-sample_fmt", "s32", "-bits_per_raw_sample", "24"]
+        else:
+            args += ["-sample_fmt", "s16"]
+    elif fmt == "MP3":
+        args += ["-c:a", "libmp3lame"]
+    elif fmt == "OGG":
+        args += ["-c:a", "libvorbis"]
+
+    if target["bitrate"]:
+        args += ["-b:a", str(target["bitrate"])]
+
+    return " ".join(args + ["{output}"])
+
+
+def _is_native(target: dict, master_rate: int) -> bool:
+    return target["format"] == "WAV" and target["sample_rate"] == master_rate
+
+
+def _convert_wav(master, target: dict, output_path: str, between_blocks=None):
+    """
+    Master -> WAV na profundidade pedida, em blocos.
+    between_blocks() roda entre blocos (o runner continua avançando).
+    """
+    from .wavfile import WavWriter
+
+    width = 4 if target["float"] else target["bit_depth"] // 8
+
+    with WavWriter(output_path, master.sample_rate, master.channels, width, target["float"]) as writer:
+        for block in master.iter_blocks(CONVERT_BLOCK_FRAMES):
+            writer.write(block)
+            if between_blocks:
+                between_blocks()
+
+
+# -------------------------------------------------
+# RUN
+# -------------------------------------------------
+
+def iter_encode_targets(master_path: str, plan: list, workers: int = None, timeout: float = None):
+    """
+    Gerador: codifica todos os formatos do plano a partir do master.
+    Os encodes com ffmpeg rodam em paralelo (um processo por formato);
+    os WAV nativos são convertidos aqui enquanto isso. Não bloqueia entre
+    os passos: produz frações de progresso e retorna, na ordem do plano:
+
+    [{"format", "label", "output", "sample_rate", "bit_depth",
+      "seconds", "error"}]
+    """
+    from ..external.render_runner import DEFAULT_TIMEOUT, RenderRunner, RenderTask
+    from ..utils.paths import resolve_ffmpeg
+    from .scratch import get_scratch_store, part_path
+    from .wavfile import WavFile
+
+    store = get_scratch_store()
+    parts = {}
+    results = [None] * len(plan)
+    total = len(plan) or 1
+
+    with WavFile(master_path) as master:
+        master_rate = master.sample_rate
+        native = [i for i, (target, _) in enumerate(plan) if _is_native(target, master_rate)]
+        encoded = [i for i in range(len(plan)) if i not in native]
+
+        runner = RenderRunner(workers or len(encoded) or 1, timeout or DEFAULT_TIMEOUT,
+                              max_queued=len(encoded))
+        ffmpeg = resolve_ffmpeg() if encoded else None
+
+        # ffmpeg grava em um temporário; renomeado só se o encode deu certo
+        for index in encoded:
+            target, output = plan[index]
+            parts[index] = part_path(output)
+            runner.submit(RenderTask(ffmpeg, master_path, parts[index], template=encoder_template(target)))
+
+        def collect():
+            for result in runner.poll():
+                index = encoded[result["index"]]
+                output = _finish_part(store, parts[index], plan[index][1], result["error"])
+                results[index] = _result(plan[index], output, result["seconds"], result["error"])
+
+        try:
+            collect()
+
+            for index in native:
+                target, output = plan[index]
+                started = time.perf_counter()
+                try:
+                    with store.write(output) as part:
+                        _convert_wav(master, target, part, between_blocks=collect)
+                    message = None
+                except (OSError, ValueError) as e:
+                    message = f"{type(e).__name__}: {e}"
+                    error("Falha ao gravar %s: %s", os.path.basename(output), message)
+
+                results[index] = _result(plan[index], output if message is None else None,
+                                         time.perf_counter() - started, message)
+                yield sum(r is not None for r in results) / total
+
+            while runner.pending:
+                collect()
+                yield sum(r is not None for r in results) / total
+
+            collect()
+        finally:
+            if runner.pending:
+                runner.cancel()
+            for index, part in parts.items():
+                if results[index] is None and os.path.exists(part):
+                    os.remove(part)
+
+    for result in results:
+        status = f"{result['seconds']:.2f}s" if not result["error"] else result["error"]
+        info("Encode %s: %s", result['label'], status)
+
+    return results
+
+
+def encode_targets(master_path: str, plan: list, workers: int = None, timeout: float = None,
+                   progress=None) -> list:
+    """
+    Versão bloqueante de iter_encode_targets (scripts e etapas em thread).
+    progress(fração) pode levantar exceção para cancelar: os processos
+    ffmpeg em andamento são encerrados.
+    """
+    from ..external.render_runner import POLL_INTERVAL
+
+    steps = iter_encode_targets(master_path, plan, workers, timeout)
+    try:
+        while True:
+            fraction = next(steps)
+            if progress:
+                progress(fraction)
+            time.sleep(POLL_INTERVAL)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        steps.close()
+
+
+def _finish_part(store, part: str, output: str, message):
+    if message is not None:
+        if os.path.exists(part):
+            os.remove(part)
+        return None
+
+    os.replace(part, output)
+    if store.owns(output):
+        store.commit(output)
+    return output
+
+
+def _result(entry: tuple, output, seconds: float, message) -> dict:
+    target, _ = entry
+    return {
+        "format": target["format"],
+        "label": describe(target),
+        "output": output,
+        "sample_rate": target["sample_rate"],
+        "bit_depth": target["bit_depth"],
+        "seconds": seconds,
+        "error": message,
+    }
@@ -0,0 +1,401 @@
+import math
+
+import numpy as np
+
+try:
+    from scipy.signal import sosfilt as _sosfilt
+except ImportError:
+    _sosfilt = None
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+# Tamanho do sub-bloco do motor NumPy. Custo ~SUB_BLOCK multiplicações
+# por sample, mas tudo em matmul (sem loop Python por sample).
+SUB_BLOCK = 32
+
+# Frames processados por vez; limita os temporários float64.
+MAX_BLOCK_FRAMES = 1 << 16
+
+
+# -------------------------------------------------
+# DESIGN (RBJ AUDIO EQ COOKBOOK)
+# -------------------------------------------------
+# Cada seção é (b0, b1, b2, a1, a2) já normalizada por a0.
+
+def _section(b0, b1, b2, a0, a1, a2):
+    return np.array([b0 / a0, b1 / a0, b2 / a0, a1 / a0, a2 / a0], dtype=np.float64)
+
+
+def _check(freq: float, sample_rate: int):
+    if sample_rate <= 0:
+        raise ValueError("sample_rate deve ser maior que zero.")
+    if not 0 < freq < sample_rate / 2:
+        raise ValueError(f"Frequência fora da faixa (0, {sample_rate / 2}): {freq}")
+
+
+def _out_of_band(freq: float, sample_rate: int):
+    """
+    Corte de LP/HP fora de (0, Nyquist): "above", "below" ou None.
+    Acontece com cortes fixos em áudio de sample rate baixo (8 kHz);
+    como no pydub, o filtro degenera em vez de levantar erro.
+    """
+    if sample_rate <= 0:
+        raise ValueError("sample_rate deve ser maior que zero.")
+    if freq >= sample_rate / 2:
+        return "above"
+    if freq <= 0:
+        return "below"
+    return None
+
+
+_PASSTHROUGH = (1.0, 0.0, 0.0, 0.0, 0.0)
+_SILENCE = (0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+def _butterworth_qs(order: int) -> list:
+    """
+    Q de cada seção de 2ª ordem de um Butterworth de ordem `order`.
+    """
+    return [
+        -1.0 / (2 * math.cos(math.pi * (2 * k + order + 1) / (2 * order)))
+        for k in range(order // 2)
+    ]
+
+
+def _first_order(freq: float, sample_rate: int, highpass: bool):
+    k = math.tan(math.pi * freq / sample_rate)
+    a1 = (k - 1) / (k + 1)
+
+    if highpass:
+        b0 = 1 / (k + 1)
+        return np.array([b0, -b0, 0.0, a1, 0.0])
+
+    b0 = k / (k + 1)
+    return np.array([b0, b0, 0.0, a1, 0.0])
+
+
+def biquad_lowpass(freq: float, sample_rate: int, q: float = 1 / math.sqrt(2)):
+    _check(freq, sample_rate)
+    w0 = 2 * math.pi * freq / sample_rate
+    cos_w, alpha = math.cos(w0), math.sin(w0) / (2 * q)
+
+    return _section((1 - cos_w) / 2, 1 - cos_w, (1 - cos_w) / 2,
+                    1 + alpha, -2 * cos_w, 1 - alpha)
+
+
+def biquad_highpass(freq: float, sample_rate: int, q: float = 1 / math.sqrt(2)):
+    _check(freq, sample_rate)
+    w0 = 2 * math.pi * freq / sample_rate
+    cos_w, alpha = math.cos(w0), math.sin(w0) / (2 * q)
+
+    return _section((1 + cos_w) / 2, -(1 + cos_w), (1 + cos_w) / 2,
+                    1 + alpha, -2 * cos_w, 1 - alpha)
+
+
+def design_lowpass(freq: float, sample_rate: int, order: int = 2) -> np.ndarray:
+    """
+    Passa-baixa Butterworth de ordem `order` (6 dB/oct por ordem).
+    Corte acima de Nyquist deixa tudo passar; corte <= 0 silencia.
+    """
+    edge = _out_of_band(freq, sample_rate)
+    if edge:
+        return np.array([_PASSTHROUGH if edge == "above" else _SILENCE])
+
+    sections = [biquad_lowpass(freq, sample_rate, q) for q in _butterworth_qs(order)]
+    if order % 2:
+        sections.append(_first_order(freq, sample_rate, highpass=False))
+    return np.array(sections)
+
+
+def design_highpass(freq: float, sample_rate: int, order: int = 2) -> np.ndarray:
+    """
+    Passa-alta Butterworth de ordem `order` (6 dB/oct por ordem).
+    Corte acima de Nyquist silencia; corte <= 0 deixa tudo passar.
+    """
+    edge = _out_of_band(freq, sample_rate)
+    if edge:
+        return np.array([_SILENCE if edge == "above" else _PASSTHROUGH])
+
+    sections = [biquad_highpass(freq, sample_rate, q) for q in _butterworth_qs(order)]
+    if order % 2:
+        sections.append(_first_order(freq, sample_rate, highpass=True))
+    return np.array(sections)
+
+
+def design_peaking(freq: float, sample_rate: int, gain_db: float, q: float = 1.0) -> np.ndarray:
+    _check(freq, sample_rate)
+    a = 10 ** (gain_db / 40)
+    w0 = 2 * math.pi * freq / sample_rate
+    cos_w, alpha = math.cos(w0), math.sin(w0) / (2 * q)
+
+    return np.array([_section(1 + alpha * a, -2 * cos_w, 1 - alpha * a,
+                              1 + alpha / a, -2 * cos_w, 1 - alpha / a)])
+
+
+def _shelf_terms(freq, sample_rate, gain_db, slope):
+    _check(freq, sample_rate)
+    a = 10 ** (gain_db / 40)
+    w0 = 2 * math.pi * freq / sample_rate
+    cos_w = math.cos(w0)
+    alpha = math.sin(w0) / 2 * math.sqrt((a + 1 / a) * (1 / slope - 1) + 2)
+    return a, cos_w, 2 * math.sqrt(a) * alpha
+
+
+def design_lowshelf(freq: float, sample_rate: int, gain_db: float, slope: float = 1.0) -> np.ndarray:
+    a, cos_w, beta = _shelf_terms(freq, sample_rate, gain_db, slope)
+
+    return np.array([_section(
+        a * ((a + 1) - (a - 1) * cos_w + beta),
+        2 * a * ((a - 1) - (a + 1) * cos_w),
+        a * ((a + 1) - (a - 1) * cos_w - beta),
+        (a + 1) + (a - 1) * cos_w + beta,
+        -2 * ((a - 1) + (a + 1) * cos_w),
+        (a + 1) + (a - 1) * cos_w - beta,
+    )])
+
+
+def design_highshelf(freq: float, sample_rate: int, gain_db: float, slope: float = 1.0) -> np.ndarray:
+    a, cos_w, beta = _shelf_terms(freq, sample_rate, gain_db, slope)
+
+    return np.array([_section(
+        a * ((a + 1) + (a - 1) * cos_w + beta),
+        -2 * a * ((a - 1) + (a + 1) * cos_w),
+        a * ((a + 1) + (a - 1) * cos_w - beta),
+        (a + 1) - (a - 1) * cos_w + beta,
+        2 * ((a - 1) - (a + 1) * cos_w),
+        (a + 1) - (a - 1) * cos_w - beta,
+    )])
+
+
+def design_notch(freq: float, sample_rate: int, q: float = 10.0) -> np.ndarray:
+    _check(freq, sample_rate)
+    w0 = 2 * math.pi * freq / sample_rate
+    cos_w, alpha = math.cos(w0), math.sin(w0) / (2 * q)
+
+    return np.array([_section(1.0, -2 * cos_w, 1.0, 1 + alpha, -2 * cos_w, 1 - alpha)])
+
+
+def design_allpass(freq: float, sample_rate: int, q: float = 1 / math.sqrt(2)) -> np.ndarray:
+    """
+    Passa-tudo de 2ª ordem. Com Q = 1/sqrt(2) é a soma LP + HP de um
+    crossover Linkwitz-Riley de 4ª ordem na mesma frequência.
+    """
+    _check(freq, sample_rate)
+    w0 = 2 * math.pi * freq / sample_rate
+    cos_w, alpha = math.cos(w0), math.sin(w0) / (2 * q)
+
+    return np.array([_section(1 - alpha, -2 * cos_w, 1 + alpha, 1 + alpha, -2 * cos_w, 1 - alpha)])
+
+
+def design_linkwitz_riley(freq: float, sample_rate: int, highpass: bool = False) -> np.ndarray:
+    """
+    Linkwitz-Riley de 4ª ordem (24 dB/oct): dois Butterworth de 2ª ordem em série.
+    """
+    section = biquad_highpass(freq, sample_rate) if highpass else biquad_lowpass(freq, sample_rate)
+    return np.array([section, section])
+
+
+DESIGNERS = {
+    "lowpass": design_lowpass,
+    "highpass": design_highpass,
+    "peaking": design_peaking,
+    "lowshelf": design_lowshelf,
+    "highshelf": design_highshelf,
+    "notch": design_notch,
+    "allpass": design_allpass,
+}
+
+
+def design(kind: str, freq: float, sample_rate: int, **params) -> np.ndarray:
+    """
+    Fábrica genérica: design("lowpass", 200, 48000, order=4).
+    """
+    if kind not in DESIGNERS:
+        raise ValueError(f"Tipo de filtro desconhecido: {kind}")
+    return DESIGNERS[kind](freq, sample_rate, **params)
+
+
+# -------------------------------------------------
+# NUMPY ENGINE
+# -------------------------------------------------
+# Cada seção em forma de espaço de estados (Direct Form II transposta):
+#   y[n]   = b0 u[n] + z1[n]
+#   z[n+1] = A z[n] + B u[n]
+# O sinal é dividido em sub-blocos de L samples. Dentro do sub-bloco a
+# resposta de estado zero é um matmul com a Toeplitz da resposta ao
+# impulso; os estados de início de cada sub-bloco saem de uma
+# recorrência z_{k+1} = A^L z_k + G u_k, resolvida do mesmo jeito em
+# níveis. Nenhum loop Python por sample.
+
+class _SectionKernel:
+
+    def __init__(self, coeffs, size: int = SUB_BLOCK):
+        b0, b1, b2, a1, a2 = coeffs
+        a = np.array([[-a1, 1.0], [-a2, 0.0]])
+        b = np.array([b1 - a1 * b0, b2 - a2 * b0])
+
+        powers = _matrix_powers(a, size)
+        impulse = np.empty(size)
+        impulse[0] = b0
+        impulse[1:] = (powers[:size - 1] @ b)[:, 0]
+
+        idx = np.arange(size)
+        lag = idx[:, None] - idx[None, :]
+        toeplitz = np.where(lag >= 0, impulse[np.clip(lag, 0, None)], 0.0)
+
+        self.size = size
+        self.powers = powers
+        self.toeplitz = toeplitz                     # (L, L)
+        self.observe = powers[:size, 0, :].copy()    # (L, 2): linha i = C A^i
+        self.gather = (powers[size - 1::-1] @ b).T   # (2, L): coluna j = A^(L-1-j) B
+        self.step = powers[size]                     # A^L
+
+
+def _matrix_powers(m: np.ndarray, count: int) -> np.ndarray:
+    """
+    [I, M, M^2, ..., M^count]
+    """
+    powers = np.empty((count + 1,) + m.shape)
+    powers[0] = np.eye(m.shape[0])
+    for i in range(1, count + 1):
+        powers[i] = powers[i - 1] @ m
+    return powers
+
+
+def _solve_states(step: np.ndarray, inputs: np.ndarray, start: np.ndarray, block: int = SUB_BLOCK):
+    """
+    Resolve s_{k+1} = step @ s_k + inputs[k] para todos os k.
+    inputs: (K, d, C). Retorna (K + 1, d, C), com s_0 = start.
+    """
+    count, dim, channels = inputs.shape
+
+    if count <= block:
+        states = np.empty((count + 1, dim, channels))
+        states[0] = start
+        for k in range(count):
+            states[k + 1] = step @ states[k] + inputs[k]
+        return states
+
+    groups = -(-count // block)
+    pad = groups * block - count
+    if pad:
+        inputs = np.concatenate((inputs, np.zeros((pad, dim, channels))))
+
+    powers = _matrix_powers(step, block)
+
+    # local[g, i] = soma_{j <= i} step^(i-j) inputs[g, j]  (estado zero)
+    lag = np.arange(block)[:, None] - np.arange(block)[None, :]
+    kernel = np.where((lag >= 0)[:, :, None, None], powers[np.clip(lag, 0, None)], 0.0)
+    kernel = kernel.transpose(0, 2, 1, 3).reshape(block * dim, block * dim)
+
+    grouped = inputs.reshape(groups, block * dim, channels)
+    local = (kernel @ grouped).reshape(groups, block, dim, channels)
+
+    starts = _solve_states(powers[block], local[:, -1], start, block)
+
+    spread = powers[:block].reshape(block * dim, dim)
+    states = (spread @ starts[:groups]).reshape(groups, block, dim, channels)
+    states[:, 1:] += local[:, :-1]
+
+    flat = np.concatenate((states.reshape(-1, dim, channels), starts[groups:]))
+    return flat[:count + 1]
+
+
+def _run_section(kernel: _SectionKernel, x: np.ndarray, z: np.ndarray):
+    size = kernel.size
+    frames, channels = x.shape
+    count = frames // size
+    body_end = count * size
+    y = np.empty_like(x)
+
+    if count:
+        cols = x[:body_end].reshape(count, size, channels).transpose(1, 0, 2).reshape(size, -1)
+
+        out = kernel.toeplitz @ cols
+        inputs = (kernel.gather @ cols).reshape(2, count, channels).transpose(1, 0, 2)
+        states = _solve_states(kernel.step, inputs, z)
+
+        out += kernel.observe @ states[:count].transpose(1, 0, 2).reshape(2, -1)
+        y[:body_end] = out.reshape(size, count, channels).transpose(1, 0, 2).reshape(body_end, channels)
+        z = states[count]
+
+    rest = frames - body_end
+    if rest:
+        u = x[body_end:]
+        y[body_end:] = kernel.toeplitz[:rest, :rest] @ u + kernel.observe[:rest] @ z
+        z = kernel.powers[rest] @ z + kernel.gather[:, size - rest:] @ u
+
+    return y, z
+
+
+# -------------------------------------------------
+# FILTER
+# -------------------------------------------------
+
+class SOSFilter:
+    """
+    Cascata de biquads aplicada em blocos float32 (frames, canais).
+    O estado é mantido entre chamadas, então blocos consecutivos
+    produzem o mesmo resultado que o arquivo inteiro de uma vez.
+    """
+
+    def __init__(self, sections, channels: int):
+        self.sections = np.atleast_2d(np.asarray(sections, dtype=np.float64))
+        self.channels = channels
+        self.state = np.zeros((len(self.sections), 2, channels))
+        self._kernels = None
+
+    def reset(self):
+        self.state[:] = 0.0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block)
+        if block.ndim == 1:
+            block = block.reshape(-1, 1)
+
+        out = np.empty(block.shape, dtype=np.float32)
+
+        for lo in range(0, len(block), MAX_BLOCK_FRAMES):
+            hi = lo + MAX_BLOCK_FRAMES
+            out[lo:hi] = self._process_chunk(block[lo:hi].astype(np.float64))
+
+        return out
+
+    def _process_chunk(self, x: np.ndarray) -> np.ndarray:
+        if _sosfilt is not None:
+            sos = np.column_stack((self.sections[:, :3], np.ones(len(self.sections)), self.sections[:, 3:]))
+            y, self.state = _sosfilt(sos, x, axis=0, zi=self.state)
+            return y
+
+        if self._kernels is None:
+            self._kernels = [_SectionKernel(s) for s in self.sections]
+
+        for i, kernel in enumerate(self._kernels):
+            x, self.state[i] = _run_section(kernel, x, self.state[i])
+
+        return x
+
+
+def filter_samples(samples: np.ndarray, sections) -> np.ndarray:
+    """
+    Aplica a cascata em um array completo (frames, canais) de uma vez.
+    """
+    samples = np.asarray(samples)
+    channels = samples.shape[1] if samples.ndim > 1 else 1
+    return SOSFilter(sections, channels).process(samples)
+
+
+def frequency_response(sections, freqs, sample_rate: int) -> np.ndarray:
+    """
+    Resposta complexa da cascata nas frequências dadas (Hz).
+    """
+    z = np.exp(-1j * 2 * np.pi * np.asarray(freqs, dtype=np.float64) / sample_rate)
+    response = np.ones_like(z)
+
+    for b0, b1, b2, a1, a2 in np.atleast_2d(sections):
+        response *= (b0 + b1 * z + b2 * z * z) / (1 + a1 * z + a2 * z * z)
+
+    return response
@@ -0,0 +1,163 @@
+import json
+import math
+from functools import lru_cache
+
+import numpy as np
+
+from .crossover import db_to_gain
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+# Número de taps padrão (ímpar, para atraso inteiro). A resolução em
+# frequência fica perto de sample_rate / FIR_TAPS.
+FIR_TAPS = 4095
+
+# Quantos blocos de FFT são transformados de uma vez.
+BATCH_BLOCKS = 32
+
+
+# -------------------------------------------------
+# DESIGN
+# -------------------------------------------------
+
+def _band_key(bands: list) -> str:
+    return json.dumps(bands, sort_keys=True, default=repr)
+
+
+def _desired_gain(freqs: np.ndarray, bands: list) -> np.ndarray:
+    """
+    Ganho linear desejado em cada frequência: soma dos ganhos das bandas
+    que a cobrem (mesma regra do apply_multiband_eq).
+    """
+    gain = np.zeros_like(freqs)
+
+    for band in bands:
+        kind = band.get("type")
+        if kind == "lowpass":
+            covered = freqs <= band["freq"]
+        elif kind == "highpass":
+            covered = freqs >= band["freq"]
+        elif kind == "band":
+            covered = (freqs >= band["low"]) & (freqs <= band["high"])
+        else:
+            continue
+
+        gain[covered] += db_to_gain(band.get("gain", 0.0))
+
+    return gain
+
+
+@lru_cache(maxsize=32)
+def _design_cached(key: str, sample_rate: int, taps: int) -> np.ndarray:
+    bands = json.loads(key)
+    grid = 1 << int(math.ceil(math.log2(taps * 4)))
+    freqs = np.fft.rfftfreq(grid, 1.0 / sample_rate)
+
+    # Resposta de fase zero -> impulso simétrico centrado, janelado.
+    impulse = np.fft.irfft(_desired_gain(freqs, bands), grid)
+    impulse = np.roll(impulse, taps // 2)[:taps]
+    impulse *= np.blackman(taps)
+
+    kernel = impulse.astype(np.float64)
+    kernel.setflags(write=False)
+    return kernel
+
+
+def design_fir(bands: list, sample_rate: int, taps: int = FIR_TAPS) -> np.ndarray:
+    """
+    FIR de fase linear (um único kernel) para a lista de bandas.
+    Kernels são guardados em cache por (bandas, sample_rate, taps).
+    """
+    if taps % 2 == 0:
+        taps += 1
+    return _design_cached(_band_key(bands), sample_rate, taps)
+
+
+# -------------------------------------------------
+# OVERLAP-ADD
+# -------------------------------------------------
+
+class OverlapAddConvolver:
+    """
+    Convolução por FFT com overlap-add, em blocos (frames, canais).
+    O custo por sample é fixo, não importa quantas bandas geraram o kernel.
+    A saída sai atrasada de `latency` frames; flush() devolve a cauda.
+    """
+
+    def __init__(self, kernel: np.ndarray, channels: int):
+        self.taps = len(kernel)
+        self.channels = channels
+        self.fft_size = 1 << int(math.ceil(math.log2(2 * self.taps)))
+        self.hop = self.fft_size - self.taps + 1
+        self.latency = (self.taps - 1) // 2
+
+        self._spectrum = np.fft.rfft(kernel, self.fft_size)[None, :, None]
+        self._pending = np.zeros((0, channels), dtype=np.float32)
+        self._tail = np.zeros((self.taps - 1, channels), dtype=np.float64)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float32).reshape(-1, self.channels)
+        pending = np.concatenate((self._pending, block)) if len(self._pending) else block
+
+        usable = len(pending) - len(pending) % self.hop
+        self._pending = pending[usable:].copy()
+
+        step = self.hop * BATCH_BLOCKS
+        outputs = [
+            self._convolve(pending[lo:min(lo + step, usable)])
+            for lo in range(0, usable, step)
+        ]
+
+        if not outputs:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return np.concatenate(outputs)
+
+    def flush(self) -> np.ndarray:
+        """
+        Processa o resto pendente e devolve a cauda do kernel.
+        """
+        rest = len(self._pending)
+        out = self._tail.astype(np.float32)
+
+        if rest:
+            padded = np.zeros((self.hop, self.channels), dtype=np.float32)
+            padded[:rest] = self._pending
+            self._pending = padded[:0]
+
+            heads = self._convolve(padded)
+            out = np.concatenate((heads, self._tail.astype(np.float32)))[:rest + self.taps - 1]
+
+        self._tail = np.zeros_like(self._tail)
+        return out
+
+    def _convolve(self, chunk: np.ndarray) -> np.ndarray:
+        count = len(chunk) // self.hop
+        hop, overlap = self.hop, self.taps - 1
+
+        blocks = chunk.reshape(count, hop, self.channels)
+        spectra = np.fft.rfft(blocks, self.fft_size, axis=1)
+        spectra *= self._spectrum
+        wet = np.fft.irfft(spectra, self.fft_size, axis=1)
+
+        # Cada cauda (overlap < hop) cai só no começo do bloco seguinte.
+        heads = wet[:, :hop]
+        heads[1:, :overlap] += wet[:-1, hop:]
+        heads[0, :overlap] += self._tail
+        self._tail = wet[-1, hop:].copy()
+
+        return heads.reshape(-1, self.channels).astype(np.float32)
+
+
+def fir_filter(samples: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """
+    Aplica o kernel em um array completo, compensando o atraso da fase
+    linear: a saída fica alinhada com a entrada e com o mesmo tamanho.
+    """
+    samples = np.asarray(samples)
+    convolver = OverlapAddConvolver(kernel, samples.shape[1])
+    wet = np.concatenate((convolver.process(samples), convolver.flush()))
+
+    return wet[convolver.latency:convolver.latency + len(samples)]
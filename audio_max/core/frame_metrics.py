@@ -0,0 +1,220 @@
+import math
+
+import numpy as np
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+# Quantas janelas são reduzidas por vez. Limita o tamanho dos
+# temporários float64 sem voltar para um loop por janela.
+WINDOWS_PER_BLOCK = 8192
+
+_DTYPES = {
+    1: np.int8,
+    2: np.int16,
+    4: np.int32,
+}
+
+_LOG10 = math.log(10)
+
+
+# -------------------------------------------------
+# SAMPLE VIEWS
+# -------------------------------------------------
+
+def full_scale(sample_width: int) -> float:
+    """
+    Amplitude máxima possível (igual a AudioSegment.max_possible_amplitude).
+    """
+    return float(2 ** (sample_width * 8)) / 2
+
+
+def pcm_to_array(data, sample_width: int, channels: int) -> np.ndarray:
+    """
+    Interpreta bytes PCM intercalados como array (frames, canais).
+    Para 8/16/32 bits é uma view sem cópia; 24 bits é expandido para int32.
+    """
+    if sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        samples = (raw[:, 0].astype(np.int32)
+                   | (raw[:, 1].astype(np.int32) << 8)
+                   | (raw[:, 2].view(np.int8).astype(np.int32) << 16))
+    elif sample_width in _DTYPES:
+        samples = np.frombuffer(data, dtype=_DTYPES[sample_width])
+    else:
+        raise ValueError(f"sample_width não suportado: {sample_width}")
+
+    return samples.reshape(-1, channels)
+
+
+def segment_to_array(segment) -> np.ndarray:
+    """
+    View (frames, canais) dos samples de um AudioSegment, sem cópia.
+    """
+    return pcm_to_array(segment.raw_data, segment.sample_width, segment.channels)
+
+
+# -------------------------------------------------
+# WINDOWS
+# -------------------------------------------------
+
+def window_edges(n_frames: int, frame_rate: int, chunk_ms: int, duration_ms=None):
+    """
+    Calcula as janelas exatamente como segment[i:i + chunk_ms] do pydub.
+    Retorna (start_ms, end_ms, begin_frame, end_frame).
+    """
+    if chunk_ms <= 0:
+        raise ValueError("chunk_ms deve ser maior que zero.")
+
+    if duration_ms is None:
+        duration_ms = round(1000 * (n_frames / frame_rate)) if frame_rate else 0
+
+    start_ms = np.arange(0, duration_ms, chunk_ms, dtype=np.int64)
+    end_ms = np.minimum(start_ms + chunk_ms, duration_ms)
+
+    # Mesmo arredondamento de AudioSegment._parse_position
+    per_ms = frame_rate / 1000.0
+    begin = (start_ms * per_ms).astype(np.int64)
+    end = (end_ms * per_ms).astype(np.int64)
+
+    return start_ms, end_ms, begin, end
+
+
+def _reduce_block(flat, offsets, lengths, step):
+    """
+    Reduz um bloco contíguo de samples em (pico, soma dos quadrados) por janela.
+    Quando todas as janelas têm o mesmo tamanho o bloco é só remodelado
+    (view); caso contrário usa reduceat sobre os offsets.
+    """
+    if step and flat.size == step * len(offsets):
+        windows = flat.reshape(len(offsets), step)
+        hi = windows.max(axis=1).astype(np.int64)
+        lo = windows.min(axis=1).astype(np.int64)
+        as_float = windows.astype(np.float64)
+        sumsq = np.einsum("ij,ij->i", as_float, as_float)
+        return np.maximum(hi, -lo), sumsq
+
+    peak = np.zeros(len(offsets), dtype=np.int64)
+    sumsq = np.zeros(len(offsets), dtype=np.float64)
+
+    filled = lengths > 0
+    if not filled.any():
+        return peak, sumsq
+
+    idx = offsets[filled]
+    hi = np.maximum.reduceat(flat, idx).astype(np.int64)
+    lo = np.minimum.reduceat(flat, idx).astype(np.int64)
+    as_float = flat.astype(np.float64)
+
+    peak[filled] = np.maximum(hi, -lo)
+    sumsq[filled] = np.add.reduceat(as_float * as_float, idx)
+    return peak, sumsq
+
+
+# -------------------------------------------------
+# FRAME METRICS
+# -------------------------------------------------
+
+def compute_frame_metrics(samples: np.ndarray,
+                          frame_rate: int,
+                          sample_width: int,
+                          chunk_ms: int,
+                          duration_ms=None) -> dict:
+    """
+    Calcula pico, RMS e seus valores em dBFS para cada janela de chunk_ms
+    em uma única passada vetorizada.
+
+    samples: array (frames, canais) de inteiros.
+    Retorna dict de arrays: start_ms, end_ms, peak, rms, peak_dbfs, rms_dbfs.
+    Os valores batem com chunk.max / chunk.rms / chunk.max_dBFS do pydub.
+    """
+    n_frames, channels = samples.shape
+    start_ms, end_ms, begin, end = window_edges(n_frames, frame_rate, chunk_ms, duration_ms)
+
+    count = len(start_ms)
+    peak = np.zeros(count, dtype=np.int64)
+    sumsq = np.zeros(count, dtype=np.float64)
+
+    flat = np.ascontiguousarray(samples).reshape(-1)
+    clipped_begin = np.minimum(begin, n_frames)
+    clipped_end = np.minimum(end, n_frames)
+
+    per_window = begin[1] - begin[0] if count > 1 else 0
+    uniform = bool(count > 1 and np.all(np.diff(begin) == per_window))
+
+    for lo in range(0, count, WINDOWS_PER_BLOCK):
+        hi = min(lo + WINDOWS_PER_BLOCK, count)
+
+        first = clipped_begin[lo]
+        last = clipped_end[hi - 1]
+        if last <= first:
+            continue
+
+        block = flat[first * channels:last * channels]
+        offsets = (clipped_begin[lo:hi] - first) * channels
+        lengths = (clipped_end[lo:hi] - clipped_begin[lo:hi]) * channels
+        step = per_window * channels if uniform else 0
+
+        peak[lo:hi], sumsq[lo:hi] = _reduce_block(block, offsets, lengths, step)
+
+    # Frames além do fim são preenchidos com silêncio pelo pydub,
+    # então contam no denominador do RMS.
+    denom = (end - begin) * channels
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rms = np.where(denom > 0, np.floor(np.sqrt(sumsq / np.maximum(denom, 1))), 0)
+    rms = rms.astype(np.int64)
+
+    scale = full_scale(sample_width)
+
+    return {
+        "start_ms": start_ms,
+        "end_ms": end_ms,
+        "peak": peak,
+        "rms": rms,
+        "peak_dbfs": to_dbfs(peak, scale),
+        "rms_dbfs": to_dbfs(rms, scale),
+    }
+
+
+def compute_segment_metrics(segment, chunk_ms: int) -> dict:
+    """
+    compute_frame_metrics direto de um AudioSegment.
+    """
+    return compute_frame_metrics(
+        segment_to_array(segment),
+        segment.frame_rate,
+        segment.sample_width,
+        chunk_ms,
+        duration_ms=len(segment),
+    )
+
+
+# -------------------------------------------------
+# HELPERS
+# -------------------------------------------------
+
+def to_dbfs(values: np.ndarray, scale: float) -> np.ndarray:
+    """
+    Converte amplitudes em dBFS (-inf para zero), como ratio_to_db do pydub.
+    """
+    ratio = np.asarray(values, dtype=np.float64) / scale
+    with np.errstate(divide="ignore"):
+        return 20 * (np.log(ratio) / _LOG10)
+
+
+def mask_to_intervals(start_ms: np.ndarray, end_ms: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Junta janelas consecutivas marcadas em intervalos [start, end] (ms).
+    Retorna array (n, 2).
+    """
+    mask = np.asarray(mask, dtype=bool)
+    if not mask.any():
+        return np.empty((0, 2), dtype=np.int64)
+
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    first = np.flatnonzero(edges == 1)
+    last = np.flatnonzero(edges == -1) - 1
+
+    return np.stack((start_ms[first], end_ms[last]), axis=1)
@@ -1,13 +1,132 @@
 # core/global_cache.py
+import threading
+import time
+
+from ..utils.logging import info, error
+
+# Tempo máximo de uma descoberta em segundo plano
+DISCOVERY_TIMEOUT = 60.0
+
+IDLE = "IDLE"
+RUNNING = "RUNNING"
+DONE = "DONE"
+TIMEOUT = "TIMEOUT"
+CANCELLED = "CANCELLED"
+FAILED = "FAILED"
+
 DAW_CACHE = []
+BEST_DAW = None
+
+# Incrementado a cada mudança; a UI redesenha quando muda
+VERSION = 0
+DISCOVERY_STATE = IDLE
+
+_LOCK = threading.RLock()
+_THREAD = None
+_CANCEL = threading.Event()
 
 def get_cached_daws():
     """Retorna a lista de DAWs detectadas (rápido, sem buscar no sistema)."""
-    global DAW_CACHE
-    return DAW_CACHE
+    with _LOCK:
+        return list(DAW_CACHE)
+
+def get_best_daw():
+    """Melhor host já calculado em update_daw_cache (sem reordenar a cada redraw)."""
+    return BEST_DAW
+
+def get_version() -> int:
+    return VERSION
+
+def get_discovery_state() -> str:
+    return DISCOVERY_STATE
+
+def is_discovering() -> bool:
+    return DISCOVERY_STATE == RUNNING
+
+def _set_hosts(hosts):
+    global DAW_CACHE, BEST_DAW, VERSION
+    from ..external.host_priority import get_best_host
+    with _LOCK:
+        DAW_CACHE = sorted(set(hosts))
+        BEST_DAW = get_best_host(DAW_CACHE)
+        VERSION += 1
+
+def _set_state(state: str):
+    global DISCOVERY_STATE, VERSION
+    with _LOCK:
+        DISCOVERY_STATE = state
+        VERSION += 1
+
+def publish_hosts(hosts):
+    """Acrescenta hosts encontrados (chamado da thread de descoberta)."""
+    with _LOCK:
+        merged = set(DAW_CACHE).union(hosts)
+        if len(merged) != len(DAW_CACHE):
+            _set_hosts(merged)
 
 def update_daw_cache():
-    """Atualiza a lista de DAWs chamando detect_all_audio_hosts UMA vez."""
-    global DAW_CACHE
+    """
+    Atualiza a lista de DAWs a partir do índice persistente de hosts.
+    Com o índice quente só as pastas alteradas são relidas.
+    Síncrono — na UI prefira start_discovery().
+    """
+    from ..external.daw_detector import detect_all_audio_hosts
+    _set_hosts(detect_all_audio_hosts())
+
+# -------------------------------------------------
+# BACKGROUND DISCOVERY
+# -------------------------------------------------
+
+def _discover(timeout: float):
     from ..external.daw_detector import detect_all_audio_hosts
-    DAW_CACHE = detect_all_audio_hosts()
\ No newline at end of file
+    from ..external.host_index import get_host_index
+
+    started = time.monotonic()
+    try:
+        hosts = detect_all_audio_hosts(
+            on_found=publish_hosts,
+            cancel=_CANCEL,
+            deadline=started + timeout,
+        )
+    except Exception as e:
+        error("Falha na detecção de DAWs: %s", e)
+        _set_state(FAILED)
+        return
+
+    if _CANCEL.is_set():
+        _set_state(CANCELLED)
+        return
+
+    if get_host_index().interrupted:
+        info("Detecção de DAWs parou após %.0fs; resultado parcial", timeout)
+        _set_state(TIMEOUT)
+        return
+
+    # Lista completa: remove também hosts que sumiram desde a última vez
+    _set_hosts(hosts)
+    _set_state(DONE)
+    info("DAWs detectadas (%.2fs): %s", time.monotonic() - started, hosts)
+
+def start_discovery(timeout: float = DISCOVERY_TIMEOUT) -> bool:
+    """
+    Inicia a detecção de DAWs em uma thread. Os hosts aparecem em
+    get_cached_daws() conforme são encontrados. Retorna False se já
+    houver uma detecção em andamento.
+    """
+    global _THREAD
+    with _LOCK:
+        if _THREAD is not None and _THREAD.is_alive():
+            return False
+
+        _CANCEL.clear()
+        _set_state(RUNNING)
+        _THREAD = threading.Thread(target=_discover, args=(timeout,), name="AudioMaxDAWDiscovery", daemon=True)
+        _THREAD.start()
+        return True
+
+def cancel_discovery(wait: float = 1.0):
+    """Pede para a detecção parar (ex.: no unregister) e espera até `wait` s."""
+    _CANCEL.set()
+    thread = _THREAD
+    if thread is not None and thread.is_alive():
+        thread.join(wait)
@@ -0,0 +1,349 @@
+# core/incremental_mixdown.py
+import bpy
+import hashlib
+import json
+import math
+import os
+import subprocess
+from fractions import Fraction
+
+from ..utils.paths import get_temp_dir, resolve_ffmpeg
+from ..utils.logging import info, error
+from .result_cache import ResultCache
+from .wavfile import WavFile, WavWriter
+from ..utils.profiling import span
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+SEGMENT_SECONDS = 10.0
+MIXRATE = 44100
+SAMPLE_FORMAT = 'S16'
+CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+# Tipos de strip que podem produzir áudio no mixdown
+AUDIO_STRIP_TYPES = {'SOUND', 'SCENE', 'META'}
+
+_CACHE = None
+
+
+def get_segment_cache() -> ResultCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ResultCache(
+            os.path.join(get_temp_dir(), "mixdown_cache"),
+            max_disk_bytes=CACHE_MAX_BYTES,
+        )
+    return _CACHE
+
+
+# -------------------------------------------------
+# TIMELINE
+# -------------------------------------------------
+
+def _all_strips(seq):
+    for attr in ('strips_all', 'sequences_all', 'strips', 'sequences'):
+        if hasattr(seq, attr):
+            return list(getattr(seq, attr))
+    return []
+
+
+def _samples_per_frame(scene, mixrate: int = MIXRATE) -> Fraction:
+    fps_base = Fraction(scene.render.fps_base).limit_denominator(10000)
+    return Fraction(mixrate) * fps_base / scene.render.fps
+
+
+def _segment_frames(scene, seconds: float, mixrate: int = MIXRATE) -> int:
+    """
+    Tamanho do segmento em frames, múltiplo do necessário para que cada
+    borda caia em um sample inteiro (ex.: 24 fps @ 44.1 kHz -> par).
+    """
+    step = _samples_per_frame(scene, mixrate).denominator
+    wanted = max(1, int(round(seconds * scene.render.fps / scene.render.fps_base)))
+    return max(step, int(math.ceil(wanted / step)) * step)
+
+
+def _file_stamp(path: str):
+    path = bpy.path.abspath(path) if path else ""
+    try:
+        stat = os.stat(path)
+        return [path, stat.st_size, stat.st_mtime_ns]
+    except OSError:
+        return [path, None, None]
+
+
+def _action_fcurves(anim) -> list:
+    """
+    F-curves da action da cena. Blender 4.4+ (slotted actions; 5.0 não
+    tem mais action.fcurves): camadas -> strips -> channelbag do slot
+    da cena. Versões antigas: action.fcurves.
+    """
+    action = anim.action
+    layers = getattr(action, "layers", None)
+    if layers is None:
+        return list(getattr(action, "fcurves", ()))
+
+    slot = getattr(anim, "action_slot", None)
+    if slot is None:
+        return []
+
+    curves = []
+    for layer in layers:
+        for action_strip in layer.strips:
+            bag = _channelbag(action_strip, slot)
+            if bag is not None:
+                curves.extend(bag.fcurves)
+
+    return curves
+
+
+def _channelbag(action_strip, slot):
+    if hasattr(action_strip, "channelbag"):
+        return action_strip.channelbag(slot)
+
+    for bag in getattr(action_strip, "channelbags", ()):
+        if bag.slot_handle == slot.handle:
+            return bag
+    return None
+
+
+def _strip_animation(scene, strip) -> list:
+    anim = scene.animation_data
+    if not anim or not anim.action:
+        return []
+
+    marker = f'["{strip.name}"]'
+    curves = []
+
+    for fcurve in _action_fcurves(anim):
+        if marker not in fcurve.data_path:
+            continue
+        curves.append([
+            fcurve.data_path,
+            fcurve.array_index,
+            [[k.co[0], k.co[1], k.interpolation] for k in fcurve.keyframe_points],
+        ])
+
+    return curves
+
+
+def _channel_muted(seq, channel: int) -> bool:
+    channels = getattr(seq, "channels", None)
+    try:
+        return bool(channels[channel].mute) if channels else False
+    except (IndexError, KeyError, TypeError):
+        return False
+
+
+def _strip_state(scene, seq, strip) -> dict:
+    """
+    Tudo que muda o áudio de um strip: fonte, posição, cortes, volume,
+    mute, canal e animação.
+    """
+    state = {
+        "name": strip.name,
+        "type": strip.type,
+        "channel": strip.channel,
+        "frame_start": strip.frame_start,
+        "final_start": strip.frame_final_start,
+        "final_end": strip.frame_final_end,
+        "offset_start": getattr(strip, "frame_offset_start", 0),
+        "offset_end": getattr(strip, "frame_offset_end", 0),
+        "mute": strip.mute,
+        "channel_mute": _channel_muted(seq, strip.channel),
+        "volume": getattr(strip, "volume", 1.0),
+        "pan": getattr(strip, "pan", 0.0),
+        "speed": getattr(strip, "speed_factor", 1.0),
+        "animation": _strip_animation(scene, strip),
+    }
+
+    sound = getattr(strip, "sound", None)
+    if sound is not None:
+        state["source"] = _file_stamp(sound.filepath)
+
+    if strip.type == 'SCENE' and getattr(strip, "scene", None):
+        state["scene"] = strip.scene.name
+
+    return state
+
+
+def plan_segments(scene, segment_seconds: float = SEGMENT_SECONDS,
+                  mixrate: int = MIXRATE, sample_format: str = SAMPLE_FORMAT) -> list:
+    """
+    Divide a timeline em segmentos de tamanho fixo e calcula a impressão
+    digital de cada um a partir dos strips que o afetam.
+    """
+    seq = scene.sequence_editor
+    strips = [s for s in _all_strips(seq) if s.type in AUDIO_STRIP_TYPES] if seq else []
+    states = [(s.frame_final_start, s.frame_final_end, _strip_state(scene, seq, s)) for s in strips]
+
+    per_frame = _samples_per_frame(scene, mixrate)
+    length = _segment_frames(scene, segment_seconds, mixrate)
+    first, last = scene.frame_start, scene.frame_end
+
+    common = {
+        "fps": scene.render.fps,
+        "fps_base": scene.render.fps_base,
+        "mixrate": mixrate,
+        "format": sample_format,
+        "volume": getattr(scene, "audio_volume", 1.0),
+        "channels": getattr(scene.render.ffmpeg, "audio_channels", ""),
+    }
+
+    segments = []
+    for start in range(first, last + 1, length):
+        end = min(start + length - 1, last)
+        affecting = [state for s0, s1, state in states if s0 <= end and s1 > start]
+
+        payload = json.dumps(
+            {"range": [start, end], "common": common, "strips": affecting},
+            sort_keys=True, default=repr,
+        )
+
+        segments.append({
+            "start": start,
+            "end": end,
+            "samples": int((end - start + 1) * per_frame),
+            "key": hashlib.sha1(payload.encode("utf-8")).hexdigest(),
+            "mixrate": mixrate,
+            "format": sample_format,
+        })
+
+    return segments
+
+
+# -------------------------------------------------
+# RENDER
+# -------------------------------------------------
+
+def _render_segment(scene, segment: dict, filepath: str) -> bool:
+    """
+    Renderiza só [start, end] da timeline, restaurando o range da cena.
+    """
+    original = (scene.frame_start, scene.frame_end)
+
+    try:
+        scene.frame_start = segment["start"]
+        scene.frame_end = segment["end"]
+
+        result = bpy.ops.sound.mixdown(
+            filepath=filepath,
+            check_existing=False,
+            relative_path=False,
+            accuracy=1024,
+            container='WAV',
+            codec='PCM',
+            format=segment["format"],
+            mixrate=segment["mixrate"],
+        )
+    finally:
+        scene.frame_start, scene.frame_end = original
+
+    return 'FINISHED' in result and os.path.exists(filepath)
+
+
+def _append_exact(writer: WavWriter, path: str, samples: int):
+    """
+    Copia exatamente `samples` frames do segmento, cortando ou
+    completando com silêncio — garante junções sample-accurate.
+    """
+    with WavFile(path) as reader:
+        layout = (reader.sample_rate, reader.channels, reader.sample_width, reader.is_float)
+        if layout != (writer.sample_rate, writer.channels, writer.sample_width, writer.is_float):
+            raise ValueError(f"Segmento com formato diferente: {path}")
+
+        count = min(samples, reader.frames)
+        raw = reader.raw
+
+        # Cópia direta do mmap para o arquivo, sem decodificar
+        for begin in range(0, count, 65536):
+            writer.write_bytes(raw[begin:min(begin + 65536, count)].reshape(-1).data)
+
+    remaining = samples - count
+    if remaining > 0:
+        writer.write_bytes(b"\0" * (remaining * writer.sample_width * writer.channels))
+
+
+def _encode(wav_path: str, output_path: str):
+    result = subprocess.run(
+        [resolve_ffmpeg(), "-v", "error", "-y", "-i", wav_path, output_path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "ignore").strip())
+
+
+def iter_incremental_mixdown(filepath: str, segment_seconds: float = SEGMENT_SECONDS,
+                             mixrate: int = MIXRATE, sample_format: str = SAMPLE_FORMAT):
+    """
+    Gerador: renderiza apenas os segmentos cuja impressão digital mudou,
+    reaproveita os demais do cache e junta tudo em `filepath`.
+    mixrate/sample_format entram na impressão digital (S16, S24, F32...).
+    Produz a fração de progresso após cada segmento; retorna o caminho.
+    """
+    scene = bpy.context.scene
+    cache = get_segment_cache()
+    segments = plan_segments(scene, segment_seconds, mixrate, sample_format)
+    temp_dir = get_temp_dir()
+
+    if not segments:
+        raise RuntimeError("Timeline vazia (frame_end < frame_start)")
+
+    files = []
+    rendered = 0
+
+    for index, segment in enumerate(segments):
+        cached = cache.get_file(segment["key"], "wav")
+
+        if cached is None:
+            scratch = os.path.join(temp_dir, f"segment_{segment['key']}.wav")
+            with span("incremental_mixdown.render_segment", start=segment["start"], end=segment["end"]):
+                ok = _render_segment(scene, segment, scratch)
+            if not ok:
+                raise RuntimeError(f"Falha no mixdown dos frames {segment['start']}-{segment['end']}")
+
+            cached = cache.put_file(segment["key"], scratch, "wav")
+            os.remove(scratch)
+            rendered += 1
+
+        files.append((cached, segment["samples"]))
+        yield (index + 1) / (len(segments) + 1)
+
+    ext = os.path.splitext(filepath)[1].lower()
+    wav_path = filepath if ext == ".wav" else filepath + ".stitch.wav"
+
+    with WavFile(files[0][0]) as first:
+        layout = (first.sample_rate, first.channels, first.sample_width, first.is_float)
+
+    # Passando de 4 GB o WavWriter grava RF64 (o módulo wave não suporta)
+    with WavWriter(wav_path, *layout) as writer:
+        for path, samples in files:
+            _append_exact(writer, path, samples)
+
+    if wav_path != filepath:
+        _encode(wav_path, filepath)
+        os.remove(wav_path)
+
+    info("Mixdown incremental: %s/%s segmentos renderizados, %s do cache",
+         rendered, len(segments), len(segments) - rendered)
+
+    return filepath
+
+
+def incremental_mixdown(filepath: str, segment_seconds: float = SEGMENT_SECONDS,
+                        mixrate: int = MIXRATE, sample_format: str = SAMPLE_FORMAT):
+    """
+    Versão síncrona de iter_incremental_mixdown. Retorna o caminho ou None.
+    """
+    steps = iter_incremental_mixdown(filepath, segment_seconds, mixrate, sample_format)
+    try:
+        while True:
+            next(steps)
+    except StopIteration as stop:
+        return stop.value
+    except Exception as e:
+        error("Erro no mixdown incremental: %s", e)
+        return None
@@ -0,0 +1,314 @@
+import itertools
+import threading
+import time
+import types
+
+from ..utils.logging import info, error
+
+
+# -------------------------------------------------
+# STATES
+# -------------------------------------------------
+
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+_IDS = itertools.count(1)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# -------------------------------------------------
+# STAGE
+# -------------------------------------------------
+
+class Stage:
+    """
+    Uma etapa de um job.
+
+    func(job) recebe o job (job.data guarda o que as etapas anteriores
+    produziram) e pode:
+    - retornar o resultado direto
+    - retornar um gerador que produz frações de progresso (0..1); cada
+      passo roda em um tick, então o Blender redesenha entre passos
+
+    threaded=True roda func em uma thread worker. Use apenas para código
+    Python puro / ffmpeg — nunca chame bpy a partir de uma thread.
+    """
+
+    def __init__(self, name: str, func, threaded: bool = False, weight: float = 1.0):
+        self.name = name
+        self.func = func
+        self.threaded = threaded
+        self.weight = weight
+
+
+# -------------------------------------------------
+# JOB
+# -------------------------------------------------
+
+class Job:
+
+    def __init__(self, name: str, stages: list, data: dict = None):
+        self.id = next(_IDS)
+        self.name = name
+        self.stages = list(stages)
+        self.data = dict(data or {})
+
+        self.state = QUEUED
+        self.stage_index = 0
+        self.stage_progress = 0.0
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+
+        self._cancel = threading.Event()
+        self._thread = None
+        self._thread_outcome = None
+        self._generator = None
+
+    # --- info ---
+
+    @property
+    def stage_name(self) -> str:
+        if self.stage_index < len(self.stages):
+            return self.stages[self.stage_index].name
+        return ""
+
+    @property
+    def progress(self) -> float:
+        total = sum(s.weight for s in self.stages) or 1.0
+        done = sum(s.weight for s in self.stages[:self.stage_index])
+
+        if self.stage_index < len(self.stages):
+            done += self.stages[self.stage_index].weight * self.stage_progress
+
+        return min(done / total, 1.0)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def eta(self):
+        """
+        Segundos restantes estimados, ou None se ainda não dá para saber.
+        """
+        progress = self.progress
+        if self.state != RUNNING or progress < 0.01:
+            return None
+        return self.elapsed / progress * (1.0 - progress)
+
+    # --- control ---
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check_cancelled(self):
+        """
+        Etapas longas chamam isso periodicamente.
+        """
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, fraction: float):
+        """
+        Progresso da etapa atual (pode ser chamado de threads).
+        """
+        self.stage_progress = max(0.0, min(float(fraction), 1.0))
+
+
+# -------------------------------------------------
+# QUEUE
+# -------------------------------------------------
+
+class JobQueue:
+    """
+    Fila de jobs executada um por vez, avançada por tick() na thread
+    principal (ex.: bpy.app.timers). Etapas com threaded=True rodam em
+    thread própria; as demais rodam no tick.
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def submit(self, job: Job) -> Job:
+        with self._lock:
+            self.jobs.append(job)
+        info("Job #%s na fila: %s", job.id, job.name)
+        return job
+
+    def get(self, job_id: int):
+        for job in self.jobs:
+            if job.id == job_id:
+                return job
+        return None
+
+    def cancel(self, job_id: int = None):
+        """
+        Cancela um job (ou o ativo, se job_id for None).
+        """
+        job = self.get(job_id) if job_id is not None else self.active
+        if job and job.state not in FINISHED_STATES:
+            job.cancel()
+
+    def add_listener(self, callback):
+        """
+        callback(job) é chamado quando um job termina.
+        """
+        self._listeners.append(callback)
+
+    @property
+    def active(self):
+        for job in self.jobs:
+            if job.state == RUNNING:
+                return job
+        return None
+
+    @property
+    def busy(self) -> bool:
+        return any(job.state not in FINISHED_STATES for job in self.jobs)
+
+    def clear_finished(self):
+        with self._lock:
+            self.jobs = [job for job in self.jobs if job.state not in FINISHED_STATES]
+
+    # --- execution ---
+
+    def tick(self):
+        """
+        Avança o job ativo em um passo. Retorna True enquanto houver trabalho.
+        """
+        job = self.active
+        if job is None:
+            job = self._start_next()
+            if job is None:
+                return False
+
+        if job.cancelled and not self._thread_running(job):
+            self._close_generator(job)
+            self._finish(job, CANCELLED)
+            return True
+
+        try:
+            self._step(job)
+        except JobCancelled:
+            self._close_generator(job)
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            self._close_generator(job)
+            job.error = f"{type(e).__name__}: {e}"
+            self._finish(job, FAILED)
+
+        return True
+
+    def _start_next(self):
+        for job in self.jobs:
+            if job.state == QUEUED:
+                job.state = RUNNING
+                job.started = time.monotonic()
+                return job
+        return None
+
+    def _step(self, job: Job):
+        stage = job.stages[job.stage_index]
+
+        if stage.threaded:
+            self._step_threaded(job, stage)
+            return
+
+        if job._generator is None:
+            outcome = stage.func(job)
+            if not isinstance(outcome, types.GeneratorType):
+                self._advance(job, stage, outcome)
+                return
+            job._generator = outcome
+
+        try:
+            job.report(next(job._generator))
+        except StopIteration as stop:
+            job._generator = None
+            self._advance(job, stage, stop.value)
+
+    def _step_threaded(self, job: Job, stage: Stage):
+        if job._thread is None:
+            def target():
+                try:
+                    job._thread_outcome = ("ok", stage.func(job))
+                except Exception as e:
+                    job._thread_outcome = ("error", e)
+
+            job._thread = threading.Thread(target=target, name=f"AudioMaxJob{job.id}", daemon=True)
+            job._thread.start()
+            return
+
+        if job._thread.is_alive():
+            return
+
+        kind, value = job._thread_outcome
+        job._thread = None
+        job._thread_outcome = None
+
+        if kind == "error":
+            raise value
+
+        self._advance(job, stage, value)
+
+    def _advance(self, job: Job, stage: Stage, outcome):
+        job.data[stage.name] = outcome
+        job.result = outcome
+        job.stage_index += 1
+        job.stage_progress = 0.0
+
+        if job.stage_index >= len(job.stages):
+            self._finish(job, DONE)
+
+    def _thread_running(self, job: Job) -> bool:
+        return job._thread is not None and job._thread.is_alive()
+
+    def _close_generator(self, job: Job):
+        if job._generator is not None:
+            job._generator.close()
+            job._generator = None
+
+    def _finish(self, job: Job, state: str):
+        job.state = state
+        job.finished = time.monotonic()
+
+        if state == FAILED:
+            error("Job #%s (%s) falhou em '%s': %s", job.id, job.name, job.stage_name, job.error)
+        else:
+            info("Job #%s (%s): %s em %.1fs", job.id, job.name, state, job.elapsed)
+
+        for callback in list(self._listeners):
+            try:
+                callback(job)
+            except Exception as e:
+                error("Listener de job falhou: %s", e)
+
+
+# -------------------------------------------------
+# DEFAULT QUEUE
+# -------------------------------------------------
+
+_QUEUE = JobQueue()
+
+
+def get_job_queue() -> JobQueue:
+    return _QUEUE
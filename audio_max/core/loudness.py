@@ -0,0 +1,452 @@
+"""
+Loudness EBU R128 / ITU-R BS.1770-4 em streaming.
+
+    meter = LoudnessMeter(sample_rate, channels)
+    for block in blocks:                  # float32 (frames, canais)
+        meter.process(block)
+    meter.result()    # integrated, momentary_max, short_term_max, lra,
+                      # true_peak, sample_peak
+
+Uma passada, memória limitada (não depende da duração):
+- K-weighting: dois biquads (core.filters.SOSFilter, estado entre blocos);
+- energia em passos de 100 ms; momentary = 4 passos (400 ms),
+  short-term = 30 passos (3 s), janelas deslizantes a cada 100 ms;
+- integrado e LRA com as portas absoluta (-70 LUFS) e relativa
+  (-10 LU / -20 LU) sobre histogramas de 0.01 LU, não sobre a lista
+  de blocos;
+- true peak: sobreamostragem 4x polifásica (FIR de 48 taps).
+"""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .filters import SOSFilter
+from ..utils.logging import debug, warning
+
+if TYPE_CHECKING:
+    from pydub import AudioSegment
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+ABSOLUTE_GATE = -70.0
+RELATIVE_GATE = -10.0
+LRA_RELATIVE_GATE = -20.0
+LRA_PERCENTILES = (0.10, 0.95)
+
+STEP_SECONDS = 0.1
+MOMENTARY_STEPS = 4     # 400 ms
+SHORT_TERM_STEPS = 30   # 3 s
+
+# Histogramas de loudness: 0.01 LU de -70 a +30 LUFS
+HIST_MIN = ABSOLUTE_GATE
+HIST_MAX = 30.0
+HIST_STEP = 0.01
+
+OVERSAMPLE = 4
+TRUE_PEAK_TAPS = 48
+
+# Alvo padrão (EBU R128) e teto de true peak para normalização
+DEFAULT_TARGET = -23.0
+DEFAULT_TRUE_PEAK = -1.0
+
+# Frames por chamada ao medir arrays inteiros (limita temporários)
+MEASURE_BLOCK_FRAMES = 1 << 16
+
+
+# -------------------------------------------------
+# K-WEIGHTING
+# -------------------------------------------------
+
+def k_weighting(sample_rate: int) -> np.ndarray:
+    """
+    Seções (b0, b1, b2, a1, a2) do filtro K para qualquer sample rate:
+    shelf de +4 dB em ~1.7 kHz + passa-altas RLB em ~38 Hz.
+    Em 48 kHz reproduz os coeficientes tabelados da BS.1770.
+    """
+    # Estágio 1: high shelf
+    k = math.tan(math.pi * 1681.974450955533 / sample_rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = [(vh + vb * k / q + k * k) / a0,
+             2 * (k * k - vh) / a0,
+             (vh - vb * k / q + k * k) / a0,
+             2 * (k * k - 1) / a0,
+             (1 - k / q + k * k) / a0]
+
+    # Estágio 2: passa-altas (numerador não normalizado, como na norma)
+    k = math.tan(math.pi * 38.13547087602444 / sample_rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    highpass = [1.0, -2.0, 1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+    return np.array([shelf, highpass], dtype=np.float64)
+
+
+def channel_weights(channels: int) -> np.ndarray:
+    """
+    Pesos G_i da BS.1770: surrounds 1.41, LFE fora (layouts 5.0 e 5.1).
+    """
+    if channels == 6:
+        return np.array([1.0, 1.0, 1.0, 0.0, 1.41, 1.41])
+    if channels == 5:
+        return np.array([1.0, 1.0, 1.0, 1.41, 1.41])
+    return np.ones(channels)
+
+
+def power_to_lufs(power: float):
+    return -0.691 + 10 * math.log10(power) if power > 0 else None
+
+
+def _lufs_array(power: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore"):
+        return -0.691 + 10 * np.log10(power)
+
+
+# -------------------------------------------------
+# TRUE PEAK
+# -------------------------------------------------
+
+def _oversampling_phases(factor: int = OVERSAMPLE, taps: int = TRUE_PEAK_TAPS) -> np.ndarray:
+    """
+    (taps / factor, factor): coluna p = fase p do FIR interpolador,
+    já invertida para o produto com a janela de entrada.
+    """
+    n = np.arange(taps) - (taps - 1) / 2
+    h = np.sinc(n / factor) * np.kaiser(taps, 8.0)
+    h *= factor / h.sum()
+    return h.reshape(-1, factor)[::-1].astype(np.float32)
+
+
+class TruePeakMeter:
+    """
+    Pico entre samples: interpola 4x (polifásico) e guarda o máximo.
+    """
+
+    def __init__(self, channels: int, factor: int = OVERSAMPLE):
+        self.phases = _oversampling_phases(factor)
+        self.history = np.zeros((len(self.phases) - 1, channels), dtype=np.float32)
+        self.peak = 0.0
+
+    def process(self, block: np.ndarray):
+        padded = np.concatenate((self.history, block))
+        self.history = padded[len(padded) - len(self.history):].copy()
+
+        frames = len(block)
+        if not frames:
+            return
+
+        # Uma fase por vez, como soma de fatias deslocadas: mais rápido
+        # que o matmul sobre a janela deslizante (taps é pequeno)
+        for phase in self.phases.T:
+            acc = phase[0] * padded[:frames]
+            for tap in range(1, len(phase)):
+                acc += phase[tap] * padded[tap:tap + frames]
+            np.abs(acc, out=acc)
+            self.peak = max(self.peak, float(acc.max()))
+
+
+# -------------------------------------------------
+# GATED HISTOGRAM
+# -------------------------------------------------
+
+class _Histogram:
+    """
+    Contagem e soma de energia por faixa de 0.01 LU. Tamanho fixo:
+    integra horas de áudio sem guardar os blocos.
+    """
+
+    def __init__(self):
+        bins = int(round((HIST_MAX - HIST_MIN) / HIST_STEP))
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.energy = np.zeros(bins, dtype=np.float64)
+        self.centers = HIST_MIN + (np.arange(bins) + 0.5) * HIST_STEP
+
+    def add(self, power: np.ndarray):
+        loudness = _lufs_array(power)
+        keep = loudness > ABSOLUTE_GATE
+        if not np.any(keep):
+            return
+
+        index = ((loudness[keep] - HIST_MIN) / HIST_STEP).astype(np.int64)
+        np.clip(index, 0, len(self.counts) - 1, out=index)
+        self.counts += np.bincount(index, minlength=len(self.counts))
+        self.energy += np.bincount(index, weights=power[keep], minlength=len(self.counts))
+
+    def relative_gate(self, offset: float):
+        """
+        Máscara das faixas acima de (loudness média acima da porta absoluta + offset).
+        """
+        total = self.counts.sum()
+        if not total:
+            return None
+        threshold = power_to_lufs(self.energy.sum() / total) + offset
+        return self.centers > threshold
+
+    def gated_loudness(self, offset: float):
+        mask = self.relative_gate(offset)
+        if mask is None or not self.counts[mask].any():
+            return None
+        return power_to_lufs(self.energy[mask].sum() / self.counts[mask].sum())
+
+    def loudness_range(self, offset: float):
+        mask = self.relative_gate(offset)
+        if mask is None:
+            return None
+
+        counts = np.where(mask, self.counts, 0)
+        total = counts.sum()
+        if total < 2:
+            return 0.0 if total else None
+
+        cumulative = np.cumsum(counts)
+        low, high = (self.centers[np.searchsorted(cumulative, p * total)] for p in LRA_PERCENTILES)
+        return float(high - low)
+
+
+# -------------------------------------------------
+# METER
+# -------------------------------------------------
+
+class LoudnessMeter:
+    """
+    Medidor BS.1770 em blocos float32 (frames, canais) de qualquer tamanho.
+    `momentary` e `short_term` têm o último valor (medidor ao vivo).
+    """
+
+    def __init__(self, sample_rate: int, channels: int, true_peak: bool = True):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = 0
+
+        self._filter = SOSFilter(k_weighting(sample_rate), channels)
+        self._weights = channel_weights(channels)
+        self._step = int(round(sample_rate * STEP_SECONDS))
+
+        # Passo de 100 ms incompleto + os últimos 29 passos completos
+        self._partial_energy = 0.0
+        self._partial_frames = 0
+        self._steps = np.zeros(0)
+
+        self._blocks = _Histogram()
+        self._short_terms = _Histogram()
+        self._true_peak = TruePeakMeter(channels) if true_peak else None
+        self._sample_peak = 0.0
+
+        self.momentary = None
+        self.short_term = None
+        self.momentary_max = None
+        self.short_term_max = None
+
+    def process(self, block: np.ndarray):
+        block = np.asarray(block, dtype=np.float32)
+        if block.ndim == 1:
+            block = block.reshape(-1, self.channels)
+        if not len(block):
+            return
+
+        self.frames += len(block)
+        self._sample_peak = max(self._sample_peak, float(np.max(np.abs(block))))
+        if self._true_peak is not None:
+            self._true_peak.process(block)
+
+        weighted = self._filter.process(block)
+        energy = np.square(weighted, dtype=np.float64) @ self._weights
+        self._add_steps(self._split_steps(energy))
+
+    def _split_steps(self, energy: np.ndarray) -> np.ndarray:
+        """
+        Energia por sample -> potência média de cada passo de 100 ms
+        que se completou neste bloco.
+        """
+        need = self._step - self._partial_frames
+
+        if len(energy) < need:
+            self._partial_energy += float(energy.sum())
+            self._partial_frames += len(energy)
+            return np.zeros(0)
+
+        first = (self._partial_energy + float(energy[:need].sum())) / self._step
+        rest = energy[need:]
+        count = len(rest) // self._step
+
+        body = rest[:count * self._step].reshape(count, self._step).mean(axis=1)
+        tail = rest[count * self._step:]
+        self._partial_energy = float(tail.sum())
+        self._partial_frames = len(tail)
+
+        return np.concatenate(([first], body))
+
+    def _add_steps(self, steps: np.ndarray):
+        if not len(steps):
+            return
+
+        history = np.concatenate((self._steps, steps))
+        known = len(self._steps)
+        self._steps = history[-(SHORT_TERM_STEPS - 1):]
+
+        cumulative = np.concatenate(([0.0], np.cumsum(history)))
+        ends = np.arange(known, len(history)) + 1
+
+        momentary = self._windows(cumulative, ends, MOMENTARY_STEPS)
+        short_term = self._windows(cumulative, ends, SHORT_TERM_STEPS)
+
+        if len(momentary):
+            self._blocks.add(momentary)
+            self.momentary = power_to_lufs(momentary[-1])
+            self.momentary_max = _max_lufs(self.momentary_max, momentary)
+
+        if len(short_term):
+            self._short_terms.add(short_term)
+            self.short_term = power_to_lufs(short_term[-1])
+            self.short_term_max = _max_lufs(self.short_term_max, short_term)
+
+    @staticmethod
+    def _windows(cumulative: np.ndarray, ends: np.ndarray, size: int) -> np.ndarray:
+        # O histórico guarda 29 passos: até 3 s de áudio há menos que
+        # `size` passos e a janela ainda não existe
+        ends = ends[ends >= size]
+        return (cumulative[ends] - cumulative[ends - size]) / size
+
+    # --- results ---
+
+    @property
+    def integrated(self):
+        return self._blocks.gated_loudness(RELATIVE_GATE)
+
+    @property
+    def loudness_range(self):
+        return self._short_terms.loudness_range(LRA_RELATIVE_GATE)
+
+    @property
+    def true_peak(self):
+        peak = self._true_peak.peak if self._true_peak is not None else self._sample_peak
+        return _to_db(max(peak, self._sample_peak))
+
+    @property
+    def sample_peak(self):
+        return _to_db(self._sample_peak)
+
+    def result(self) -> dict:
+        return {
+            "integrated": _round(self.integrated),
+            "momentary_max": _round(self.momentary_max),
+            "short_term_max": _round(self.short_term_max),
+            "lra": _round(self.loudness_range),
+            "true_peak": _round(self.true_peak),
+            "sample_peak": _round(self.sample_peak),
+            "duration": self.frames / self.sample_rate if self.sample_rate else 0.0,
+        }
+
+
+def _max_lufs(current, powers: np.ndarray):
+    value = power_to_lufs(float(powers.max()))
+    if value is None:
+        return current
+    return value if current is None else max(current, value)
+
+
+def _to_db(peak: float):
+    return 20 * math.log10(peak) if peak > 0 else None
+
+
+def _round(value, digits: int = 2):
+    return None if value is None else round(value, digits)
+
+
+# -------------------------------------------------
+# MEASURE
+# -------------------------------------------------
+
+def measure_samples(samples: np.ndarray, sample_rate: int, block_frames: int = MEASURE_BLOCK_FRAMES) -> dict:
+    """
+    Array float (frames, canais) inteiro, medido em blocos.
+    """
+    samples = np.asarray(samples)
+    if samples.ndim == 1:
+        samples = samples.reshape(-1, 1)
+
+    meter = LoudnessMeter(sample_rate, samples.shape[1])
+    for lo in range(0, len(samples), block_frames):
+        meter.process(samples[lo:lo + block_frames])
+    return meter.result()
+
+
+def measure_loudness(segment: AudioSegment) -> dict:
+    """
+    Análise de AudioSegment (mesma assinatura das de core.peaks).
+    Converte para float bloco a bloco, sem cópia float do áudio inteiro.
+    """
+    from .frame_metrics import segment_to_array
+    from .samples import to_float
+
+    ints = segment_to_array(segment)
+    meter = LoudnessMeter(segment.frame_rate, segment.channels)
+
+    for lo in range(0, len(ints), MEASURE_BLOCK_FRAMES):
+        meter.process(to_float(ints[lo:lo + MEASURE_BLOCK_FRAMES], segment.sample_width))
+
+    return meter.result()
+
+
+def measure_file(path: str, block_frames: int = None) -> dict:
+    """
+    Arquivo em streaming (WAV nativo, o resto pelo pipe do ffmpeg):
+    memória constante, qualquer duração.
+    """
+    from .streaming import DEFAULT_BLOCK_FRAMES, iter_blocks, probe_audio
+
+    probed = probe_audio(path)
+    meter = LoudnessMeter(probed["sample_rate"], probed["channels"])
+
+    for block in iter_blocks(path, block_frames or DEFAULT_BLOCK_FRAMES,
+                             probed["sample_rate"], probed["channels"]):
+        meter.process(block)
+
+    return meter.result()
+
+
+# -------------------------------------------------
+# NORMALIZE
+# -------------------------------------------------
+
+def loudness_gain(measured: dict, target: float = DEFAULT_TARGET,
+                  true_peak: float = DEFAULT_TRUE_PEAK):
+    """
+    Ganho (dB) que leva o integrado ao alvo sem passar do teto de true
+    peak. None se não há o que medir (silêncio ou menos de 400 ms).
+    """
+    if measured["integrated"] is None:
+        return None
+
+    gain = target - measured["integrated"]
+
+    if true_peak is not None and measured["true_peak"] is not None:
+        headroom = true_peak - measured["true_peak"]
+        if gain > headroom:
+            warning("Alvo de %s LUFS limitado pelo true peak: %.1f LUFS (%s dBTP)",
+                    target, measured["integrated"] + headroom, true_peak)
+            gain = headroom
+
+    debug("Loudness: %.2f LUFS -> ganho %.2f dB", measured["integrated"], gain)
+    return gain
+
+
+def normalize_loudness(segment: AudioSegment, target: float = DEFAULT_TARGET,
+                       true_peak: float = DEFAULT_TRUE_PEAK) -> AudioSegment:
+    """
+    Alternativa a normalize (pico) por loudness integrado:
+
+        process_safe(path, normalize_loudness, target=-16.0)
+    """
+    gain = loudness_gain(measure_loudness(segment), target, true_peak)
+    if gain is None:
+        return segment
+    return segment.apply_gain(gain)
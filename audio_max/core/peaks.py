@@ -1,84 +1,184 @@
-from pydub import AudioSegment
-from pydub.silence import detect_silence
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .frame_metrics import compute_segment_metrics, mask_to_intervals, segment_to_array
+from .silence import detect_silence_array, detect_silence_blocks
+from .result_cache import get_result_cache, operation_name
+from ..utils.profiling import traced
+
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 
 # -------------------------------------------------
 # PEAK DETECTION
 # -------------------------------------------------
 
+@traced
 def detect_peaks(segment: AudioSegment, threshold_db=-1.0, chunk_ms=10):
     """
     Detecta picos acima de um threshold.
     Retorna lista de tempos em ms.
     """
 
-    peaks = []
-    duration = len(segment)
+    metrics = compute_segment_metrics(segment, chunk_ms)
+    mask = metrics["peak_dbfs"] >= threshold_db
 
-    for i in range(0, duration, chunk_ms):
-        chunk = segment[i:i + chunk_ms]
-        if chunk.max_dBFS >= threshold_db:
-            peaks.append(i)
+    return metrics["start_ms"][mask].tolist()
 
-    return peaks
+
+@traced
+def detect_peak_regions(segment: AudioSegment, threshold_db=-1.0, chunk_ms=10):
+    """
+    Igual a detect_peaks, mas junta janelas vizinhas.
+    Retorna lista de [start, end] em ms.
+    """
+
+    metrics = compute_segment_metrics(segment, chunk_ms)
+    mask = metrics["peak_dbfs"] >= threshold_db
+
+    return mask_to_intervals(metrics["start_ms"], metrics["end_ms"], mask).tolist()
 
 
 # -------------------------------------------------
 # CLIPPING DETECTION
 # -------------------------------------------------
 
+@traced
 def detect_clipping(segment: AudioSegment, clip_db=0.0, chunk_ms=5):
     """
     Detecta possíveis trechos clipados.
     """
 
-    clips = []
-    duration = len(segment)
+    metrics = compute_segment_metrics(segment, chunk_ms)
+    mask = metrics["peak_dbfs"] >= clip_db
+
+    return metrics["start_ms"][mask].tolist()
 
-    for i in range(0, duration, chunk_ms):
-        chunk = segment[i:i + chunk_ms]
-        if chunk.max_dBFS >= clip_db:
-            clips.append(i)
 
-    return clips
+@traced
+def detect_clipping_regions(segment: AudioSegment, clip_db=0.0, chunk_ms=5):
+    """
+    Trechos clipados já unidos.
+    Retorna lista de [start, end] em ms.
+    """
+
+    metrics = compute_segment_metrics(segment, chunk_ms)
+    mask = metrics["peak_dbfs"] >= clip_db
+
+    return mask_to_intervals(metrics["start_ms"], metrics["end_ms"], mask).tolist()
 
 
 # -------------------------------------------------
 # SILENCE DETECTION
 # -------------------------------------------------
 
+@traced
 def detect_silences(segment: AudioSegment,
                     min_silence_len=500,
-                    silence_thresh=-40):
+                    silence_thresh=-40,
+                    seek_step=1,
+                    hysteresis_db=0.0,
+                    min_keep_gap=0,
+                    padding=0):
     """
-    Detecta trechos de silêncio.
+    Detecta trechos de silêncio em tempo linear.
     Retorna lista de [start, end]
+
+    Com os parâmetros padrão o resultado é o mesmo de
+    pydub.silence.detect_silence. Opções extras:
+    - hysteresis_db: margem para sair do silêncio
+    - min_keep_gap: junta silêncios separados por menos que isso (ms)
+    - padding: ms de respiro mantidos em volta do som
     """
 
-    silences = detect_silence(
-        segment,
+    silences = detect_silence_array(
+        segment_to_array(segment),
+        segment.frame_rate,
+        segment.sample_width,
         min_silence_len=min_silence_len,
-        silence_thresh=silence_thresh
+        silence_thresh=silence_thresh,
+        seek_step=seek_step,
+        hysteresis_db=hysteresis_db,
+        min_keep_gap=min_keep_gap,
+        padding=padding,
     )
 
-    return silences
+    return silences.tolist()
+
+
+@traced
+def detect_silences_stream(path: str,
+                           min_silence_len=500,
+                           silence_thresh=-40,
+                           block_frames=None,
+                           **options):
+    """
+    Igual a detect_silences, mas lê o arquivo em blocos pelo ffmpeg,
+    sem carregar o áudio inteiro na memória.
+    """
+    from .streaming import DEFAULT_BLOCK_FRAMES, iter_blocks, probe_audio
+
+    probed = probe_audio(path)
+    blocks = iter_blocks(
+        path,
+        block_frames or DEFAULT_BLOCK_FRAMES,
+        probed["sample_rate"],
+        probed["channels"],
+    )
+
+    silences = detect_silence_blocks(
+        blocks,
+        probed["sample_rate"],
+        probed["channels"],
+        min_silence_len=min_silence_len,
+        silence_thresh=silence_thresh,
+        **options,
+    )
+
+    return silences.tolist()
 
 
 # -------------------------------------------------
 # RMS ANALYSIS
 # -------------------------------------------------
 
+@traced
 def get_rms_over_time(segment: AudioSegment, chunk_ms=50):
     """
     Retorna lista de RMS ao longo do tempo.
     Pode ser usado para waveform simplificada.
     """
 
-    rms_values = []
-    duration = len(segment)
+    return get_rms_array(segment, chunk_ms).tolist()
+
+
+@traced
+def get_rms_array(segment: AudioSegment, chunk_ms=50):
+    """
+    RMS por janela como array NumPy (sem lista Python por janela).
+    """
 
-    for i in range(0, duration, chunk_ms):
-        chunk = segment[i:i + chunk_ms]
-        rms_values.append(chunk.rms)
+    return compute_segment_metrics(segment, chunk_ms)["rms"]
 
-    return rms_values
\ No newline at end of file
+
+# -------------------------------------------------
+# CACHED ANALYSIS
+# -------------------------------------------------
+
+@traced
+def analyze_file(path: str, analysis_func, **params):
+    """
+    Roda uma análise deste módulo sobre um arquivo, usando o cache de
+    resultados. Mesmo conteúdo + mesma análise + mesmos parâmetros
+    retorna direto do cache, sem decodificar o áudio.
+    """
+    from .audio_processing import load_audio
+
+    return get_result_cache().get_or_compute(
+        path,
+        operation_name(analysis_func),
+        params,
+        lambda: analysis_func(load_audio(path), **params),
+    )
@@ -0,0 +1,374 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+import threading
+from collections import OrderedDict
+
+from ..utils.paths import get_temp_dir, ensure_directory
+from ..utils.logging import debug, warning
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+MAX_MEMORY_ITEMS = 256
+MAX_DISK_BYTES = 512 * 1024 * 1024
+
+# O conteúdo inteiro é hasheado, lido em blocos deste tamanho
+HASH_BLOCK_BYTES = 1024 * 1024
+
+_MISSING = object()
+
+
+# -------------------------------------------------
+# FINGERPRINT
+# -------------------------------------------------
+
+_FINGERPRINTS = {}
+_FINGERPRINT_LOCK = threading.Lock()
+
+
+def fingerprint(path: str) -> str:
+    """
+    Impressão digital do conteúdo do arquivo (inteiro, em streaming:
+    um WAV re-renderizado com a mesma duração muda em qualquer ponto).
+    Memorizada por (caminho, tamanho, mtime) para não reler arquivos
+    que não mudaram.
+    """
+    stat = os.stat(path)
+    stamp = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    with _FINGERPRINT_LOCK:
+        cached = _FINGERPRINTS.get(stamp)
+    if cached:
+        return cached
+
+    digest = hashlib.sha1()
+    digest.update(str(stat.st_size).encode("ascii"))
+
+    buffer = bytearray(HASH_BLOCK_BYTES)
+    view = memoryview(buffer)
+
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+
+    value = digest.hexdigest()
+    with _FINGERPRINT_LOCK:
+        _FINGERPRINTS[stamp] = value
+
+    return value
+
+
+def operation_name(func):
+    """
+    Nome estável de uma função de módulo ("pacote.modulo.funcao"), ou
+    None quando o nome não identifica o comportamento: lambdas, closures,
+    funções locais, métodos de instância e objetos chamáveis (partial).
+    Sem nome estável, quem chama não usa o cache.
+
+    Decoradores com functools.wraps (@traced) são desembrulhados antes:
+    o wrapper é uma closure, mas a função decorada é que define o nome.
+    """
+    func = inspect.unwrap(func)
+    qualname = getattr(func, "__qualname__", None)
+    if not qualname or "<lambda>" in qualname or "<locals>" in qualname:
+        return None
+    if getattr(func, "__closure__", None):
+        return None
+    if inspect.ismethod(func) and not inspect.isclass(func.__self__):
+        return None
+
+    return f"{getattr(func, '__module__', '')}.{qualname}"
+
+
+def encode_params(params) -> str:
+    """
+    Parâmetros -> JSON estável para chaves de cache. Arrays entram pelo
+    hash dos bytes (repr os trunca com "..."); funções, pelo
+    operation_name. Levanta ValueError se algo não tem representação
+    estável.
+    """
+    return json.dumps(params, sort_keys=True, default=_encode_value)
+
+
+def _encode_value(value):
+    if hasattr(value, "dtype") and hasattr(value, "tobytes"):
+        return {
+            "array": str(value.dtype),
+            "shape": list(getattr(value, "shape", ())),
+            "sha1": hashlib.sha1(value.tobytes()).hexdigest(),
+        }
+
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"bytes": hashlib.sha1(value).hexdigest()}
+
+    if isinstance(value, (set, frozenset)):
+        return sorted(encode_params(v) for v in value)
+
+    if callable(value):
+        name = operation_name(value)
+        if name is None:
+            raise ValueError(f"função sem nome estável: {value!r}")
+        return {"callable": name}
+
+    text = repr(value)
+    if " at 0x" in text:
+        # repr padrão de objeto: muda a cada execução e pode se repetir
+        raise ValueError(f"parâmetro sem representação estável: {text}")
+    return text
+
+
+# -------------------------------------------------
+# CACHE
+# -------------------------------------------------
+
+class ResultCache:
+    """
+    Cache de resultados em dois níveis (memória + disco) com despejo LRU.
+    As chaves combinam o conteúdo da fonte, a operação e os parâmetros.
+    """
+
+    def __init__(self, directory: str, max_memory_items: int = MAX_MEMORY_ITEMS,
+                 max_disk_bytes: int = MAX_DISK_BYTES):
+        self.directory = directory
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._disk_bytes = None
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+    # --- keys ---
+
+    def make_key(self, path: str, operation: str, params=None):
+        """
+        Chave de (conteúdo, operação, parâmetros), ou None se a operação
+        ou os parâmetros não são estáveis (ver operation_name/encode_params).
+        """
+        if not operation:
+            return None
+
+        try:
+            payload = encode_params(params or {})
+        except ValueError as e:
+            debug("Sem cache: %s", e)
+            return None
+
+        raw = f"{fingerprint(path)}|{operation}|{payload}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    # --- values ---
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._memory[key]
+
+        entry = self._entry_path(key, "pkl")
+        try:
+            with open(entry, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            with self._lock:
+                self._stats["misses"] += 1
+            return default
+
+        self._touch(entry)
+        with self._lock:
+            self._stats["disk_hits"] += 1
+            self._remember(key, value)
+
+        return value
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._remember(key, value)
+
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PickleError, TypeError, AttributeError) as e:
+            debug("Resultado não serializável, apenas em memória: %s", e)
+            return
+
+        self._write_entry(self._entry_path(key, "pkl"), data)
+
+    # --- files ---
+
+    def get_file(self, key: str, ext: str):
+        """
+        Caminho de um arquivo em cache, ou None.
+        """
+        entry = self._entry_path(key, ext)
+
+        with self._lock:
+            if os.path.exists(entry):
+                self._stats["disk_hits"] += 1
+                self._touch(entry)
+                return entry
+
+            self._stats["misses"] += 1
+            return None
+
+    def put_file(self, key: str, source_path: str, ext: str) -> str:
+        """
+        Copia um arquivo gerado para o cache e retorna o caminho em cache.
+        """
+        entry = self._entry_path(key, ext)
+        tmp_path = entry + ".tmp"
+
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, entry)
+        self._account(os.path.getsize(entry))
+
+        return entry
+
+    # --- memoize helper ---
+
+    def get_or_compute(self, path: str, operation: str, params, compute):
+        key = self.make_key(path, operation, params)
+        if key is None:
+            return compute()
+
+        value = self.get(key, _MISSING)
+
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+
+        return value
+
+    # --- maintenance ---
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._memory)
+            stats["disk_bytes"] = self._disk_usage()
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._disk_bytes = 0
+
+            if os.path.isdir(self.directory):
+                for entry in os.scandir(self.directory):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+
+    def set_limits(self, max_memory_items: int = None, max_disk_bytes: int = None):
+        with self._lock:
+            if max_memory_items is not None:
+                self.max_memory_items = max_memory_items
+            if max_disk_bytes is not None:
+                self.max_disk_bytes = max_disk_bytes
+
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+                self._stats["evictions"] += 1
+
+            self._evict_disk()
+
+    # --- internal ---
+
+    def _entry_path(self, key: str, ext: str) -> str:
+        ensure_directory(self.directory)
+        return os.path.join(self.directory, f"{key}.{ext.lstrip('.')}")
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _write_entry(self, entry: str, data: bytes):
+        tmp_path = entry + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, entry)
+        except OSError as e:
+            warning("Falha ao gravar cache em disco: %s", e)
+            return
+
+        self._account(len(data))
+
+    def _touch(self, entry: str):
+        # mtime marca o último uso, usado pelo despejo LRU em disco
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+    def _disk_usage(self) -> int:
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(e.stat().st_size for e in self._scan())
+        return self._disk_bytes
+
+    def _account(self, size: int):
+        with self._lock:
+            self._disk_bytes = self._disk_usage() + size
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _scan(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [e for e in os.scandir(self.directory)
+                if e.is_file() and not e.name.endswith(".tmp")]
+
+    def _evict_disk(self):
+        entries = sorted(self._scan(), key=lambda e: e.stat().st_mtime_ns)
+        total = sum(e.stat().st_size for e in entries)
+
+        for entry in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+
+            total -= size
+            self._stats["evictions"] += 1
+
+        self._disk_bytes = total
+
+
+# -------------------------------------------------
+# DEFAULT INSTANCE
+# -------------------------------------------------
+
+_DEFAULT_CACHE = None
+
+
+def get_result_cache() -> ResultCache:
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = ResultCache(os.path.join(get_temp_dir(), "results"))
+    return _DEFAULT_CACHE
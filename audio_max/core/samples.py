@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .frame_metrics import full_scale, segment_to_array
+
+if TYPE_CHECKING:
+    # Só para as anotações: o pydub carrega no primeiro uso
+    from pydub import AudioSegment
+
+
+# -------------------------------------------------
+# INT <-> FLOAT
+# -------------------------------------------------
+
+_DTYPES = {
+    1: np.int8,
+    2: np.int16,
+    4: np.int32,
+}
+
+
+def to_float(samples: np.ndarray, sample_width: int) -> np.ndarray:
+    """
+    Samples inteiros (frames, canais) -> float32 em [-1, 1).
+    """
+    out = samples.astype(np.float32)
+    out *= np.float32(1.0 / full_scale(sample_width))
+    return out
+
+
+def to_pcm(samples: np.ndarray, sample_width: int) -> bytes:
+    """
+    float (frames, canais) -> bytes PCM intercalados, com clip e arredondamento.
+    """
+    scale = full_scale(sample_width)
+    scaled = np.clip(np.rint(np.asarray(samples, dtype=np.float64) * scale), -scale, scale - 1)
+
+    if sample_width == 3:
+        ints = scaled.astype(np.int32).reshape(-1)
+        packed = np.empty((ints.size, 3), dtype=np.uint8)
+        packed[:, 0] = ints & 0xFF
+        packed[:, 1] = (ints >> 8) & 0xFF
+        packed[:, 2] = (ints >> 16) & 0xFF
+        return packed.tobytes()
+
+    return scaled.astype(_DTYPES[sample_width]).tobytes()
+
+
+# -------------------------------------------------
+# AUDIOSEGMENT
+# -------------------------------------------------
+
+def segment_to_float(segment: AudioSegment) -> np.ndarray:
+    """
+    AudioSegment -> float32 (frames, canais).
+    """
+    return to_float(segment_to_array(segment), segment.sample_width)
+
+
+def float_to_segment(samples: np.ndarray, like: AudioSegment) -> AudioSegment:
+    """
+    float (frames, canais) -> AudioSegment com o mesmo formato de `like`.
+    """
+    return type(like)(
+        data=to_pcm(samples, like.sample_width),
+        sample_width=like.sample_width,
+        frame_rate=like.frame_rate,
+        channels=like.channels,
+    )
@@ -0,0 +1,380 @@
+"""
+Área de rascunho gerenciada (get_temp_dir()/scratch).
+
+    store = get_scratch_store()
+    path = store.new_path("wav", "amax_normalize", key=store.make_key(src, "normalize"))
+    with store.write(path) as part:      # grava em part, renomeia no fim
+        write_segment(segment, part)
+
+- caminhos únicos: com `key` o nome vem do conteúdo (mesma entrada ->
+  mesmo arquivo; entradas diferentes nunca colidem); sem key, um token
+  aleatório;
+- escrita atômica: arquivo temporário no mesmo diretório + os.replace,
+  quem lê nunca vê um arquivo pela metade;
+- arquivos usados por strips do VSE (sync_references) não são apagados,
+  nem por outros processos (a lista fica em .references.json);
+- acima da cota (MAX_SCRATCH_BYTES ou AUDIOMAX_SCRATCH_MB) os arquivos
+  menos usados recentemente são apagados (mtime marca o último uso).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from ..utils.paths import get_temp_dir, ensure_directory
+from ..utils.logging import debug, warning
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+MAX_SCRATCH_BYTES = 4 * 1024 * 1024 * 1024
+
+# Cota em MB por variável de ambiente (nós de render sem interface)
+QUOTA_ENV = "AUDIOMAX_SCRATCH_MB"
+
+# Arquivos mais novos que isso ainda podem estar a caminho do VSE/DAW
+MIN_AGE_SECONDS = 300.0
+
+# .part esquecidos por uma escrita que morreu no meio
+STALE_PART_SECONDS = 3600.0
+
+PART_MARKER = ".part-"
+
+REFERENCES_FILE = ".references.json"
+
+
+def default_quota() -> int:
+    value = os.environ.get(QUOTA_ENV)
+    if value:
+        try:
+            return int(float(value) * 1024 * 1024)
+        except ValueError:
+            warning("%s inválido: %r", QUOTA_ENV, value)
+    return MAX_SCRATCH_BYTES
+
+
+# -------------------------------------------------
+# ATOMIC WRITE
+# -------------------------------------------------
+
+def part_path(path: str) -> str:
+    """
+    Temporário ao lado de `path`, mantendo a extensão (ffmpeg, pydub e
+    o mixdown do Blender escolhem o formato por ela).
+    """
+    root, ext = os.path.splitext(path)
+    return f"{root}{PART_MARKER}{uuid.uuid4().hex[:8]}{ext}"
+
+
+@contextmanager
+def atomic_path(path: str):
+    """
+    Entrega um caminho temporário; se o bloco terminar sem erro, ele
+    substitui `path` de uma vez. Com erro, o temporário é apagado.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        ensure_directory(directory)
+
+    part = part_path(path)
+    try:
+        yield part
+        os.replace(part, path)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+
+
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+# -------------------------------------------------
+# STORE
+# -------------------------------------------------
+
+class ScratchStore:
+
+    def __init__(self, directory: str, max_bytes: int = None,
+                 min_age: float = MIN_AGE_SECONDS):
+        self.directory = directory
+        self.max_bytes = max_bytes if max_bytes is not None else default_quota()
+        self.min_age = min_age
+
+        self._lock = threading.RLock()
+        self._references = set()
+        self._references_stamp = None
+        self._sizes = None       # {caminho: bytes}, índice do que está na área
+        self._snapshot = None    # último stats(), lido pela UI sem lock
+        self._refreshing = False
+        self._stats = {
+            "writes": 0,
+            "evictions": 0,
+            "evicted_bytes": 0,
+        }
+
+    # --- paths ---
+
+    def make_key(self, source_path: str, *parts):
+        """
+        Chave de conteúdo: impressão digital do arquivo de origem
+        (result_cache.fingerprint) + os parâmetros (result_cache.encode_params).
+        None se os parâmetros não têm representação estável; new_path
+        usa então um token aleatório.
+        """
+        from .result_cache import encode_params, fingerprint
+
+        try:
+            payload = encode_params(parts)
+        except ValueError as e:
+            debug("Nome aleatório no rascunho: %s", e)
+            return None
+
+        raw = f"{fingerprint(source_path)}|{payload}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+    def new_path(self, ext: str, stem: str = "amax", key: str = None) -> str:
+        """
+        Caminho dentro da área de rascunho. Não cria o arquivo.
+        """
+        ensure_directory(self.directory)
+        token = key or uuid.uuid4().hex[:12]
+        return os.path.join(self.directory, f"{stem}_{token}.{ext.lstrip('.')}")
+
+    def owns(self, path: str) -> bool:
+        return _norm(path).startswith(_norm(self.directory) + os.sep)
+
+    # --- writes ---
+
+    @contextmanager
+    def write(self, path: str):
+        """
+        atomic_path + contabilidade da cota. Fora da área de rascunho
+        só a escrita atômica vale.
+        """
+        with atomic_path(path) as part:
+            yield part
+
+        if self.owns(path):
+            self.commit(path)
+
+    def commit(self, path: str):
+        """
+        Registra um arquivo gravado na área (ex.: por um processo externo).
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+
+        with self._lock:
+            self._stats["writes"] += 1
+            sizes = self._index()
+            sizes[_norm(path)] = size
+            if sum(sizes.values()) > self.max_bytes:
+                self._evict()
+            else:
+                self._publish()
+
+    # --- references ---
+
+    def sync_references(self, paths):
+        """
+        Caminhos usados por strips do VSE agora; substitui os anteriores.
+        Chamar da thread principal (quem lê o bpy).
+        """
+        references = sorted({_norm(p) for p in paths if p and self.owns(p)})
+
+        with self._lock:
+            self._references = set(references)
+            path = os.path.join(self.directory, REFERENCES_FILE)
+            try:
+                with atomic_path(path) as part:
+                    with open(part, "w", encoding="utf-8") as f:
+                        json.dump(references, f)
+                self._references_stamp = os.stat(path).st_mtime_ns
+            except OSError as e:
+                warning("Falha ao gravar referências do rascunho: %s", e)
+
+            if self._sizes is not None:
+                self._publish()
+
+    def is_referenced(self, path: str) -> bool:
+        with self._lock:
+            return _norm(path) in self._load_references()
+
+    # --- maintenance ---
+
+    def stats(self) -> dict:
+        """
+        Relê a pasta (custa um scan + stat por arquivo). A UI usa
+        cached_stats().
+        """
+        with self._lock:
+            self._sizes = {_norm(e.path): e.stat().st_size for e in self._scan()}
+            self._load_references()
+            self._publish()
+            return dict(self._snapshot)
+
+    def cached_stats(self):
+        """
+        Números da última escrita/despejo/stats(), sem I/O nem lock:
+        seguro para draw() de painel. Antes do primeiro cálculo retorna
+        None e dispara um stats() em segundo plano.
+        """
+        snapshot = self._snapshot
+        if snapshot is None and not self._refreshing:
+            self._refreshing = True
+            threading.Thread(target=self._refresh, name="AudioMaxScratchStats", daemon=True).start()
+        return snapshot
+
+    def _refresh(self):
+        try:
+            self.stats()
+        except OSError as e:
+            debug("Stats do rascunho falharam: %s", e)
+        finally:
+            self._refreshing = False
+
+    def set_limits(self, max_bytes: int = None, min_age: float = None):
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if min_age is not None:
+                self.min_age = min_age
+            self._evict()
+
+    def cleanup(self) -> int:
+        """
+        Apaga tudo que não é usado pelo VSE nem recente. Retorna bytes liberados.
+        """
+        with self._lock:
+            before = self._stats["evicted_bytes"]
+            self._evict(target=0)
+            return self._stats["evicted_bytes"] - before
+
+    # --- internal ---
+
+    def _load_references(self) -> set:
+        """
+        Relê a lista gravada se outro processo (o Blender) a atualizou.
+        """
+        path = os.path.join(self.directory, REFERENCES_FILE)
+        try:
+            stamp = os.stat(path).st_mtime_ns
+        except OSError:
+            return self._references
+
+        if stamp != self._references_stamp:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._references = set(json.load(f))
+                self._references_stamp = stamp
+            except (OSError, ValueError) as e:
+                debug("Referências do rascunho ilegíveis: %s", e)
+
+        return self._references
+
+    def _index(self) -> dict:
+        if self._sizes is None:
+            self._sizes = {_norm(e.path): e.stat().st_size for e in self._scan()}
+        return self._sizes
+
+    def _publish(self):
+        """
+        Recalcula o snapshot (com _lock) a partir do índice em memória.
+        A troca da referência é atômica: cached_stats() não precisa de lock.
+        """
+        sizes = self._index()
+        total = sum(sizes.values())
+        referenced = [size for path, size in sizes.items() if path in self._references]
+
+        snapshot = dict(self._stats)
+        snapshot.update({
+            "files": len(sizes),
+            "bytes": total,
+            "referenced_files": len(referenced),
+            "referenced_bytes": sum(referenced),
+            "max_bytes": self.max_bytes,
+            "usage": total / self.max_bytes if self.max_bytes else 0.0,
+        })
+        self._snapshot = snapshot
+
+    def _scan(self):
+        if not os.path.isdir(self.directory):
+            return []
+
+        entries = []
+        now = time.time()
+
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or entry.name.startswith("."):
+                continue
+            if PART_MARKER in entry.name:
+                # Escrita em andamento; só sai se foi abandonada
+                if now - entry.stat().st_mtime > STALE_PART_SECONDS:
+                    _remove(entry.path)
+                continue
+            entries.append(entry)
+
+        return entries
+
+    def _evict(self, target: int = None):
+        target = self.max_bytes if target is None else target
+        entries = sorted(self._scan(), key=lambda e: e.stat().st_mtime_ns)
+        sizes = {_norm(e.path): e.stat().st_size for e in entries}
+        total = sum(sizes.values())
+        references = self._load_references()
+        now = time.time()
+
+        for entry in entries:
+            if total <= target:
+                break
+
+            stat = entry.stat()
+            if _norm(entry.path) in references or now - stat.st_mtime < self.min_age:
+                continue
+            if not _remove(entry.path):
+                continue
+
+            sizes.pop(_norm(entry.path), None)
+            total -= stat.st_size
+            self._stats["evictions"] += 1
+            self._stats["evicted_bytes"] += stat.st_size
+            debug("Rascunho apagado (LRU): %s", entry.name)
+
+        if total > self.max_bytes:
+            debug("Rascunho acima da cota (%.0f MB): o restante está em uso ou é recente", total / 1e6)
+
+        self._sizes = sizes
+        self._publish()
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+# -------------------------------------------------
+# DEFAULT INSTANCE
+# -------------------------------------------------
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_scratch_store() -> ScratchStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ScratchStore(os.path.join(get_temp_dir(), "scratch"))
+        return _STORE
@@ -0,0 +1,304 @@
+import numpy as np
+
+from .frame_metrics import full_scale
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+# Frames entregues ao detector por vez quando o áudio já está em memória.
+FEED_FRAMES = 65536
+
+
+def _db_to_ratio(db: float) -> float:
+    return 10 ** (db / 20.0)
+
+
+# -------------------------------------------------
+# DETECTOR
+# -------------------------------------------------
+
+class SilenceDetector:
+    """
+    Detector de silêncio em tempo linear, alimentado em blocos.
+
+    A energia é somada por milissegundo (mesmas bordas de segment[i:j]
+    do pydub) e a janela de min_silence_len ms sai de somas acumuladas,
+    sem recalcular o RMS de cada fatia. Com os parâmetros padrão o
+    resultado bate com pydub.silence.detect_silence.
+
+    hysteresis_db > 0: depois de entrar em silêncio, só sai quando o RMS
+    passar de silence_thresh + hysteresis_db (evita picotar em ruído de
+    fundo perto do limiar).
+
+    scale: amplitude de fundo de escala dos samples (1.0 para float).
+    integer: trunca o RMS como o audioop (samples inteiros).
+    """
+
+    def __init__(self,
+                 frame_rate: int,
+                 channels: int,
+                 min_silence_len: int = 500,
+                 silence_thresh: float = -40,
+                 seek_step: int = 1,
+                 hysteresis_db: float = 0.0,
+                 scale: float = 1.0,
+                 integer: bool = False):
+        if min_silence_len <= 0 or seek_step <= 0:
+            raise ValueError("min_silence_len e seek_step devem ser maiores que zero.")
+
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.min_silence_len = int(min_silence_len)
+        self.seek_step = int(seek_step)
+        self.integer = integer
+
+        self._per_ms = frame_rate / 1000.0
+        self._enter = _db_to_ratio(silence_thresh) * scale
+        self._exit = _db_to_ratio(silence_thresh + hysteresis_db) * scale if hysteresis_db > 0 else None
+
+        self._frames = 0
+        self._leftover = np.zeros(0, dtype=np.float64)   # energia do ms incompleto
+        self._bucket = 0                                 # próximo ms a fechar
+        self._hist = np.zeros(0, dtype=np.float64)       # energia por ms a partir de _pos
+        self._pos = 0                                    # próximo início de janela
+        self._extra = None
+
+        self._silent = False
+        self._run = None
+        self._ranges = []
+
+    # --- input ---
+
+    def feed(self, block: np.ndarray):
+        """
+        Recebe um bloco (frames, canais), inteiro ou float.
+        """
+        block = np.asarray(block).reshape(-1, self.channels)
+        as_float = block.astype(np.float64)
+        energy = np.einsum("ij,ij->i", as_float, as_float)
+
+        self._frames += len(block)
+        self._close_buckets(energy, self._complete_buckets())
+
+        # A última janela fica para finish(), que conhece a duração final.
+        self._scan(self._bucket - self.min_silence_len - 1)
+
+    def finish(self) -> np.ndarray:
+        """
+        Fecha o detector. Retorna array (n, 2) de [start, end] em ms.
+        """
+        duration = self.duration_ms
+        self._close_buckets(np.zeros(0, dtype=np.float64), duration)
+
+        last = duration - self.min_silence_len
+        if last >= 0:
+            if last % self.seek_step:
+                self._extra = last
+            self._scan(last)
+
+        if self._run is not None:
+            self._ranges.append((self._run[0], self._run[1] + self.min_silence_len))
+            self._run = None
+
+        if not self._ranges:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.asarray(self._ranges, dtype=np.int64)
+
+    @property
+    def duration_ms(self) -> int:
+        """
+        Duração até agora, arredondada como len(AudioSegment).
+        """
+        return round(1000 * (self._frames / self.frame_rate))
+
+    # --- energy ---
+
+    def _edges(self, first: int, last: int) -> np.ndarray:
+        # Mesmo cálculo de AudioSegment.frame_count(ms=...)
+        return (np.arange(first, last, dtype=np.int64) * self._per_ms).astype(np.int64)
+
+    def _complete_buckets(self) -> int:
+        count = int(self._frames / self._per_ms) + 1
+        while count > 0 and int(count * self._per_ms) > self._frames:
+            count -= 1
+        return count
+
+    def _close_buckets(self, energy: np.ndarray, upto: int):
+        """
+        Soma a energia de cada ms completo em [_bucket, upto).
+        Frames que faltam no fim contam como silêncio (como o pydub).
+        """
+        if len(self._leftover):
+            energy = np.concatenate((self._leftover, energy))
+
+        if upto <= self._bucket:
+            self._leftover = energy
+            return
+
+        edges = self._edges(self._bucket, upto + 1)
+        offsets = np.minimum(edges - edges[0], len(energy))
+
+        acc = np.concatenate(([0.0], np.cumsum(energy)))
+        sums = acc[offsets[1:]] - acc[offsets[:-1]]
+
+        self._hist = np.concatenate((self._hist, sums))
+        self._leftover = energy[offsets[-1]:]
+        self._bucket = upto
+
+    # --- windows ---
+
+    def _scan(self, max_start: int):
+        """
+        Avalia as janelas que começam em [_pos, max_start].
+        """
+        count = max_start - self._pos + 1
+        if count <= 0:
+            return
+
+        span = self.min_silence_len
+        acc = np.concatenate(([0.0], np.cumsum(self._hist[:count + span - 1])))
+        sumsq = acc[span:span + count] - acc[:count]
+
+        starts = np.arange(self._pos, self._pos + count, dtype=np.int64)
+        on_grid = starts % self.seek_step == 0
+        if self._extra is not None:
+            on_grid |= starts == self._extra
+
+        self._hist = self._hist[count:]
+        self._pos += count
+
+        starts = starts[on_grid]
+        if not len(starts):
+            return
+
+        edges = self._edges(starts[0], starts[-1] + span + 1)
+        denom = (edges[starts - starts[0] + span] - edges[starts - starts[0]]) * self.channels
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rms = np.where(denom > 0, np.sqrt(sumsq[on_grid] / np.maximum(denom, 1)), 0.0)
+        if self.integer:
+            rms = np.floor(rms)
+
+        self._collect(starts, self._classify(rms))
+
+    def _classify(self, rms: np.ndarray) -> np.ndarray:
+        enter = rms <= self._enter
+        if self._exit is None:
+            return enter
+
+        # Estado com histerese: vale o último evento (entrar / sair).
+        event = np.where(enter, 1, np.where(rms > self._exit, -1, 0))
+        index = np.where(event != 0, np.arange(len(event)), -1)
+        np.maximum.accumulate(index, out=index)
+
+        silent = np.where(index >= 0, event[np.maximum(index, 0)] == 1, self._silent)
+        self._silent = bool(silent[-1])
+        return silent
+
+    def _collect(self, starts: np.ndarray, silent: np.ndarray):
+        """
+        Junta inícios silenciosos em intervalos, com a mesma regra do pydub:
+        inícios contínuos ou sobrepostos (< min_silence_len) viram um só.
+        """
+        points = starts[silent]
+        if not len(points):
+            return
+
+        if self._run is not None:
+            first = self._run[0]
+            points = np.concatenate(([self._run[1]], points))
+        else:
+            first = points[0]
+
+        gaps = np.diff(points)
+        cut = np.flatnonzero((gaps != self.seek_step) & (gaps > self.min_silence_len))
+
+        begins = np.concatenate(([first], points[cut + 1]))
+        ends = points[cut] + self.min_silence_len
+
+        self._ranges.extend(zip(begins[:-1].tolist(), ends.tolist()))
+        self._run = (int(begins[-1]), int(points[-1]))
+
+
+# -------------------------------------------------
+# POST-PROCESS
+# -------------------------------------------------
+
+def refine_ranges(ranges: np.ndarray, duration_ms: int, min_keep_gap: int = 0, padding: int = 0) -> np.ndarray:
+    """
+    min_keep_gap: trechos com som menores que isso entre dois silêncios
+    são absorvidos (os silêncios se juntam).
+    padding: encolhe cada silêncio em `padding` ms dos dois lados, para
+    manter um respiro em volta do som (não mexe nas bordas do arquivo).
+    """
+    ranges = np.asarray(ranges, dtype=np.int64).reshape(-1, 2)
+    if not len(ranges):
+        return ranges
+
+    starts, ends = ranges[:, 0], ranges[:, 1]
+
+    if min_keep_gap > 0:
+        keep = starts[1:] - ends[:-1] >= min_keep_gap
+        starts = starts[np.concatenate(([True], keep))]
+        ends = ends[np.concatenate((keep, [True]))]
+
+    if padding > 0:
+        starts = np.where(starts > 0, starts + padding, starts)
+        ends = np.where(ends < duration_ms, ends - padding, ends)
+
+    valid = ends > starts
+    return np.stack((starts[valid], ends[valid]), axis=1)
+
+
+# -------------------------------------------------
+# HELPERS
+# -------------------------------------------------
+
+def detect_silence_array(samples: np.ndarray,
+                         frame_rate: int,
+                         sample_width: int,
+                         min_silence_len: int = 500,
+                         silence_thresh: float = -40,
+                         seek_step: int = 1,
+                         hysteresis_db: float = 0.0,
+                         min_keep_gap: int = 0,
+                         padding: int = 0) -> np.ndarray:
+    """
+    Silêncios de um array inteiro (frames, canais). Retorna array (n, 2).
+    """
+    detector = SilenceDetector(
+        frame_rate, samples.shape[1],
+        min_silence_len, silence_thresh, seek_step, hysteresis_db,
+        scale=full_scale(sample_width), integer=True,
+    )
+
+    for lo in range(0, len(samples), FEED_FRAMES):
+        detector.feed(samples[lo:lo + FEED_FRAMES])
+
+    return refine_ranges(detector.finish(), detector.duration_ms, min_keep_gap, padding)
+
+
+def detect_silence_blocks(blocks,
+                          frame_rate: int,
+                          channels: int,
+                          min_silence_len: int = 500,
+                          silence_thresh: float = -40,
+                          seek_step: int = 1,
+                          hysteresis_db: float = 0.0,
+                          min_keep_gap: int = 0,
+                          padding: int = 0) -> np.ndarray:
+    """
+    Silêncios de um fluxo de blocos float (ex.: streaming.iter_blocks).
+    A memória usada não depende da duração.
+    """
+    detector = SilenceDetector(
+        frame_rate, channels,
+        min_silence_len, silence_thresh, seek_step, hysteresis_db,
+    )
+
+    for block in blocks:
+        detector.feed(block)
+
+    return refine_ranges(detector.finish(), detector.duration_ms, min_keep_gap, padding)
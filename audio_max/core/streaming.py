@@ -0,0 +1,278 @@
+import os
+import subprocess
+import tempfile
+
+import numpy as np
+
+from .wavfile import WavWriter, is_wav_path, open_wav
+from ..utils.paths import resolve_ffmpeg
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+# Frames por bloco. O pico de memória depende disso, não da duração.
+DEFAULT_BLOCK_FRAMES = 65536
+
+_SAMPLE_BYTES = 4  # float32
+
+# Quanto do stderr do ffmpeg entra na mensagem de erro
+STDERR_TAIL = 4096
+
+
+# -------------------------------------------------
+# PROBE
+# -------------------------------------------------
+
+def probe_audio(path: str) -> dict:
+    """
+    Lê sample rate, canais e duração do primeiro stream de áudio.
+    WAV PCM/float é lido direto do cabeçalho (com sample_width e float).
+    """
+    from pydub.utils import mediainfo_json
+
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+
+    wav = open_wav(path)
+    if wav is not None:
+        with wav:
+            return wav.info()
+
+    info = mediainfo_json(path)
+    for stream in info.get("streams", []):
+        if stream.get("codec_type") != "audio":
+            continue
+
+        duration = stream.get("duration") or info.get("format", {}).get("duration")
+
+        return {
+            "sample_rate": int(stream["sample_rate"]),
+            "channels": int(stream["channels"]),
+            "duration": float(duration) if duration else None,
+        }
+
+    raise ValueError(f"Nenhum stream de áudio em: {path}")
+
+
+# -------------------------------------------------
+# DECODE
+# -------------------------------------------------
+
+def iter_blocks(path: str,
+                block_frames: int = DEFAULT_BLOCK_FRAMES,
+                sample_rate: int = None,
+                channels: int = None):
+    """
+    Decodifica o arquivo via pipe do ffmpeg e entrega blocos float32
+    (frames, canais) de no máximo block_frames.
+
+    WAV PCM/float sem conversão de taxa ou canais é lido do mmap, sem ffmpeg.
+    """
+    wav = open_wav(path)
+    if wav is not None:
+        if sample_rate in (None, wav.sample_rate) and channels in (None, wav.channels):
+            with wav:
+                yield from wav.iter_blocks(block_frames)
+            return
+        wav.close()
+
+    if sample_rate is None or channels is None:
+        probed = probe_audio(path)
+        sample_rate = sample_rate or probed["sample_rate"]
+        channels = channels or probed["channels"]
+
+    command = [
+        resolve_ffmpeg(), "-v", "error", "-nostdin",
+        "-i", path,
+        "-vn",
+        "-f", "f32le", "-acodec", "pcm_f32le",
+        "-ar", str(sample_rate), "-ac", str(channels),
+        "pipe:1",
+    ]
+
+    # stderr em arquivo, não em PIPE: avisos demais encheriam o pipe
+    # (~64 KB) enquanto só o stdout é lido, e o ffmpeg travaria
+    stderr = tempfile.TemporaryFile()
+    try:
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+    except OSError:
+        stderr.close()
+        raise
+
+    block_bytes = block_frames * channels * _SAMPLE_BYTES
+    frame_bytes = channels * _SAMPLE_BYTES
+    leftover = b""
+
+    try:
+        while True:
+            data = proc.stdout.read(block_bytes)
+            if not data:
+                break
+
+            data = leftover + data
+            usable = len(data) - len(data) % frame_bytes
+            leftover = data[usable:]
+
+            if usable:
+                yield np.frombuffer(data[:usable], dtype=np.float32).reshape(-1, channels).copy()
+
+        proc.stdout.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg falhou ao decodificar {path}: {_stderr_tail(stderr)}")
+
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        stderr.close()
+
+
+def _stderr_tail(handle) -> str:
+    handle.seek(0, os.SEEK_END)
+    handle.seek(max(0, handle.tell() - STDERR_TAIL))
+    return handle.read().decode("utf-8", "ignore").strip()
+
+
+# -------------------------------------------------
+# ENCODE
+# -------------------------------------------------
+
+def open_writer(output_path: str, sample_rate: int, channels: int,
+                extra_args=None, sample_width: int = 2, is_float: bool = False):
+    """
+    WavWriter para .wav (direto no disco); BlockWriter (ffmpeg) para o
+    resto ou quando há extra_args de codificação.
+    """
+    if is_wav_path(output_path) and not extra_args:
+        return WavWriter(output_path, sample_rate, channels, sample_width, is_float)
+
+    return BlockWriter(output_path, sample_rate, channels, extra_args)
+
+
+class BlockWriter:
+    """
+    Encoder incremental: recebe blocos float32 e os envia ao ffmpeg
+    pelo stdin. O formato de saída vem da extensão do arquivo.
+    """
+
+    def __init__(self, output_path: str, sample_rate: int, channels: int, extra_args=None):
+        self.output_path = output_path
+        self.sample_rate = sample_rate
+        self.channels = channels
+
+        command = [
+            resolve_ffmpeg(), "-v", "error", "-y",
+            "-f", "f32le", "-ar", str(sample_rate), "-ac", str(channels),
+            "-i", "pipe:0",
+            *(extra_args or []),
+            output_path,
+        ]
+
+        # Ver iter_blocks: stderr em arquivo para o ffmpeg nunca travar
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self._proc = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=self._stderr,
+            )
+        except OSError:
+            self._stderr.close()
+            raise
+
+    def write(self, block: np.ndarray):
+        data = np.ascontiguousarray(block, dtype=np.float32)
+        self._proc.stdin.write(data.tobytes())
+
+    def close(self) -> str:
+        self._proc.stdin.close()
+
+        try:
+            if self._proc.wait() != 0:
+                raise RuntimeError(f"ffmpeg falhou ao codificar {self.output_path}: "
+                                   f"{_stderr_tail(self._stderr)}")
+        finally:
+            self._stderr.close()
+
+        return self.output_path
+
+    def abort(self):
+        if self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+        self._stderr.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+# -------------------------------------------------
+# STAGES
+# -------------------------------------------------
+
+def block_stage(func, *args, **kwargs):
+    """
+    Adapta uma função bloco -> bloco em um estágio de stream.
+    """
+
+    def stage(blocks):
+        for block in blocks:
+            yield func(block, *args, **kwargs)
+
+    return stage
+
+
+def gain_stage(db: float):
+    """
+    Estágio de ganho em dB, aplicado no próprio bloco.
+    """
+    factor = np.float32(10 ** (db / 20.0))
+
+    def apply(block):
+        block *= factor
+        return block
+
+    return block_stage(apply)
+
+
+def run_stages(blocks, stages):
+    """
+    Encadeia os estágios (geradores) sobre o iterador de blocos.
+    """
+    for stage in stages:
+        blocks = stage(blocks)
+    return blocks
+
+
+def stream_process(input_path: str,
+                   output_path: str,
+                   stages,
+                   block_frames: int = DEFAULT_BLOCK_FRAMES) -> str:
+    """
+    Decodifica, processa e codifica bloco a bloco.
+    Nunca mantém o arquivo inteiro em memória.
+    """
+    probed = probe_audio(input_path)
+    sample_rate = probed["sample_rate"]
+    channels = probed["channels"]
+
+    blocks = iter_blocks(input_path, block_frames, sample_rate, channels)
+
+    # WAV de entrada mantém a resolução; o resto sai como o ffmpeg faria (16 bits)
+    width = probed.get("sample_width", 2)
+    with open_writer(output_path, sample_rate, channels,
+                     sample_width=width, is_float=probed.get("float", False)) as writer:
+        for block in run_stages(blocks, stages):
+            writer.write(block)
+
+    return output_path
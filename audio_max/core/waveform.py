@@ -0,0 +1,324 @@
+import hashlib
+import math
+import os
+import struct
+
+import numpy as np
+
+from ..utils.paths import get_temp_dir, ensure_directory
+from ..utils.logging import info, debug
+from .streaming import DEFAULT_BLOCK_FRAMES, iter_blocks, probe_audio
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+# Frames por bucket no nível mais fino.
+BASE_FRAMES = 256
+
+# Cada nível acima junta REDUCTION buckets do nível anterior.
+REDUCTION = 2
+
+_MAGIC = b"AMXP"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHIIIqqI")
+_HEADER_SIZE = 64
+_COUNT = struct.Struct("<q")
+_ALIGN = 16
+
+# Colunas de cada nível: min, max, rms
+_FIELDS = 3
+
+
+# -------------------------------------------------
+# BUILD
+# -------------------------------------------------
+
+def _bucket_stats(block: np.ndarray, base_frames: int) -> np.ndarray:
+    """
+    min/max/rms por bucket de base_frames frames (todos os canais juntos).
+    O último bucket pode ser parcial.
+    """
+    frames, channels = block.shape
+    full = frames // base_frames
+    rows = []
+
+    if full:
+        body = block[:full * base_frames].reshape(full, base_frames * channels)
+        rows.append(np.stack((
+            body.min(axis=1),
+            body.max(axis=1),
+            np.sqrt(np.einsum("ij,ij->i", body, body, dtype=np.float64) / body.shape[1]),
+        ), axis=1).astype(np.float32))
+
+    tail = block[full * base_frames:].reshape(-1)
+    if tail.size:
+        rows.append(np.array([[
+            tail.min(),
+            tail.max(),
+            math.sqrt(float(np.dot(tail, tail)) / tail.size),
+        ]], dtype=np.float32))
+
+    if not rows:
+        return np.empty((0, _FIELDS), dtype=np.float32)
+
+    return np.concatenate(rows)
+
+
+def _reduce_level(level: np.ndarray, factor: int) -> np.ndarray:
+    """
+    Junta factor buckets vizinhos em um: min dos mins, max dos maxs,
+    rms pela média dos quadrados.
+    """
+    count = len(level)
+    padded = -(-count // factor) * factor
+
+    if padded != count:
+        level = np.concatenate((level, np.repeat(level[-1:], padded - count, axis=0)))
+
+    groups = level.reshape(-1, factor, _FIELDS)
+    rms = groups[:, :, 2].astype(np.float64)
+
+    return np.stack((
+        groups[:, :, 0].min(axis=1),
+        groups[:, :, 1].max(axis=1),
+        np.sqrt((rms * rms).mean(axis=1)),
+    ), axis=1).astype(np.float32)
+
+
+def build_levels(blocks, base_frames: int = BASE_FRAMES, factor: int = REDUCTION) -> list:
+    """
+    Monta a pirâmide a partir de blocos float32 (frames, canais).
+    Só o nível mais fino é calculado sobre os samples; os demais
+    são reduções do nível anterior.
+    """
+    finest = []
+    carry = None
+
+    for block in blocks:
+        if carry is not None and len(carry):
+            block = np.concatenate((carry, block))
+
+        usable = len(block) - len(block) % base_frames
+        if usable:
+            finest.append(_bucket_stats(block[:usable], base_frames))
+        carry = block[usable:]
+
+    if carry is not None and len(carry):
+        finest.append(_bucket_stats(carry, base_frames))
+
+    level = np.concatenate(finest) if finest else np.empty((0, _FIELDS), dtype=np.float32)
+    levels = [level]
+
+    while len(level) > 1:
+        level = _reduce_level(level, factor)
+        levels.append(level)
+
+    return levels
+
+
+# -------------------------------------------------
+# PYRAMID
+# -------------------------------------------------
+
+class WaveformPyramid:
+    """
+    Pirâmide min/max/rms (estilo mipmap) de um arquivo de áudio.
+    Os níveis podem ser arrays em memória ou memmaps do cache em disco.
+    """
+
+    def __init__(self, levels, sample_rate: int, base_frames: int = BASE_FRAMES, factor: int = REDUCTION):
+        self.levels = levels
+        self.sample_rate = sample_rate
+        self.base_frames = base_frames
+        self.factor = factor
+
+    @property
+    def duration(self) -> float:
+        if not self.levels or not len(self.levels[0]):
+            return 0.0
+        return len(self.levels[0]) * self.base_frames / self.sample_rate
+
+    def bucket_frames(self, level: int) -> int:
+        return self.base_frames * self.factor ** level
+
+    def pick_level(self, frames_per_pixel: float) -> int:
+        """
+        Nível mais grosso cujo bucket ainda cabe em um pixel.
+        """
+        level = 0
+        while (level + 1 < len(self.levels)
+               and self.bucket_frames(level + 1) <= frames_per_pixel):
+            level += 1
+        return level
+
+    def query(self, start: float, end: float, pixels: int) -> dict:
+        """
+        Retorna min/max/rms com exatamente `pixels` colunas para o
+        intervalo [start, end] em segundos. O custo é O(pixels).
+
+        A coluna i cobre start + i * (end - start) / pixels; colunas
+        antes do início ou depois do fim do áudio são zero.
+        """
+        empty = np.zeros(0, dtype=np.float32)
+        if pixels <= 0 or end <= start or not self.levels:
+            return {"min": empty, "max": empty, "rms": empty}
+
+        span = (end - start) * self.sample_rate
+        level = self.pick_level(span / pixels)
+        bucket = self.bucket_frames(level)
+        data = self.levels[level]
+        count = len(data)
+
+        # Bucket de início/fim de cada coluna no nível escolhido
+        pos = (start * self.sample_rate + np.arange(pixels + 1) * (span / pixels)) / bucket
+        lo = np.floor(pos[:-1]).astype(np.int64)
+        hi = np.maximum(lo + 1, np.floor(pos[1:]).astype(np.int64))
+
+        columns = np.zeros((pixels, _FIELDS), dtype=np.float64)
+        valid = (lo < count) & (hi > 0)
+
+        if valid.any():
+            lo = np.clip(lo[valid], 0, count - 1)
+            hi = np.clip(hi[valid], 1, count)
+            window = np.asarray(data[lo[0]:hi[-1]])
+            edges = lo - lo[0]
+
+            # Colunas vizinhas no mesmo bucket (zoom além do nível mais
+            # fino) repetem o bucket: reduceat com índice repetido.
+            rms = window[:, 2].astype(np.float64)
+            columns[valid] = np.stack((
+                np.minimum.reduceat(window[:, 0], edges),
+                np.maximum.reduceat(window[:, 1], edges),
+                np.sqrt(np.add.reduceat(rms * rms, edges) / (hi - lo)),
+            ), axis=1)
+
+        return {
+            "min": columns[:, 0].astype(np.float32),
+            "max": columns[:, 1].astype(np.float32),
+            "rms": columns[:, 2].astype(np.float32),
+        }
+
+
+# -------------------------------------------------
+# DISK CACHE
+# -------------------------------------------------
+
+def get_pyramid_dir() -> str:
+    path = os.path.join(get_temp_dir(), "peaks")
+    ensure_directory(path)
+    return path
+
+
+def pyramid_cache_path(source_path: str) -> str:
+    """
+    Arquivo de cache da pirâmide, derivado do caminho absoluto da fonte.
+    """
+    key = hashlib.sha1(os.path.abspath(source_path).encode("utf-8")).hexdigest()
+    return os.path.join(get_pyramid_dir(), f"{key}.amxp")
+
+
+def _source_stamp(source_path: str):
+    stat = os.stat(source_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def save_pyramid(pyramid: WaveformPyramid, source_path: str, cache_path: str):
+    """
+    Grava a pirâmide em formato binário (header + níveis float32).
+    Escreve em arquivo temporário e renomeia, para nunca deixar cache parcial.
+    """
+    size, mtime_ns = _source_stamp(source_path)
+    header = _HEADER.pack(
+        _MAGIC, _VERSION,
+        pyramid.sample_rate, pyramid.base_frames, pyramid.factor,
+        size, mtime_ns, len(pyramid.levels),
+    )
+
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header.ljust(_HEADER_SIZE, b"\0"))
+        for level in pyramid.levels:
+            f.write(_COUNT.pack(len(level)))
+
+        for level in pyramid.levels:
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.write(np.ascontiguousarray(level, dtype=np.float32).tobytes())
+
+    os.replace(tmp_path, cache_path)
+
+
+def load_pyramid(source_path: str, cache_path: str = None):
+    """
+    Abre a pirâmide do cache via memmap.
+    Retorna None se não existir ou se a fonte mudou (tamanho/mtime).
+    """
+    cache_path = cache_path or pyramid_cache_path(source_path)
+    if not os.path.exists(cache_path):
+        return None
+
+    with open(cache_path, "rb") as f:
+        raw = f.read(_HEADER_SIZE)
+        if len(raw) < _HEADER.size:
+            return None
+
+        magic, version, rate, base, factor, size, mtime_ns, n_levels = _HEADER.unpack_from(raw)
+        if magic != _MAGIC or version != _VERSION:
+            return None
+
+        if (size, mtime_ns) != _source_stamp(source_path):
+            debug("Pirâmide desatualizada: %s", source_path)
+            return None
+
+        counts = [_COUNT.unpack(f.read(_COUNT.size))[0] for _ in range(n_levels)]
+        offset = f.tell()
+
+    levels = []
+    for count in counts:
+        offset = _align(offset)
+        if count:
+            levels.append(np.memmap(cache_path, dtype=np.float32, mode="r",
+                                    offset=offset, shape=(count, _FIELDS)))
+        else:
+            levels.append(np.empty((0, _FIELDS), dtype=np.float32))
+        offset += count * _FIELDS * 4
+
+    return WaveformPyramid(levels, rate, base, factor)
+
+
+def build_pyramid(source_path: str,
+                  base_frames: int = BASE_FRAMES,
+                  factor: int = REDUCTION,
+                  block_frames: int = DEFAULT_BLOCK_FRAMES) -> WaveformPyramid:
+    """
+    Decodifica a fonte em streaming e monta a pirâmide.
+    """
+    probed = probe_audio(source_path)
+    blocks = iter_blocks(source_path, block_frames, probed["sample_rate"], probed["channels"])
+    levels = build_levels(blocks, base_frames, factor)
+
+    return WaveformPyramid(levels, probed["sample_rate"], base_frames, factor)
+
+
+def get_pyramid(source_path: str) -> WaveformPyramid:
+    """
+    Pirâmide do cache quando válida; senão constrói e grava.
+    """
+    if not source_path or not os.path.exists(source_path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {source_path}")
+
+    cache_path = pyramid_cache_path(source_path)
+    pyramid = load_pyramid(source_path, cache_path)
+    if pyramid is not None:
+        return pyramid
+
+    info("Gerando pirâmide de waveform: %s", os.path.basename(source_path))
+    pyramid = build_pyramid(source_path)
+    save_pyramid(pyramid, source_path, cache_path)
+
+    return load_pyramid(source_path, cache_path) or pyramid
@@ -0,0 +1,496 @@
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from .frame_metrics import pcm_to_array
+from .samples import to_pcm
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+WAV_EXTENSIONS = (".wav", ".wave", ".rf64", ".bw64")
+
+FORMAT_PCM = 0x0001
+FORMAT_FLOAT = 0x0003
+FORMAT_EXTENSIBLE = 0xFFFE
+
+# Tamanho de 32 bits "ver ds64" do RF64
+_SIZE_IN_DS64 = 0xFFFFFFFF
+
+# Frames copiados por vez ao escrever um AudioSegment inteiro
+WRITE_BLOCK_FRAMES = 262144
+
+
+class WavFormatError(ValueError):
+    """
+    Não é um WAV que o leitor nativo entende (ex.: ADPCM, cabeçalho
+    corrompido). Quem chama cai para o ffmpeg.
+    """
+
+
+def is_wav_path(path: str) -> bool:
+    return path.lower().endswith(WAV_EXTENSIONS)
+
+
+# -------------------------------------------------
+# READER
+# -------------------------------------------------
+
+def _parse_header(f, file_size: int) -> dict:
+    head = f.read(12)
+    if len(head) < 12 or head[8:12] != b"WAVE" or head[:4] not in (b"RIFF", b"RF64", b"BW64"):
+        raise WavFormatError("cabeçalho RIFF/WAVE ausente")
+
+    rf64 = head[:4] != b"RIFF"
+    ds64_data_size = None
+    fmt = None
+    data_offset = data_size = None
+    position = 12
+
+    while position + 8 <= file_size:
+        f.seek(position)
+        chunk_id, size = struct.unpack("<4sI", f.read(8))
+        body = position + 8
+
+        if chunk_id == b"ds64":
+            ds64_data_size = struct.unpack("<QQ", f.read(16))[1]
+
+        elif chunk_id == b"fmt ":
+            fmt = f.read(min(size, 40))
+
+        elif chunk_id == b"data":
+            data_offset = body
+            data_size = size
+            if rf64 and size == _SIZE_IN_DS64 and ds64_data_size is not None:
+                data_size = ds64_data_size
+            # Gravado por pipe (0xFFFFFFFF) ou truncado: vai até o fim do arquivo
+            if data_size == _SIZE_IN_DS64 or body + data_size > file_size:
+                data_size = file_size - body
+            if fmt is not None:
+                break
+
+        position = body + size + (size & 1)
+        if chunk_id == b"data" and size == _SIZE_IN_DS64:
+            break
+
+    if fmt is None or len(fmt) < 16:
+        raise WavFormatError("chunk fmt ausente")
+    if data_offset is None:
+        raise WavFormatError("chunk data ausente")
+
+    tag, channels, sample_rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+
+    if tag == FORMAT_EXTENSIBLE:
+        if len(fmt) < 40:
+            raise WavFormatError("WAVE_FORMAT_EXTENSIBLE incompleto")
+        bits = struct.unpack("<H", fmt[18:20])[0] or bits  # wValidBitsPerSample
+        tag = struct.unpack("<H", fmt[24:26])[0]            # 2 primeiros bytes do SubFormat
+        container = block_align // channels if channels else 0
+    else:
+        container = (bits + 7) // 8
+
+    is_float = tag == FORMAT_FLOAT
+    if tag not in (FORMAT_PCM, FORMAT_FLOAT) or not channels or not sample_rate:
+        raise WavFormatError(f"formato WAV não suportado (tag {tag:#06x})")
+    if is_float and container not in (4, 8):
+        raise WavFormatError(f"float de {container * 8} bits não suportado")
+    if not is_float and container not in (1, 2, 3, 4):
+        raise WavFormatError(f"PCM de {container * 8} bits não suportado")
+    if block_align != container * channels:
+        raise WavFormatError("block_align inconsistente")
+
+    return {
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "sample_width": container,
+        "float": is_float,
+        "data_offset": data_offset,
+        "frames": data_size // block_align,
+    }
+
+
+class WavFile:
+    """
+    WAV (RIFF, RF64/BW64, WAVE_FORMAT_EXTENSIBLE) com o chunk de dados
+    mapeado em memória. Nada é lido do disco até ser usado: fatiar
+    `samples` ou chamar read() só toca as páginas daquele trecho.
+
+        with WavFile(path) as wav:
+            head = wav.read_float(0, wav.sample_rate)   # primeiro segundo
+
+    PCM 8/16/32 bits e float 32/64 têm `samples` como view sem cópia;
+    24 bits não tem dtype NumPy, então só `raw` (bytes) e read().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = None
+
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            header = _parse_header(self._file, size)
+        except (struct.error, WavFormatError):
+            self._file.close()
+            raise
+
+        self.sample_rate = header["sample_rate"]
+        self.channels = header["channels"]
+        self.sample_width = header["sample_width"]
+        self.is_float = header["float"]
+        self.frames = header["frames"]
+        self._offset = header["data_offset"]
+
+        if self.frames:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # ---------------------------------------------
+    # Views
+    # ---------------------------------------------
+
+    @property
+    def frame_width(self) -> int:
+        return self.sample_width * self.channels
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sample_rate
+
+    @property
+    def duration_ms(self) -> int:
+        """
+        Mesmo arredondamento de len(AudioSegment).
+        """
+        return round(1000 * (self.frames / self.sample_rate))
+
+    @property
+    def raw(self) -> np.ndarray:
+        """
+        Bytes do chunk de dados como uint8 (frames, frame_width), sem cópia.
+        """
+        if not self.frames:
+            return np.zeros((0, self.frame_width), dtype=np.uint8)
+
+        return np.frombuffer(self._mmap, dtype=np.uint8, count=self.frames * self.frame_width,
+                             offset=self._offset).reshape(self.frames, self.frame_width)
+
+    @property
+    def dtype(self):
+        if self.is_float:
+            return np.dtype("<f4") if self.sample_width == 4 else np.dtype("<f8")
+        return {1: np.dtype(np.uint8), 2: np.dtype("<i2"), 4: np.dtype("<i4")}.get(self.sample_width)
+
+    @property
+    def samples(self) -> np.ndarray:
+        """
+        View (frames, canais) sem cópia, no formato do arquivo
+        (8 bits é unsigned, como no WAV). Somente leitura.
+        """
+        if self.dtype is None:
+            raise WavFormatError("24 bits não tem view direta; use read()")
+        if not self.frames:
+            return np.zeros((0, self.channels), dtype=self.dtype)
+
+        return np.frombuffer(self._mmap, dtype=self.dtype, count=self.frames * self.channels,
+                             offset=self._offset).reshape(self.frames, self.channels)
+
+    # ---------------------------------------------
+    # Reads (sempre cópias; o mmap pode fechar depois)
+    # ---------------------------------------------
+
+    def _clamp(self, start: int, stop) -> tuple:
+        stop = self.frames if stop is None else min(stop, self.frames)
+        start = max(0, min(start, stop))
+        return start, stop
+
+    def read(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Frames [start, stop) como inteiros com sinal no formato do pydub:
+        8 → int8, 16 → int16, 24/32/float → int32 em escala cheia.
+        """
+        start, stop = self._clamp(start, stop)
+
+        if self.is_float:
+            data = self.samples[start:stop].astype(np.float64)
+            return np.clip(np.rint(data * 2147483648.0), -2147483648, 2147483647).astype(np.int32)
+
+        if self.sample_width == 1:
+            return (self.samples[start:stop].astype(np.int16) - 128).astype(np.int8)
+
+        if self.sample_width == 3:
+            data = pcm_to_array(self.raw[start:stop].tobytes(), 3, self.channels)
+            return data << 8
+
+        return np.array(self.samples[start:stop])
+
+    def read_float(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Frames [start, stop) como float32 em [-1, 1), igual aos blocos do ffmpeg.
+        """
+        start, stop = self._clamp(start, stop)
+
+        if self.is_float:
+            return self.samples[start:stop].astype(np.float32)
+
+        width = 1 if self.sample_width == 1 else 4 if self.sample_width >= 3 else 2
+        out = self.read(start, stop).astype(np.float32)
+        out *= np.float32(1.0 / float(2 ** (width * 8 - 1)))
+        return out
+
+    def iter_blocks(self, block_frames: int, start: int = 0, stop: int = None):
+        """
+        Blocos float32 (frames, canais) de no máximo block_frames.
+        """
+        start, stop = self._clamp(start, stop)
+        for begin in range(start, stop, block_frames):
+            yield self.read_float(begin, min(begin + block_frames, stop))
+
+    # ---------------------------------------------
+    # pydub
+    # ---------------------------------------------
+
+    def frame_at(self, ms: float) -> int:
+        """
+        Mesmo arredondamento de AudioSegment._parse_position.
+        """
+        duration = self.duration_ms
+        if ms < 0:
+            ms = duration - abs(ms)
+        return int(min(ms, duration) * self.sample_rate / 1000.0)
+
+    def to_segment(self, start_ms: float = None, end_ms: float = None):
+        """
+        AudioSegment com só o trecho pedido (mesmo resultado de
+        AudioSegment.from_file(path)[start_ms:end_ms]).
+        """
+        from pydub import AudioSegment
+
+        if start_ms is None and end_ms is None:
+            start, stop = 0, self.frames
+        else:
+            start = self.frame_at(start_ms or 0)
+            stop = self.frame_at(self.duration_ms if end_ms is None else end_ms)
+
+        if self.is_float or self.sample_width in (1, 3):
+            samples = self.read(start, stop)
+            width, data = samples.dtype.itemsize, samples.tobytes()
+        else:
+            # 16/32 bits já estão no formato do pydub: uma única cópia do mmap
+            clamped = self._clamp(start, stop)
+            width, data = self.sample_width, self.raw[clamped[0]:clamped[1]].tobytes()
+
+        # O pydub completa com silêncio o que o arredondamento em ms pede a mais
+        missing = (stop - start) * width * self.channels - len(data)
+        if missing > 0:
+            data += b"\0" * missing
+
+        return AudioSegment(
+            data=data,
+            sample_width=width,
+            frame_rate=self.sample_rate,
+            channels=self.channels,
+        )
+
+    def info(self) -> dict:
+        return {
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "duration": self.duration,
+            "sample_width": self.sample_width,
+            "float": self.is_float,
+        }
+
+    def close(self):
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Ainda há views (samples/raw) em uso: o mapeamento é
+                # liberado quando a última delas for coletada
+                pass
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def open_wav(path: str):
+    """
+    WavFile se o arquivo for um WAV suportado; senão None (use o ffmpeg).
+    """
+    if not path or not is_wav_path(path) or not os.path.isfile(path):
+        return None
+
+    try:
+        return WavFile(path)
+    except (OSError, struct.error, WavFormatError):
+        return None
+
+
+def load_segment(path: str, start_ms: float = None, end_ms: float = None):
+    """
+    AudioSegment lido direto do WAV, sem ffmpeg. None se não for possível.
+    """
+    wav = open_wav(path)
+    if wav is None:
+        return None
+
+    with wav:
+        return wav.to_segment(start_ms, end_ms)
+
+
+# -------------------------------------------------
+# WRITER
+# -------------------------------------------------
+
+class WavWriter:
+    """
+    Escreve um WAV em blocos, direto no disco. Os tamanhos são
+    corrigidos no close(); passando de 4 GB o arquivo vira RF64
+    (o espaço do ds64 fica reservado em um chunk JUNK).
+
+    Mesma interface do streaming.BlockWriter: write(bloco float),
+    close(), abort() e uso com `with`.
+    """
+
+    def __init__(self, output_path: str, sample_rate: int, channels: int,
+                 sample_width: int = 2, is_float: bool = False):
+        if is_float and sample_width not in (4, 8):
+            raise ValueError("float precisa de 4 ou 8 bytes por sample")
+        if not is_float and sample_width not in (1, 2, 3, 4):
+            raise ValueError(f"sample_width não suportado: {sample_width}")
+
+        self.output_path = output_path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.is_float = is_float
+        self.frames = 0
+
+        self._data_bytes = 0
+        self._file = open(output_path, "wb")
+        self._write_header()
+
+    def _fmt_chunk(self) -> bytes:
+        tag = FORMAT_FLOAT if self.is_float else FORMAT_PCM
+        block_align = self.sample_width * self.channels
+        bits = self.sample_width * 8
+        base = struct.pack("<HIIHH", self.channels, self.sample_rate,
+                           self.sample_rate * block_align, block_align, bits)
+
+        if self.channels <= 2:
+            return b"fmt " + struct.pack("<I", 16) + struct.pack("<H", tag) + base
+
+        # Mais de 2 canais: EXTENSIBLE com máscara dos primeiros N alto-falantes
+        mask = (1 << self.channels) - 1 if self.channels <= 18 else 0
+        guid = struct.pack("<H", tag) + b"\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71"
+        extra = struct.pack("<HHI", 22, bits, mask) + guid
+        return b"fmt " + struct.pack("<I", 40) + struct.pack("<H", FORMAT_EXTENSIBLE) + base + extra
+
+    def _write_header(self):
+        fmt = self._fmt_chunk()
+        self._file.write(b"RIFF" + struct.pack("<I", 0) + b"WAVE")
+        self._file.write(b"JUNK" + struct.pack("<I", 28) + b"\x00" * 28)
+        self._file.write(fmt)
+        self._file.write(b"data" + struct.pack("<I", 0))
+        self._data_offset = self._file.tell()
+
+    def _encode(self, block) -> bytes:
+        block = np.asarray(block)
+        if block.ndim == 1:
+            block = block.reshape(-1, self.channels)
+
+        if self.is_float:
+            dtype = "<f4" if self.sample_width == 4 else "<f8"
+            return np.ascontiguousarray(block, dtype=dtype).tobytes()
+
+        data = to_pcm(block, self.sample_width)
+        if self.sample_width == 1:
+            # WAV de 8 bits é unsigned
+            data = (np.frombuffer(data, dtype=np.int8).astype(np.int16) + 128).astype(np.uint8).tobytes()
+        return data
+
+    def write(self, block):
+        """
+        Bloco float (frames, canais) em [-1, 1).
+        """
+        self.write_bytes(self._encode(block))
+
+    def write_bytes(self, data):
+        """
+        Bytes já no formato do arquivo (PCM little-endian intercalado).
+        """
+        self._file.write(data)
+        self._data_bytes += len(data)
+        self.frames = self._data_bytes // (self.sample_width * self.channels)
+
+    def close(self) -> str:
+        if self._file.closed:
+            return self.output_path
+
+        if self._data_bytes & 1:
+            self._file.write(b"\x00")
+
+        riff_size = self._file.tell() - 8
+
+        if riff_size > 0xFFFFFFFF:
+            # RF64: JUNK vira ds64 com os tamanhos de 64 bits
+            self._file.seek(0)
+            self._file.write(b"RF64" + struct.pack("<I", _SIZE_IN_DS64) + b"WAVE")
+            self._file.write(b"ds64" + struct.pack("<IQQQI", 28, riff_size, self._data_bytes,
+                                                   self.frames, 0))
+            self._file.seek(self._data_offset - 4)
+            self._file.write(struct.pack("<I", _SIZE_IN_DS64))
+        else:
+            self._file.seek(4)
+            self._file.write(struct.pack("<I", riff_size))
+            self._file.seek(self._data_offset - 4)
+            self._file.write(struct.pack("<I", self._data_bytes))
+
+        self._file.close()
+        return self.output_path
+
+    def abort(self):
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def write_segment(segment, output_path: str) -> str:
+    """
+    Salva um AudioSegment como WAV sem passar pelo ffmpeg.
+    """
+    width = segment.sample_width
+    data = segment.raw_data
+
+    with WavWriter(output_path, segment.frame_rate, segment.channels, width) as writer:
+        if width == 1:
+            data = (np.frombuffer(data, dtype=np.int8).astype(np.int16) + 128).astype(np.uint8)
+            writer.write_bytes(data.tobytes())
+        else:
+            view = memoryview(data)
+            step = WRITE_BLOCK_FRAMES * segment.frame_width
+            for begin in range(0, len(view), step):
+                writer.write_bytes(view[begin:begin + step])
+
+    return output_path
@@ -57,6 +57,45 @@ def build_command(template: str,
     return command
 
 
+# -------------------------------------------------
+# BUILD ARGV FROM TEMPLATE
+# -------------------------------------------------
+
+def build_argv(template: str,
+               host_path: str,
+               input_path: str,
+               output_path: str,
+               plugin_path: str = "",
+               preset_path: str = "") -> list:
+    """
+    Igual a build_command, mas retorna a lista de argumentos para
+    subprocess (sem shell). O template é dividido antes da substituição,
+    então caminhos com espaços ou aspas não precisam de escape.
+    Placeholders sem valor viram argumento vazio, como o "" de build_command.
+    """
+
+    if not template:
+        raise ValueError("Template de comando vazio.")
+
+    replacements = {
+        "{host}": host_path,
+        "{input}": input_path,
+        "{output}": output_path,
+        "{plugin}": plugin_path or "",
+        "{preset}": preset_path or "",
+    }
+
+    argv = []
+
+    for token in shlex.split(template):
+        for key, value in replacements.items():
+            token = token.replace(key, value)
+
+        argv.append(token)
+
+    return argv
+
+
 # -------------------------------------------------
 # DEFAULT TEMPLATES
 # -------------------------------------------------
@@ -1,8 +1,11 @@
 import os
+import re
 import sys
 import shutil
 import ctypes
 
+from ..utils.profiling import traced
+
 # Palavras-chave genéricas (não fixas)
 KEYWORDS = [
     "reaper",
@@ -20,6 +23,13 @@ KEYWORDS = [
     "waveform"
 ]
 
+# Um único regex compilado no lugar de um `in` por palavra-chave
+KEYWORD_PATTERN = re.compile("|".join(re.escape(k) for k in KEYWORDS))
+
+
+def matches_keyword(name: str) -> bool:
+    return KEYWORD_PATTERN.search(name.lower()) is not None
+
 # -------------------------------------------------
 # SYSTEM BASE PATHS
 # -------------------------------------------------
@@ -71,8 +81,7 @@ def _search_directories(max_depth=5):
                 continue
 
             for file in files:
-                name = file.lower()
-                if any(k in name for k in KEYWORDS):
+                if matches_keyword(file):
                     full_path = os.path.join(root, file)
                     if os.access(full_path, os.X_OK):
                         found.append(full_path)
@@ -82,10 +91,19 @@ def _search_directories(max_depth=5):
 # -------------------------------------------------
 # PUBLIC FUNCTION
 # -------------------------------------------------
-def detect_all_audio_hosts():
+@traced
+def detect_all_audio_hosts(use_index: bool = True, **refresh_options):
     """
     Retorna lista única de possíveis DAWs / Hosts encontrados.
+
+    use_index=True usa o índice persistente (external.host_index): só as
+    pastas cujo mtime mudou são lidas de novo. refresh_options vão para
+    HostIndex.refresh (on_found, cancel, deadline).
     """
+    if use_index:
+        from .host_index import get_host_index
+        return get_host_index().refresh(**refresh_options)
+
     results = set()
 
     # Camada 1: via PATH
@@ -0,0 +1,304 @@
+import json
+import os
+import re
+import shlex
+import shutil
+import sys
+import threading
+import time
+
+from .daw_detector import KEYWORDS, matches_keyword, _get_base_paths, _detect_from_path
+from ..utils.paths import get_temp_dir
+from ..utils.logging import debug, error
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+INDEX_VERSION = 1
+INDEX_FILENAME = "host_index.json"
+
+# Mesmo limite de profundidade do _search_directories
+MAX_DEPTH = 5
+
+# Códigos de campo do Exec= (%f, %U, %%...)
+_FIELD_CODE = re.compile(r"%[a-zA-Z%]")
+
+
+# -------------------------------------------------
+# XDG .desktop
+# -------------------------------------------------
+
+def _desktop_dirs() -> list:
+    """
+    Pastas applications/ do XDG (Linux), incluindo exports do Flatpak.
+    """
+    if sys.platform in ("win32", "darwin"):
+        return []
+
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+
+    roots = [data_home] + data_dirs.split(os.pathsep) + [
+        "/var/lib/flatpak/exports/share",
+        os.path.expanduser("~/.local/share/flatpak/exports/share"),
+    ]
+
+    dirs = []
+    for root in roots:
+        path = os.path.join(root, "applications")
+        if root and path not in dirs:
+            dirs.append(path)
+    return dirs
+
+
+def _desktop_executable(path: str):
+    """
+    Executável de uma entrada .desktop cujo nome combina com KEYWORDS,
+    ou None.
+    """
+    name = exec_line = None
+    in_entry = False
+
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and line.startswith("Name=") and name is None:
+                    name = line[5:]
+                elif in_entry and line.startswith("Exec=") and exec_line is None:
+                    exec_line = line[5:]
+    except OSError:
+        return None
+
+    if not exec_line:
+        return None
+    if not (matches_keyword(os.path.basename(path)) or matches_keyword(name or "")):
+        return None
+
+    try:
+        argv = shlex.split(_FIELD_CODE.sub("", exec_line))
+    except ValueError:
+        return None
+
+    # "env VAR=valor programa ..."
+    if argv and os.path.basename(argv[0]) == "env":
+        argv = [a for a in argv[1:] if "=" not in a]
+    if not argv:
+        return None
+
+    exe = argv[0] if os.path.isabs(argv[0]) else shutil.which(argv[0])
+    if exe and os.access(exe, os.X_OK):
+        return os.path.abspath(exe)
+    return None
+
+
+# -------------------------------------------------
+# INDEX
+# -------------------------------------------------
+
+def _add_found(found: set, hosts: list, on_found):
+    new = [h for h in hosts if h not in found]
+    if not new:
+        return
+
+    found.update(new)
+    if on_found:
+        on_found(new)
+
+
+class HostIndex:
+    """
+    Índice persistente de hosts por pasta.
+
+    Cada pasta guarda seu mtime, os hosts encontrados e as subpastas.
+    No refresh() só as pastas cujo mtime mudou são listadas de novo;
+    as demais custam um stat. Arquivos só passam por os.access quando
+    o nome combina com KEYWORDS.
+    """
+
+    def __init__(self, path: str, max_depth: int = MAX_DEPTH):
+        self.path = path
+        self.max_depth = max_depth
+        self.dirs = {}
+        self.hosts = []
+        self.stats = {"scanned": 0, "reused": 0, "seconds": 0.0}
+        self.interrupted = False
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    # --- disk ---
+
+    def _signature(self) -> dict:
+        return {"version": INDEX_VERSION, "keywords": KEYWORDS, "max_depth": self.max_depth}
+
+    def load(self):
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get("signature") != self._signature():
+            return
+
+        self.dirs = data.get("dirs", {})
+        self.hosts = data.get("hosts", [])
+
+    def save(self):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"signature": self._signature(), "dirs": self.dirs, "hosts": self.hosts}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            error("Não foi possível salvar o índice de hosts: %s", e)
+
+    # --- scan ---
+
+    def _scan(self, directory: str, kind: str, descend: bool, mtime: int) -> dict:
+        hosts = []
+        subdirs = []
+
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            entries = []
+
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+
+            if is_dir:
+                # Como os.walk: lista links para pastas, mas não entra neles
+                if descend and not entry.is_symlink():
+                    subdirs.append(entry.path)
+                continue
+
+            if kind == "bin":
+                if matches_keyword(entry.name) and os.access(entry.path, os.X_OK):
+                    hosts.append(os.path.abspath(entry.path))
+            elif entry.name.endswith(".desktop"):
+                exe = _desktop_executable(entry.path)
+                if exe:
+                    hosts.append(exe)
+
+        return {"mtime": mtime, "kind": kind, "hosts": hosts, "subdirs": subdirs}
+
+    def _visit(self, base: str, kind: str, seen: dict, found: set, on_found, should_stop):
+        stack = [(base, 0)]
+
+        while stack:
+            if should_stop():
+                self.interrupted = True
+                return
+
+            directory, depth = stack.pop()
+            if directory in seen:
+                continue
+
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+
+            record = self.dirs.get(directory)
+            if record is None or record.get("mtime") != mtime or record.get("kind") != kind:
+                record = self._scan(directory, kind, depth < self.max_depth, mtime)
+                self.stats["scanned"] += 1
+            else:
+                self.stats["reused"] += 1
+
+            seen[directory] = record
+            _add_found(found, record["hosts"], on_found)
+            stack.extend((sub, depth + 1) for sub in record["subdirs"])
+
+    def refresh(self, on_found=None, cancel=None, deadline: float = None) -> list:
+        """
+        Atualiza o índice (incremental) e retorna a lista ordenada de hosts.
+
+        on_found(hosts): chamado com cada lote de hosts novos, à medida que
+        aparecem (pode ser chamado da thread de descoberta).
+        cancel: threading.Event; deadline: time.monotonic() limite.
+        Se interrompido, self.interrupted fica True, o índice não é salvo
+        e o retorno tem só o que foi encontrado até ali.
+        """
+        with self._lock:
+            return self._refresh(on_found, cancel, deadline)
+
+    def _refresh(self, on_found, cancel, deadline) -> list:
+        if not self._loaded:
+            self.load()
+
+        def should_stop():
+            if cancel is not None and cancel.is_set():
+                return True
+            return deadline is not None and time.monotonic() > deadline
+
+        started = time.perf_counter()
+        self.stats.update(scanned=0, reused=0)
+        self.interrupted = False
+
+        seen = {}
+        found = set()
+
+        # Resultado da última execução primeiro: a UI já tem algo para mostrar
+        if on_found and self.hosts:
+            on_found([h for h in self.hosts if os.access(h, os.X_OK)])
+
+        _add_found(found, [os.path.abspath(exe) for exe in _detect_from_path()], on_found)
+
+        for base in _get_base_paths():
+            self._visit(base, "bin", seen, found, on_found, should_stop)
+
+        for directory in _desktop_dirs():
+            self._visit(directory, "desktop", seen, found, on_found, should_stop)
+
+        # Um chmod -x não muda o mtime da pasta
+        hosts = sorted(h for h in found if os.access(h, os.X_OK))
+        self.stats["seconds"] = time.perf_counter() - started
+
+        if self.interrupted:
+            debug("Índice de hosts interrompido após %.1fs", self.stats["seconds"])
+            return hosts
+
+        changed = self.stats["scanned"] > 0 or seen.keys() != self.dirs.keys() or hosts != self.hosts
+        self.dirs = seen
+        self.hosts = hosts
+
+        if changed:
+            self.save()
+
+        debug("Índice de hosts: %d pastas lidas, %d reaproveitadas em %.1f ms",
+              self.stats["scanned"], self.stats["reused"], self.stats["seconds"] * 1000)
+
+        return list(hosts)
+
+    def clear(self):
+        self.dirs = {}
+        self.hosts = []
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+# -------------------------------------------------
+# DEFAULT INDEX
+# -------------------------------------------------
+
+_INDEX = None
+
+
+def get_host_index() -> HostIndex:
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = HostIndex(os.path.join(get_temp_dir(), INDEX_FILENAME))
+    return _INDEX
@@ -1,4 +1,5 @@
 import os
+import re
 
 
 # Palavras-chave por prioridade
@@ -25,6 +26,13 @@ LOW_PRIORITY = [
     "waveform"
 ]
 
+# Regex compilados uma vez por nível
+_LEVELS = [
+    ("high", re.compile("|".join(map(re.escape, HIGH_PRIORITY)))),
+    ("medium", re.compile("|".join(map(re.escape, MEDIUM_PRIORITY)))),
+    ("low", re.compile("|".join(map(re.escape, LOW_PRIORITY)))),
+]
+
 
 # -------------------------------------------------
 # CLASSIFY
@@ -36,14 +44,9 @@ def classify_host(path: str) -> str:
     """
     name = os.path.basename(path).lower()
 
-    if any(k in name for k in HIGH_PRIORITY):
-        return "high"
-
-    if any(k in name for k in MEDIUM_PRIORITY):
-        return "medium"
-
-    if any(k in name for k in LOW_PRIORITY):
-        return "low"
+    for level, pattern in _LEVELS:
+        if pattern.search(name):
+            return level
 
     return "unknown"
 
@@ -0,0 +1,687 @@
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+from .command_builder import build_argv
+from ..utils.paths import add_bundled_wheels
+from ..utils.logging import info, error, debug
+
+
+# -------------------------------------------------
+# PROTOCOL
+# -------------------------------------------------
+#
+# Mensagens OSC em 127.0.0.1 (UDP). O host escuta em {osc_port} e
+# responde em {reply_port}; toda resposta começa com a porta do host.
+#
+#   pool -> host                              host -> pool
+#   /amax/ping   token                        /amax/pong   port token
+#   /amax/load   job_id path                  /amax/loaded port job_id status
+#   /amax/render job_id in out plugin preset  /amax/done   port job_id status msg
+#   /amax/quit                                /amax/ready  port (após o boot)
+#
+# Cada renderização: /amax/load (o host abre o arquivo) -> /amax/loaded
+# -> /amax/render -> /amax/done.
+#
+# status 0 = ok. Hosts reais (Carla, REAPER) precisam de um script/bridge
+# que traduza isso para a API OSC deles, passado como template ao HostPool;
+# osc_standin.py implementa o protocolo para testes.
+
+STARTUP_TIMEOUT = 30.0
+RENDER_TIMEOUT = 300.0
+LOAD_TIMEOUT = 60.0
+IDLE_TIMEOUT = 300.0
+HEALTH_INTERVAL = 2.0
+PING_TIMEOUT = 6.0
+
+# Tentativas de uma renderização quando o host cai no meio
+MAX_ATTEMPTS = 2
+
+# Hosts seguidos que não chegam a /amax/ready antes de o pool desistir
+MAX_STARTUP_FAILURES = 3
+
+STARTING = "STARTING"
+READY = "READY"
+LOADING = "LOADING"
+BUSY = "BUSY"
+STOPPED = "STOPPED"
+
+_JOB_IDS = itertools.count(1)
+
+
+def _osc():
+    add_bundled_wheels()
+    from pythonosc.dispatcher import Dispatcher
+    from pythonosc.osc_server import ThreadingOSCUDPServer
+    from pythonosc.udp_client import SimpleUDPClient
+    return Dispatcher, ThreadingOSCUDPServer, SimpleUDPClient
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def standin_template(delay: float = 0.0, startup: float = 0.0) -> str:
+    """
+    Template para o host de teste (osc_standin.py) com o Python atual.
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "osc_standin.py")
+    return (f'{{host}} "{script}" --port {{osc_port}} --reply-port {{reply_port}} '
+            f'--delay {delay} --startup {startup}')
+
+
+# Templates OSC por executável de host. Um host registrado aqui passa
+# a renderizar pelo pool (RenderTask usa registered_osc_template).
+_OSC_TEMPLATES = {}
+
+
+def set_osc_template(host_path: str, template: str = None):
+    """
+    Registra (ou remove, com None) o comando do bridge OSC de um host.
+    """
+    key = os.path.normcase(os.path.abspath(host_path))
+    if template:
+        _OSC_TEMPLATES[key] = template
+    else:
+        _OSC_TEMPLATES.pop(key, None)
+
+
+def registered_osc_template(host_path: str):
+    if not host_path:
+        return None
+    return _OSC_TEMPLATES.get(os.path.normcase(os.path.abspath(host_path)))
+
+
+def get_osc_template(host_path: str):
+    """
+    Template para iniciar um host em modo OSC, ou None.
+    Registrados primeiro; fora isso só o host de teste fala o protocolo
+    sozinho, DAWs reais precisam do template do bridge.
+    """
+    registered = registered_osc_template(host_path)
+    if registered:
+        return registered
+
+    name = os.path.basename(host_path).lower()
+
+    if "python" in name:
+        return standin_template()
+
+    return None
+
+
+# -------------------------------------------------
+# RENDER REQUEST
+# -------------------------------------------------
+
+class PendingRender:
+    """
+    Renderização enviada ao pool. wait() bloqueia até o resultado:
+    {"input", "output", "error", "seconds", "host_port", "attempts"}
+    """
+
+    def __init__(self, input_path: str, output_path: str, plugin_path: str, preset_path: str, timeout: float):
+        self.job_id = next(_JOB_IDS)
+        self.input_path = input_path
+        self.output_path = output_path
+        self.plugin_path = plugin_path
+        self.preset_path = preset_path
+        self.timeout = timeout
+        self.attempts = 0
+        self.submitted = time.monotonic()
+        self.load_sent = None
+        self.sent = None
+        self.result = None
+        self._event = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: float = None):
+        self._event.wait(timeout)
+        return self.result
+
+    def _finish(self, message=None, host_port=None):
+        if self._event.is_set():
+            return
+
+        ok = message is None and _valid_output(self.output_path)
+        if message is None and not ok:
+            message = "Host terminou sem gerar o arquivo de saída"
+
+        self.result = {
+            "input": self.input_path,
+            "output": self.output_path if ok else None,
+            "error": message,
+            "seconds": time.monotonic() - self.submitted,
+            "host_port": host_port,
+            "attempts": self.attempts,
+        }
+        self._event.set()
+
+
+def _valid_output(path: str) -> bool:
+    try:
+        return os.path.getsize(path) > 0
+    except OSError:
+        return False
+
+
+# -------------------------------------------------
+# HOST
+# -------------------------------------------------
+
+class WarmHost:
+    """
+    Um processo de host mantido aberto entre renderizações.
+    """
+
+    def __init__(self, argv: list, port: int, client):
+        self.argv = argv
+        self.port = port
+        self.client = client
+        self.proc = None
+        self.state = STOPPED
+        self.started = None
+        self.last_used = time.monotonic()
+        self.last_pong = None
+        self.current = None
+        self.renders = 0
+
+    def start(self):
+        self.proc = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.state = STARTING
+        self.started = time.monotonic()
+        self.last_pong = None
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def send(self, address: str, *args):
+        try:
+            self.client.send_message(address, list(args))
+        except OSError as e:
+            debug("OSC para porta %s falhou: %s", self.port, e)
+
+    def stop(self, grace: float = 2.0):
+        if self.alive:
+            self.send("/amax/quit")
+            try:
+                self.proc.wait(grace)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self.state = STOPPED
+
+
+# -------------------------------------------------
+# POOL
+# -------------------------------------------------
+
+class HostPool:
+    """
+    Pool de processos de host "quentes", controlados por OSC.
+
+    - renderizações vão para um host livre; se todos estão ocupados e o
+      pool não está cheio, um novo host é iniciado
+    - health check periódico: ping/pong, processo morto e timeouts;
+      host com problema é reiniciado e a renderização reenviada
+    - hosts ociosos por mais de idle_timeout são encerrados
+    - MAX_STARTUP_FAILURES hosts seguidos sem /amax/ready marcam o pool
+      como falho: a fila e os próximos submit() falham na hora
+    - o timeout de cada renderização conta desde o submit(), inclusive
+      o tempo na fila
+    """
+
+    def __init__(self,
+                 host_path: str,
+                 template: str = None,
+                 size: int = 2,
+                 idle_timeout: float = IDLE_TIMEOUT,
+                 health_interval: float = HEALTH_INTERVAL,
+                 startup_timeout: float = STARTUP_TIMEOUT,
+                 load_timeout: float = LOAD_TIMEOUT):
+        self.host_path = host_path
+        self.template = template or get_osc_template(host_path)
+        if not self.template:
+            raise ValueError(f"Sem template OSC para {os.path.basename(host_path)}: "
+                             "informe o comando do bridge (template=...)")
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.health_interval = health_interval
+        self.startup_timeout = startup_timeout
+        self.load_timeout = load_timeout
+
+        self.hosts = {}
+        self.stats = {"renders": 0, "failures": 0, "starts": 0, "restarts": 0, "idle_stops": 0,
+                      "startup_failures": 0}
+        self.failed = None
+
+        self._queue = deque()
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._startup_failures = 0
+        self._server = None
+        self._threads = []
+        self.reply_port = None
+
+    # --- lifecycle ---
+
+    def start(self):
+        if self._server is not None:
+            return self
+
+        Dispatcher, Server, _ = _osc()
+
+        dispatcher = Dispatcher()
+        dispatcher.map("/amax/ready", self._on_ready)
+        dispatcher.map("/amax/pong", self._on_pong)
+        dispatcher.map("/amax/loaded", self._on_loaded)
+        dispatcher.map("/amax/done", self._on_done)
+
+        self._server = Server(("127.0.0.1", 0), dispatcher)
+        self._server.daemon_threads = True
+        self.reply_port = self._server.server_address[1]
+        self._stop.clear()
+
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.1},
+                             name="AudioMaxOSCReplies", daemon=True),
+            threading.Thread(target=self._maintain, name="AudioMaxHostPool", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        info("Pool de hosts OSC ouvindo em 127.0.0.1:%s", self.reply_port)
+        return self
+
+    def shutdown(self):
+        """
+        Encerra todos os hosts e falha o que estiver pendente.
+        """
+        self._stop.set()
+
+        with self._lock:
+            hosts = list(self.hosts.values())
+            self.hosts.clear()
+            pending = list(self._queue)
+            self._queue.clear()
+
+        for host in hosts:
+            if host.current is not None:
+                pending.append(host.current)
+            host.stop()
+
+        for request in pending:
+            request._finish("Pool encerrado")
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(1.0)
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        return False
+
+    # --- public ---
+
+    def submit(self,
+               input_path: str,
+               output_path: str,
+               plugin_path: str = "",
+               preset_path: str = "",
+               timeout: float = RENDER_TIMEOUT) -> PendingRender:
+        request = PendingRender(input_path, output_path, plugin_path, preset_path, timeout)
+
+        with self._lock:
+            if self.failed:
+                request._finish(self.failed)
+                return request
+
+        self.start()
+
+        with self._lock:
+            self._queue.append(request)
+            self._dispatch()
+
+        return request
+
+    def render(self, input_path: str, output_path: str, plugin_path: str = "", preset_path: str = "",
+               timeout: float = RENDER_TIMEOUT) -> dict:
+        """
+        Versão síncrona de submit().
+        """
+        request = self.submit(input_path, output_path, plugin_path, preset_path, timeout)
+        return request.wait()
+
+    def cancel(self, request: PendingRender):
+        """
+        Cancela uma renderização: sai da fila ou, se já está num host,
+        o host é encerrado (não há como interromper só o render).
+        """
+        host = None
+
+        with self._lock:
+            if request.done:
+                return
+
+            if request in self._queue:
+                self._queue.remove(request)
+            else:
+                host = next((h for h in self.hosts.values() if h.current is request), None)
+                if host is not None:
+                    host.current = None
+                    self._drop(host, requeue=False)
+
+            request._finish("Cancelado", host.port if host else None)
+
+        if host is not None:
+            host.stop()
+
+            with self._lock:
+                self._dispatch()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "hosts": {port: host.state for port, host in self.hosts.items()},
+                "queued": len(self._queue),
+                "failed": self.failed,
+                **self.stats,
+            }
+
+    # --- dispatch ---
+
+    def _spawn(self) -> WarmHost:
+        _, _, Client = _osc()
+        port = free_port()
+
+        template = self.template.replace("{osc_port}", str(port)).replace("{reply_port}", str(self.reply_port))
+        argv = build_argv(template, self.host_path, "", "")
+
+        host = WarmHost(argv, port, Client("127.0.0.1", port))
+        host.start()
+        self.hosts[port] = host
+        self.stats["starts"] += 1
+        debug("Host iniciado na porta %s: %s", port, argv)
+        return host
+
+    def _dispatch(self):
+        """
+        Distribui a fila (com _lock). Hosts em boot recebem trabalho
+        quando mandarem /amax/ready.
+        """
+        while self._queue:
+            idle = [h for h in self.hosts.values() if h.state == READY]
+            if idle:
+                self._send_load(idle[0], self._queue.popleft())
+                continue
+
+            starting = sum(1 for h in self.hosts.values() if h.state == STARTING)
+            if not self.failed and starting < len(self._queue) and len(self.hosts) < self.size:
+                try:
+                    self._spawn()
+                except OSError as e:
+                    request = self._queue.popleft()
+                    request._finish(f"Não foi possível iniciar o host: {e}")
+                    self.stats["failures"] += 1
+                continue
+
+            break
+
+    def _send_load(self, host: WarmHost, request: PendingRender):
+        """
+        Primeiro passo de uma renderização: o host abre a entrada e
+        responde /amax/loaded; só então vem o /amax/render.
+        """
+        request.attempts += 1
+        request.load_sent = time.monotonic()
+        host.state = LOADING
+        host.current = request
+        host.send("/amax/load", request.job_id, request.input_path)
+
+    def _send_render(self, host: WarmHost, request: PendingRender):
+        request.sent = time.monotonic()
+        host.state = BUSY
+        host.send("/amax/render", request.job_id, request.input_path, request.output_path,
+                  request.plugin_path or "", request.preset_path or "")
+
+    # --- replies (thread do servidor OSC) ---
+
+    def _on_ready(self, address, port, *args):
+        with self._lock:
+            host = self.hosts.get(port)
+            if host is None or host.state != STARTING:
+                return
+            host.state = READY
+            host.last_pong = host.last_used = time.monotonic()
+            self._startup_failures = 0
+            info("Host na porta %s pronto em %.1fs", port, host.last_pong - host.started)
+            self._dispatch()
+
+    def _on_pong(self, address, port, *args):
+        with self._lock:
+            host = self.hosts.get(port)
+            if host is not None:
+                host.last_pong = time.monotonic()
+
+    def _on_loaded(self, address, port, job_id, status=0, *args):
+        with self._lock:
+            host = self.hosts.get(port)
+            if (host is None or host.state != LOADING
+                    or host.current is None or host.current.job_id != job_id):
+                return
+
+            host.last_pong = time.monotonic()
+            if status == 0:
+                self._send_render(host, host.current)
+                return
+
+            # Entrada recusada: não adianta tentar em outro host
+            request = host.current
+            host.current = None
+            host.state = READY
+            host.last_used = time.monotonic()
+            self.stats["failures"] += 1
+            request._finish(f"Host não conseguiu abrir {os.path.basename(request.input_path)} "
+                            f"(status {status})", port)
+            self._dispatch()
+
+    def _on_done(self, address, port, job_id, status=0, message="", *args):
+        with self._lock:
+            host = self.hosts.get(port)
+            if (host is None or host.state != BUSY
+                    or host.current is None or host.current.job_id != job_id):
+                return
+
+            request = host.current
+            host.current = None
+            host.state = READY
+            host.renders += 1
+            host.last_used = host.last_pong = time.monotonic()
+
+            self.stats["renders"] += 1
+            if status != 0:
+                self.stats["failures"] += 1
+
+            request._finish(None if status == 0 else (message or f"Host retornou status {status}"), port)
+            self._dispatch()
+
+    # --- health ---
+
+    def _maintain(self):
+        while not self._stop.wait(self.health_interval):
+            try:
+                self._check_hosts()
+            except Exception as e:
+                error("Health check do pool falhou: %s", e)
+
+    def _check_hosts(self):
+        now = time.monotonic()
+        to_stop = []
+
+        with self._lock:
+            for port, host in list(self.hosts.items()):
+                problem = self._host_problem(host, now)
+
+                if problem:
+                    self._drop(host, requeue=True)
+                    to_stop.append(host)
+
+                    if host.state == STARTING:
+                        self._startup_failures += 1
+                        self.stats["startup_failures"] += 1
+                        if self._startup_failures >= MAX_STARTUP_FAILURES:
+                            self._fail(f"{self._startup_failures} hosts seguidos falharam ao iniciar "
+                                       f"({problem})")
+                            continue
+
+                    error("Host na porta %s: %s; reiniciando", port, problem)
+                    self.stats["restarts"] += 1
+                    continue
+
+                if host.state == READY and now - host.last_used > self.idle_timeout:
+                    info("Host na porta %s ocioso; encerrando", port)
+                    self._drop(host, requeue=False)
+                    to_stop.append(host)
+                    self.stats["idle_stops"] += 1
+                    continue
+
+                if host.state in (READY, LOADING, BUSY):
+                    host.send("/amax/ping", int(now * 1000) & 0x7FFFFFFF)
+
+            self._expire_queued(now)
+            self._dispatch()
+
+        for host in to_stop:
+            host.stop()
+
+    def _host_problem(self, host: WarmHost, now: float):
+        if not host.alive:
+            return "processo encerrado"
+
+        if host.state == STARTING:
+            if now - host.started > self.startup_timeout:
+                return "não respondeu ao iniciar"
+            return None
+
+        if host.last_pong is not None and now - host.last_pong > max(PING_TIMEOUT, self.health_interval * 3):
+            return "sem resposta ao ping"
+
+        request = host.current
+        if request is not None and _expired(request, now):
+            return "renderização excedeu o tempo limite"
+
+        if (host.state == LOADING and self.load_timeout
+                and now - request.load_sent > self.load_timeout):
+            return "não confirmou o carregamento (/amax/loaded)"
+
+        return None
+
+    def _expire_queued(self, now: float):
+        """
+        Falha (com _lock) as renderizações que estouraram o prazo ainda
+        na fila, esperando um host.
+        """
+        expired = [r for r in self._queue if _expired(r, now)]
+        for request in expired:
+            self._queue.remove(request)
+            self.stats["failures"] += 1
+            request._finish("Tempo limite excedido esperando um host")
+
+    def _fail(self, message: str):
+        """
+        Marca o pool como falho (com _lock) e falha tudo que está na fila.
+        Hosts ainda vivos terminam o que estão fazendo.
+        """
+        self.failed = message
+        error("Pool de hosts desativado: %s", message)
+
+        pending = list(self._queue)
+        self._queue.clear()
+        for request in pending:
+            self.stats["failures"] += 1
+            request._finish(message)
+
+    def _drop(self, host: WarmHost, requeue: bool):
+        """
+        Tira o host do pool (com _lock). A renderização em andamento volta
+        para a frente da fila, até MAX_ATTEMPTS.
+        """
+        self.hosts.pop(host.port, None)
+        request, host.current = host.current, None
+
+        if request is None:
+            return
+
+        expired = _expired(request, time.monotonic())
+        if requeue and request.attempts < MAX_ATTEMPTS and not expired:
+            self._queue.appendleft(request)
+        else:
+            self.stats["failures"] += 1
+            request._finish("Tempo limite excedido" if expired else "Host caiu durante a renderização",
+                            host.port)
+
+
+def _expired(request: PendingRender, now: float) -> bool:
+    return bool(request.timeout) and now - request.submitted > request.timeout
+
+
+# -------------------------------------------------
+# DEFAULT POOLS
+# -------------------------------------------------
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_host_pool(host_path: str, **options) -> HostPool:
+    """
+    Um pool por executável de host, compartilhado pelo addon.
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.get(host_path)
+        if pool is None:
+            pool = _POOLS[host_path] = HostPool(host_path, **options)
+        return pool
+
+
+def shutdown_pools():
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+
+    for pool in pools:
+        pool.shutdown()
+
+
+def standin_pool(size: int = 2, **options) -> HostPool:
+    """
+    Pool com o host de teste (osc_standin.py), para testes sem DAW.
+    """
+    delay = options.pop("delay", 0.0)
+    startup = options.pop("startup", 0.0)
+    return HostPool(sys.executable, standin_template(delay, startup), size=size, **options)
@@ -0,0 +1,89 @@
+"""
+Host falso que fala o protocolo OSC do osc_pool, para testes e
+desenvolvimento sem uma DAW instalada. "Renderizar" = copiar a entrada
+para a saída (com atraso opcional).
+
+Roda como script independente (sem imports relativos), para poder ser
+iniciado pelo HostPool com qualquer Python:
+
+    python osc_standin.py --port 9001 --reply-port 9000 [--delay 0.5] [--fail]
+"""
+import argparse
+import os
+import shutil
+import sys
+import threading
+import time
+
+
+def _add_wheels():
+    libs = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "libs")
+    if os.path.isdir(libs):
+        for name in sorted(os.listdir(libs)):
+            path = os.path.join(libs, name)
+            if name.endswith(".whl") and path not in sys.path:
+                sys.path.append(path)
+
+
+def serve(port: int, reply_port: int, delay: float = 0.0, fail: bool = False, startup: float = 0.0):
+    _add_wheels()
+    from pythonosc.dispatcher import Dispatcher
+    from pythonosc.osc_server import ThreadingOSCUDPServer
+    from pythonosc.udp_client import SimpleUDPClient
+
+    reply = SimpleUDPClient("127.0.0.1", reply_port)
+    send_lock = threading.Lock()
+
+    def send(address, *args):
+        with send_lock:
+            reply.send_message(address, [port, *args])
+
+    def on_ping(address, token=0):
+        send("/amax/pong", token)
+
+    def on_load(address, job_id, path):
+        send("/amax/loaded", job_id, 0 if os.path.exists(path) else 1)
+
+    def on_render(address, job_id, input_path, output_path, plugin="", preset=""):
+        time.sleep(delay)
+        try:
+            if fail:
+                raise RuntimeError("falha simulada")
+            shutil.copyfile(input_path, output_path)
+            send("/amax/done", job_id, 0, "")
+        except Exception as e:
+            send("/amax/done", job_id, 1, str(e))
+
+    dispatcher = Dispatcher()
+    dispatcher.map("/amax/ping", on_ping)
+    dispatcher.map("/amax/load", on_load)
+    dispatcher.map("/amax/render", on_render)
+
+    server = ThreadingOSCUDPServer(("127.0.0.1", port), dispatcher)
+    server.daemon_threads = True
+    dispatcher.map("/amax/quit", lambda address, *args: threading.Thread(target=server.shutdown).start())
+
+    # Simula o tempo de boot de uma DAW
+    time.sleep(startup)
+    send("/amax/ready")
+
+    try:
+        server.serve_forever(poll_interval=0.1)
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host OSC de teste do Audio Max")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--reply-port", type=int, required=True)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--startup", type=float, default=0.0)
+    parser.add_argument("--fail", action="store_true")
+    args = parser.parse_args(argv)
+
+    serve(args.port, args.reply_port, args.delay, args.fail, args.startup)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+import os
+import subprocess
+import tempfile
+import time
+from collections import deque
+
+from .command_builder import build_argv, get_default_template
+from .osc_pool import get_host_pool, registered_osc_template
+from ..utils.logging import info, error
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+DEFAULT_TIMEOUT = 300.0
+POLL_INTERVAL = 0.05
+
+# Tempo entre terminate() e kill() ao encerrar um host
+KILL_GRACE = 2.0
+
+# Quanto do stderr de cada processo é guardado no resultado
+STDERR_TAIL = 4096
+
+
+def default_workers() -> int:
+    """
+    Hosts de áudio são pesados: metade dos núcleos, no mínimo 1.
+    """
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+# -------------------------------------------------
+# TASK
+# -------------------------------------------------
+
+class RenderTask:
+    """
+    Uma renderização por um host externo (Carla, REAPER...).
+
+    template: template do command_builder (padrão: get_default_template)
+    osc_template: se houver (padrão: o registrado com set_osc_template),
+        a tarefa vai para o HostPool do host em vez de abrir um processo
+    temp_inputs: arquivos temporários apagados quando a tarefa termina
+    """
+
+    def __init__(self,
+                 host_path: str,
+                 input_path: str,
+                 output_path: str,
+                 template: str = None,
+                 plugin_path: str = "",
+                 preset_path: str = "",
+                 timeout: float = None,
+                 temp_inputs=(),
+                 osc_template: str = None):
+        self.host_path = host_path
+        self.input_path = input_path
+        self.output_path = output_path
+        self.template = template or get_default_template(host_path)
+        self.plugin_path = plugin_path
+        self.preset_path = preset_path
+        self.timeout = timeout
+        self.temp_inputs = list(temp_inputs)
+        self.osc_template = osc_template or registered_osc_template(host_path)
+
+    def argv(self) -> list:
+        return build_argv(
+            self.template,
+            self.host_path,
+            self.input_path,
+            self.output_path,
+            self.plugin_path,
+            self.preset_path,
+        )
+
+
+class _Running:
+
+    def __init__(self, index: int, task: RenderTask, proc, stderr, started: float):
+        self.index = index
+        self.task = task
+        self.proc = proc
+        self.stderr = stderr
+        self.started = started
+        self.killed_at = None
+
+
+class _Pooled:
+
+    def __init__(self, index: int, task: RenderTask, pool, request):
+        self.index = index
+        self.task = task
+        self.pool = pool
+        self.request = request
+
+
+# -------------------------------------------------
+# RUNNER
+# -------------------------------------------------
+
+class RenderRunner:
+    """
+    Executa até `workers` processos de host em paralelo, sem threads:
+    poll() lança, acompanha e coleta os processos. Pode ser chamado por
+    um timer/modal (não bloqueia) ou em loop por run() em scripts.
+    Tarefas com osc_template vão para o HostPool do host (processo já
+    aberto) e ocupam um worker até o pool responder.
+
+    Cada resultado:
+    {"index", "input", "output", "returncode", "stderr", "error",
+     "timed_out", "seconds"}
+    """
+
+    def __init__(self, workers: int = None, timeout: float = DEFAULT_TIMEOUT, max_queued: int = None):
+        self.workers = workers or default_workers()
+        self.timeout = timeout
+        self.max_queued = max_queued if max_queued is not None else self.workers * 2
+
+        self.results = []
+        self._queue = deque()
+        self._running = []
+        self._pooled = []
+        self._submitted = 0
+        self._cancelled = False
+
+    # --- submit ---
+
+    @property
+    def full(self) -> bool:
+        """
+        Backpressure: True quando a fila interna já tem max_queued tarefas.
+        """
+        return len(self._queue) >= self.max_queued
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue) + len(self._running) + len(self._pooled)
+
+    @property
+    def done(self) -> int:
+        return len(self.results)
+
+    def submit(self, task: RenderTask) -> bool:
+        """
+        Enfileira uma tarefa. Retorna False (e não enfileira) se a fila
+        estiver cheia — chame poll() e tente de novo.
+        """
+        if self.full:
+            return False
+
+        self._queue.append((self._submitted, task))
+        self._submitted += 1
+        return True
+
+    # --- execution ---
+
+    def poll(self) -> list:
+        """
+        Coleta processos terminados, aplica timeouts e inicia novos até
+        `workers`. Retorna os resultados que ficaram prontos nesta chamada.
+        """
+        finished = []
+        now = time.monotonic()
+
+        for running in list(self._running):
+            if running.proc.poll() is not None:
+                self._running.remove(running)
+                finished.append(self._collect(running, now))
+                continue
+
+            self._enforce_timeout(running, now)
+
+        for pooled in list(self._pooled):
+            if pooled.request.done:
+                self._pooled.remove(pooled)
+                finished.append(self._collect_pooled(pooled))
+
+        while (not self._cancelled and self._queue
+               and len(self._running) + len(self._pooled) < self.workers):
+            index, task = self._queue.popleft()
+            started = self._launch(index, task)
+            if isinstance(started, dict):
+                finished.append(started)
+            elif isinstance(started, _Pooled):
+                self._pooled.append(started)
+            else:
+                self._running.append(started)
+
+        self.results.extend(finished)
+        return finished
+
+    def cancel(self):
+        """
+        Descarta a fila e encerra os processos em andamento.
+        """
+        self._cancelled = True
+        now = time.monotonic()
+
+        while self._queue:
+            index, task = self._queue.popleft()
+            self.results.append(self._result(index, task, None, "Cancelado", 0.0))
+            _cleanup(task)
+
+        for pooled in self._pooled:
+            pooled.pool.cancel(pooled.request)
+
+        for running in self._running:
+            _terminate(running, now)
+
+        for running in self._running:
+            try:
+                running.proc.wait(KILL_GRACE)
+            except subprocess.TimeoutExpired:
+                running.proc.kill()
+                running.proc.wait()
+
+        self.poll()
+
+    def wait(self):
+        while self.pending:
+            self.poll()
+            time.sleep(POLL_INTERVAL)
+
+    def run(self, tasks, progress=None) -> list:
+        """
+        Uso em scripts: consome `tasks` (lista ou gerador) respeitando a
+        fila limitada e bloqueia até o fim. Resultados na ordem das tarefas.
+
+        progress: callback(done, submitted, result)
+        """
+        tasks = iter(tasks)
+        exhausted = False
+
+        while True:
+            while not exhausted and not self.full:
+                task = next(tasks, None)
+                if task is None:
+                    exhausted = True
+                    break
+                self.submit(task)
+
+            for result in self.poll():
+                if progress:
+                    progress(self.done, self._submitted, result)
+
+            if exhausted and not self.pending:
+                break
+
+            time.sleep(POLL_INTERVAL)
+
+        return sorted(self.results, key=lambda r: r["index"])
+
+    # --- internal ---
+
+    def _launch(self, index: int, task: RenderTask):
+        if task.osc_template:
+            return self._launch_pooled(index, task)
+
+        started = time.monotonic()
+        stderr = None
+
+        try:
+            argv = task.argv()
+            out_dir = os.path.dirname(task.output_path)
+            if out_dir:
+                os.makedirs(out_dir, exist_ok=True)
+
+            stderr = tempfile.TemporaryFile()
+            proc = subprocess.Popen(
+                argv,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr,
+            )
+        except (OSError, ValueError) as e:
+            # Popen falhou (executável ausente, argv inválido): o arquivo
+            # de stderr não vai para nenhum _Running, fecha aqui
+            if stderr is not None:
+                stderr.close()
+            _cleanup(task)
+            return self._result(index, task, None, f"{type(e).__name__}: {e}", 0.0)
+
+        info("Render #%s: %s -> %s", index,
+             os.path.basename(task.host_path), os.path.basename(task.output_path))
+        return _Running(index, task, proc, stderr, started)
+
+    def _launch_pooled(self, index: int, task: RenderTask):
+        try:
+            out_dir = os.path.dirname(task.output_path)
+            if out_dir:
+                os.makedirs(out_dir, exist_ok=True)
+
+            pool = get_host_pool(task.host_path, template=task.osc_template)
+            request = pool.submit(task.input_path, task.output_path, task.plugin_path,
+                                  task.preset_path, task.timeout or self.timeout)
+        except (OSError, ValueError) as e:
+            _cleanup(task)
+            return self._result(index, task, None, f"{type(e).__name__}: {e}", 0.0)
+
+        info("Render #%s (pool OSC): %s -> %s", index,
+             os.path.basename(task.host_path), os.path.basename(task.output_path))
+        return _Pooled(index, task, pool, request)
+
+    def _enforce_timeout(self, running: _Running, now: float):
+        timeout = running.task.timeout or self.timeout
+        if running.killed_at is None:
+            if timeout and now - running.started > timeout:
+                _terminate(running, now)
+        elif now - running.killed_at > KILL_GRACE:
+            running.proc.kill()
+
+    def _collect(self, running: _Running, now: float) -> dict:
+        task = running.task
+        code = running.proc.returncode
+        stderr = _read_tail(running.stderr)
+
+        if running.killed_at is not None:
+            message = "Cancelado" if self._cancelled else "Tempo esgotado"
+        elif code != 0:
+            message = f"Host saiu com código {code}"
+        elif not _valid_output(task.output_path):
+            message = "Host terminou sem gerar o arquivo de saída"
+        else:
+            message = None
+
+        result = self._result(running.index, task, code, message, now - running.started, stderr)
+        result["timed_out"] = running.killed_at is not None and not self._cancelled
+
+        if message:
+            error("Render #%s falhou: %s", running.index, message)
+
+        _cleanup(task)
+        return result
+
+    def _collect_pooled(self, pooled: _Pooled) -> dict:
+        task = pooled.task
+        reply = pooled.request.result
+        message = reply["error"]
+
+        result = self._result(pooled.index, task, 0 if message is None else None, message, reply["seconds"])
+        result["timed_out"] = bool(message) and message.startswith("Tempo limite")
+
+        if message:
+            error("Render #%s falhou: %s", pooled.index, message)
+
+        _cleanup(task)
+        return result
+
+    def _result(self, index, task, code, message, seconds, stderr="") -> dict:
+        return {
+            "index": index,
+            "input": task.input_path,
+            "output": task.output_path if message is None else None,
+            "returncode": code,
+            "stderr": stderr,
+            "error": message,
+            "timed_out": False,
+            "seconds": seconds,
+        }
+
+
+# -------------------------------------------------
+# HELPERS
+# -------------------------------------------------
+
+def _terminate(running: _Running, now: float):
+    if running.killed_at is None and running.proc.poll() is None:
+        running.proc.terminate()
+    running.killed_at = running.killed_at or now
+
+
+def _read_tail(handle) -> str:
+    try:
+        handle.seek(0, os.SEEK_END)
+        size = handle.tell()
+        handle.seek(max(0, size - STDERR_TAIL))
+        return handle.read().decode("utf-8", "ignore").strip()
+    finally:
+        handle.close()
+
+
+def _valid_output(path: str) -> bool:
+    try:
+        return os.path.getsize(path) > 0
+    except OSError:
+        return False
+
+
+def _cleanup(task: RenderTask):
+    for path in task.temp_inputs:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def run_renders(tasks, workers: int = None, timeout: float = DEFAULT_TIMEOUT, progress=None) -> list:
+    """
+    Atalho para scripts headless: roda tudo e retorna os resultados em ordem.
+    """
+    return RenderRunner(workers, timeout).run(tasks, progress)
+
+
+# -------------------------------------------------
+# JOB (UI)
+# -------------------------------------------------
+
+def create_render_job(tasks: list, workers: int = None, timeout: float = DEFAULT_TIMEOUT, name: str = "Render externo"):
+    """
+    Job para a fila de core.jobs: o runner avança a cada tick, sem
+    bloquear a interface. Cancelar o job encerra os hosts.
+    Resultado final em job.data["Render"].
+    """
+    from ..core.jobs import Job, Stage
+
+    tasks = list(tasks)
+
+    def render(job):
+        runner = RenderRunner(workers, timeout)
+        pending = iter(tasks)
+        total = len(tasks) or 1
+        exhausted = False
+
+        try:
+            while not exhausted or runner.pending:
+                job.check_cancelled()
+
+                while not exhausted and not runner.full:
+                    task = next(pending, None)
+                    if task is None:
+                        exhausted = True
+                        break
+                    runner.submit(task)
+
+                runner.poll()
+                yield runner.done / total
+        finally:
+            if runner.pending:
+                runner.cancel()
+
+        return sorted(runner.results, key=lambda r: r["index"])
+
+    return Job(name, [Stage("Render", render)], {"kind": "render"})
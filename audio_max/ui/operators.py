@@ -1,10 +1,17 @@
 # operators.py
 import bpy
 import os
-import subprocess
 from ..core import global_cache
+from ..core.jobs import get_job_queue, DONE, FAILED, FINISHED_STATES
 from ..utils.paths import get_temp_dir
-from ..utils.logging import info, error
+from ..utils.logging import info, error, clear_recent
+from ..utils import profiling
+
+
+JOB_TICK_INTERVAL = 0.1
+DISCOVERY_POLL_INTERVAL = 0.25
+
+_discovery_version = -1
 
 
 # -------------------------------------------------
@@ -45,6 +52,95 @@ def _vse_is_ready(operator, context):
     return True
 
 
+# -------------------------------------------------
+# JOB QUEUE — avançada por bpy.app.timers
+# -------------------------------------------------
+def _tick_jobs():
+    queue = get_job_queue()
+    wm = bpy.context.window_manager
+    window = wm.windows[0] if wm and wm.windows else None
+
+    try:
+        if window is not None:
+            # Etapas na thread principal (mixdown) precisam de contexto de janela
+            with bpy.context.temp_override(window=window):
+                busy = queue.tick()
+        else:
+            busy = queue.tick()
+    except Exception as e:
+        error("Erro na fila de jobs: %s", e)
+        busy = queue.busy
+
+    return JOB_TICK_INTERVAL if busy else None
+
+
+def ensure_job_timer():
+    if not bpy.app.timers.is_registered(_tick_jobs):
+        bpy.app.timers.register(_tick_jobs, first_interval=0.0)
+
+
+def shutdown_jobs():
+    queue = get_job_queue()
+    for job in queue.jobs:
+        job.cancel()
+
+    if bpy.app.timers.is_registered(_tick_jobs):
+        bpy.app.timers.unregister(_tick_jobs)
+
+
+# -------------------------------------------------
+# DAW DISCOVERY — roda em thread; o timer só redesenha
+# -------------------------------------------------
+def _redraw_panels():
+    wm = bpy.context.window_manager
+    if not wm:
+        return
+
+    for window in wm.windows:
+        for area in window.screen.areas:
+            if area.type in {'SEQUENCE_EDITOR', 'VIEW_3D'}:
+                area.tag_redraw()
+
+
+def _watch_discovery():
+    global _discovery_version
+
+    version = global_cache.get_version()
+    if version != _discovery_version:
+        _discovery_version = version
+        _redraw_panels()
+
+    return DISCOVERY_POLL_INTERVAL if global_cache.is_discovering() else None
+
+
+def start_host_discovery():
+    global_cache.start_discovery()
+    if not bpy.app.timers.is_registered(_watch_discovery):
+        bpy.app.timers.register(_watch_discovery, first_interval=DISCOVERY_POLL_INTERVAL)
+
+
+def ensure_host_discovery():
+    """
+    A detecção roda na primeira vez que um painel precisa dos hosts,
+    não no register(): abrir o Blender não paga a varredura.
+    """
+    if global_cache.get_discovery_state() == global_cache.IDLE:
+        start_host_discovery()
+
+
+def stop_host_discovery():
+    global_cache.cancel_discovery()
+    if bpy.app.timers.is_registered(_watch_discovery):
+        bpy.app.timers.unregister(_watch_discovery)
+
+
+def _redraw_sequencer(context):
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'SEQUENCE_EDITOR':
+                area.tag_redraw()
+
+
 # -------------------------------------------------
 # ANALYZE AUDIO OPERATOR
 # -------------------------------------------------
@@ -72,12 +168,31 @@ class AUDIOMAX_OT_ConvertVSEAudio(bpy.types.Operator):
         items=[("WAV", "WAV", ""), ("MP3", "MP3", "")]
     )
 
+    post_process: bpy.props.EnumProperty(
+        name="Post-process",
+        description="Processing applied in the background after export",
+        items=[("NONE", "None", ""), ("NORMALIZE", "Normalize", ""),
+               ("LOUDNESS", "Loudness (EBU R128)", "Integrated loudness to the target, capped at -1 dBTP")]
+    )
+
+    loudness_target: bpy.props.FloatProperty(
+        name="Target (LUFS)",
+        description="Integrated loudness target for the Loudness post-process",
+        default=-23.0, min=-40.0, max=-5.0,
+    )
+
+    incremental: bpy.props.BoolProperty(
+        name="Incremental",
+        description="Re-render only the parts of the timeline that changed since the last export",
+        default=False,
+    )
+
     def invoke(self, context, event):
         return context.window_manager.invoke_props_dialog(self)
 
     def execute(self, context):
         # Lazy import para evitar circular import
-        from ..core.audio_export import export_vse_audio, has_audio_in_vse
+        from ..core.audio_export import create_export_job, has_audio_in_vse
 
         if not _vse_is_ready(self, context):
             return {'CANCELLED'}
@@ -86,15 +201,336 @@ class AUDIOMAX_OT_ConvertVSEAudio(bpy.types.Operator):
             self.report({'ERROR'}, "Nenhum strip de áudio encontrado no VSE. O vídeo tem faixa de áudio?")
             return {'CANCELLED'}
 
-        audio_file = export_vse_audio(format=self.audio_format.lower())
-        if not audio_file:
-            self.report({'ERROR'}, "Falha ao exportar o áudio")
+        steps = None
+        if self.post_process == 'NORMALIZE':
+            from ..core.audio_processing import normalize
+            steps = [normalize]
+        elif self.post_process == 'LOUDNESS':
+            from ..core.audio_processing import normalize_loudness
+            steps = [(normalize_loudness, (), {"target": self.loudness_target})]
+
+        # Exportação roda na fila em segundo plano; o monitor mostra
+        # progresso no painel e abre o popup da DAW no final.
+        job = get_job_queue().submit(
+            create_export_job(self.audio_format, steps=steps, incremental=self.incremental)
+        )
+        ensure_job_timer()
+        bpy.ops.audiomax.job_monitor('INVOKE_DEFAULT')
+
+        self.report({'INFO'}, f"Exportação na fila (job #{job.id})")
+        return {'FINISHED'}
+
+
+# -------------------------------------------------
+# MULTI-FORMAT EXPORT (um render, vários encodes)
+# -------------------------------------------------
+SAMPLE_RATE_ITEMS = [
+    ("44100", "44.1 kHz", ""),
+    ("48000", "48 kHz", ""),
+    ("88200", "88.2 kHz", ""),
+    ("96000", "96 kHz", ""),
+]
+
+# MP3 não passa de 48 kHz (core.export_targets.MP3_SAMPLE_RATES)
+LOSSY_RATE_ITEMS = [item for item in SAMPLE_RATE_ITEMS if int(item[0]) <= 48000]
+
+
+class AUDIOMAX_OT_ExportVSEFormats(bpy.types.Operator):
+    bl_idname = "audiomax.export_vse_formats"
+    bl_label = "Export Multiple Formats"
+    bl_description = "Render the timeline once and encode every selected format in parallel"
+
+    formats: bpy.props.EnumProperty(
+        name="Formats",
+        items=[("WAV", "WAV", ""), ("FLAC", "FLAC", ""), ("MP3", "MP3", ""), ("OGG", "OGG", "")],
+        options={'ENUM_FLAG'},
+        default={'WAV', 'MP3'},
+    )
+
+    wav_rate: bpy.props.EnumProperty(name="WAV Rate", items=SAMPLE_RATE_ITEMS, default="48000")
+    wav_depth: bpy.props.EnumProperty(
+        name="WAV Depth",
+        items=[("16", "16 bit", ""), ("24", "24 bit", ""), ("32", "32 bit", ""), ("FLOAT", "32 bit float", "")],
+        default="24",
+    )
+
+    flac_rate: bpy.props.EnumProperty(name="FLAC Rate", items=SAMPLE_RATE_ITEMS, default="48000")
+    flac_depth: bpy.props.EnumProperty(
+        name="FLAC Depth",
+        items=[("16", "16 bit", ""), ("24", "24 bit", "")],
+        default="24",
+    )
+
+    lossy_rate: bpy.props.EnumProperty(name="MP3/OGG Rate", items=LOSSY_RATE_ITEMS, default="44100")
+    bitrate: bpy.props.EnumProperty(
+        name="MP3/OGG Bitrate",
+        items=[("128k", "128 kbps", ""), ("192k", "192 kbps", ""), ("256k", "256 kbps", ""), ("320k", "320 kbps", "")],
+        default="192k",
+    )
+
+    incremental: bpy.props.BoolProperty(
+        name="Incremental",
+        description="Re-render only the parts of the timeline that changed since the last export",
+        default=False,
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "formats")
+
+        if 'WAV' in self.formats:
+            row = layout.row()
+            row.prop(self, "wav_rate")
+            row.prop(self, "wav_depth")
+        if 'FLAC' in self.formats:
+            row = layout.row()
+            row.prop(self, "flac_rate")
+            row.prop(self, "flac_depth")
+        if self.formats & {'MP3', 'OGG'}:
+            row = layout.row()
+            row.prop(self, "lossy_rate")
+            row.prop(self, "bitrate")
+
+        layout.prop(self, "incremental")
+
+    def targets(self) -> list:
+        targets = []
+
+        for fmt in ("WAV", "FLAC", "MP3", "OGG"):
+            if fmt not in self.formats:
+                continue
+            if fmt == "WAV":
+                is_float = self.wav_depth == "FLOAT"
+                targets.append({"format": fmt, "sample_rate": int(self.wav_rate), "float": is_float,
+                                "bit_depth": 32 if is_float else int(self.wav_depth)})
+            elif fmt == "FLAC":
+                targets.append({"format": fmt, "sample_rate": int(self.flac_rate),
+                                "bit_depth": int(self.flac_depth)})
+            else:
+                targets.append({"format": fmt, "sample_rate": int(self.lossy_rate), "bitrate": self.bitrate})
+
+        return targets
+
+    def execute(self, context):
+        from ..core.audio_export import create_multi_export_job, has_audio_in_vse
+
+        if not self.formats:
+            self.report({'ERROR'}, "Selecione ao menos um formato")
+            return {'CANCELLED'}
+
+        if not _vse_is_ready(self, context):
+            return {'CANCELLED'}
+
+        if not has_audio_in_vse():
+            self.report({'ERROR'}, "Nenhum strip de áudio encontrado no VSE. O vídeo tem faixa de áudio?")
+            return {'CANCELLED'}
+
+        try:
+            job = create_multi_export_job(self.targets(), incremental=self.incremental)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        job = get_job_queue().submit(job)
+        ensure_job_timer()
+        bpy.ops.audiomax.job_monitor('INVOKE_DEFAULT')
+
+        self.report({'INFO'}, f"Exportação na fila (job #{job.id})")
+        return {'FINISHED'}
+
+
+# -------------------------------------------------
+# JOB MONITOR (modal) — ESC cancela o job ativo
+# -------------------------------------------------
+class AUDIOMAX_OT_JobMonitor(bpy.types.Operator):
+    bl_idname = "audiomax.job_monitor"
+    bl_label = "Audio Max Jobs"
+    bl_description = "Track background jobs (ESC cancels the active job)"
+
+    _running = False
+
+    def invoke(self, context, event):
+        if AUDIOMAX_OT_JobMonitor._running:
             return {'CANCELLED'}
 
-        self.report({'INFO'}, f"Áudio exportado: {audio_file}")
-        info(f"Áudio exportado: {audio_file}")
+        ensure_job_timer()
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.25, window=context.window)
+        wm.modal_handler_add(self)
+        AUDIOMAX_OT_JobMonitor._running = True
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        queue = get_job_queue()
+
+        if event.type == 'ESC' and event.value == 'PRESS' and queue.active:
+            queue.cancel()
+            self.report({'WARNING'}, "Job cancelado")
+            return {'RUNNING_MODAL'}
+
+        if event.type == 'TIMER':
+            _redraw_sequencer(context)
+            self._notify_finished(queue)
+
+            if not queue.busy:
+                self._stop(context)
+                return {'FINISHED'}
 
-        bpy.ops.audiomax.send_daw_popup('INVOKE_DEFAULT', audio_file=audio_file)
+        return {'PASS_THROUGH'}
+
+    def cancel(self, context):
+        self._stop(context)
+
+    def _stop(self, context):
+        context.window_manager.event_timer_remove(self._timer)
+        AUDIOMAX_OT_JobMonitor._running = False
+        _redraw_sequencer(context)
+
+    def _notify_finished(self, queue):
+        for job in queue.jobs:
+            if job.state not in FINISHED_STATES or job.data.get("notified"):
+                continue
+            job.data["notified"] = True
+
+            if job.state == FAILED:
+                self.report({'ERROR'}, f"{job.name}: {job.error}")
+                continue
+
+            if job.state != DONE or job.data.get("kind") != "export":
+                continue
+
+            audio_file = job.data.get("audio_file")
+            self.report({'INFO'}, f"Áudio exportado: {audio_file}")
+
+            if not job.data.get("daw_path"):
+                bpy.ops.audiomax.send_daw_popup('INVOKE_DEFAULT', audio_file=audio_file)
+
+
+# -------------------------------------------------
+# CANCEL / CLEAR JOBS
+# -------------------------------------------------
+class AUDIOMAX_OT_CancelJob(bpy.types.Operator):
+    bl_idname = "audiomax.cancel_job"
+    bl_label = "Cancel Job"
+    bl_description = "Cancel a queued or running job"
+
+    job_id: bpy.props.IntProperty()
+
+    def execute(self, context):
+        get_job_queue().cancel(self.job_id)
+        ensure_job_timer()
+        return {'FINISHED'}
+
+
+class AUDIOMAX_OT_ClearJobs(bpy.types.Operator):
+    bl_idname = "audiomax.clear_jobs"
+    bl_label = "Clear Finished Jobs"
+    bl_description = "Remove finished jobs from the list"
+
+    def execute(self, context):
+        get_job_queue().clear_finished()
+        _redraw_sequencer(context)
+        return {'FINISHED'}
+
+
+# -------------------------------------------------
+# RECENT LOG
+# -------------------------------------------------
+class AUDIOMAX_OT_ClearLog(bpy.types.Operator):
+    bl_idname = "audiomax.clear_log"
+    bl_label = "Clear Log"
+    bl_description = "Clear the recent log view (the log file is kept)"
+
+    def execute(self, context):
+        clear_recent()
+        _redraw_sequencer(context)
+        return {'FINISHED'}
+
+
+# -------------------------------------------------
+# SCRATCH — arquivos temporários (core.scratch)
+# -------------------------------------------------
+class AUDIOMAX_OT_CleanScratch(bpy.types.Operator):
+    bl_idname = "audiomax.clean_scratch"
+    bl_label = "Clean Up"
+    bl_description = "Delete scratch files that no strip uses (recent files are kept)"
+
+    def execute(self, context):
+        from ..core.audio_export import vse_sound_paths
+        from ..core.scratch import get_scratch_store
+
+        store = get_scratch_store()
+        store.sync_references(vse_sound_paths())
+        freed = store.cleanup()
+
+        self.report({'INFO'}, f"{freed / 1e6:.1f} MB liberados")
+        _redraw_sequencer(context)
+        return {'FINISHED'}
+
+
+# -------------------------------------------------
+# PROFILING
+# -------------------------------------------------
+class AUDIOMAX_OT_ToggleProfiling(bpy.types.Operator):
+    bl_idname = "audiomax.toggle_profiling"
+    bl_label = "Toggle Profiling"
+    bl_description = "Start or stop timing of AudioMax operations"
+
+    memory: bpy.props.BoolProperty(
+        name="Track Memory",
+        description="Also record peak memory with tracemalloc (slower)",
+        default=False,
+    )
+
+    def execute(self, context):
+        if profiling.is_enabled():
+            profiling.disable()
+            info("Profiling desligado")
+        else:
+            profiling.enable(memory=self.memory)
+            info("Profiling ligado" + (" (com memória)" if self.memory else ""))
+
+        _redraw_sequencer(context)
+        return {'FINISHED'}
+
+
+class AUDIOMAX_OT_ResetProfiling(bpy.types.Operator):
+    bl_idname = "audiomax.reset_profiling"
+    bl_label = "Reset Profiling"
+    bl_description = "Discard recorded timings"
+
+    def execute(self, context):
+        profiling.reset()
+        _redraw_sequencer(context)
+        return {'FINISHED'}
+
+
+class AUDIOMAX_OT_ExportTrace(bpy.types.Operator):
+    bl_idname = "audiomax.export_trace"
+    bl_label = "Export Trace"
+    bl_description = "Save recorded spans as Chrome trace JSON (chrome://tracing, Perfetto)"
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = os.path.join(get_temp_dir(), "audiomax_trace.json")
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        path = bpy.path.ensure_ext(self.filepath, ".json")
+        try:
+            profiling.export_chrome_trace(path)
+        except OSError as e:
+            self.report({'ERROR'}, f"Não foi possível salvar o trace: {e}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Trace salvo em {path}")
         return {'FINISHED'}
 
 
@@ -118,6 +554,8 @@ class AUDIOMAX_OT_SendAudioToDAW(bpy.types.Operator):
             self.report({'ERROR'}, f"DAW não encontrada: {self.daw_path}")
             return {'CANCELLED'}
 
+        import subprocess
+
         try:
             subprocess.Popen([self.daw_path, self.audio_file])
             info(f"Áudio enviado para {self.daw_path}")
@@ -167,8 +605,12 @@ class AUDIOMAX_OT_SelectDAW(bpy.types.Operator):
 
     def draw(self, context):
         layout = self.layout
+        ensure_host_discovery()
         daw_paths = global_cache.get_cached_daws()
 
+        if global_cache.is_discovering():
+            layout.label(text="Searching for DAWs...", icon="TIME")
+
         if daw_paths:
             layout.label(text="Installed DAWs detected:")
             for path in daw_paths:
@@ -177,7 +619,7 @@ class AUDIOMAX_OT_SelectDAW(bpy.types.Operator):
                 op = row.operator("audiomax.send_audio_to_daw", text=daw_name)
                 op.daw_path = path
                 op.audio_file = self.audio_file
-        else:
+        elif not global_cache.is_discovering():
             layout.label(text="No DAWs detected")
 
         layout.separator()
@@ -217,6 +659,15 @@ class AUDIOMAX_OT_BrowseDAW(bpy.types.Operator):
 OPERATOR_CLASSES = (
     AUDIOMAX_OT_AnalyzeAudio,
     AUDIOMAX_OT_ConvertVSEAudio,
+    AUDIOMAX_OT_ExportVSEFormats,
+    AUDIOMAX_OT_JobMonitor,
+    AUDIOMAX_OT_CancelJob,
+    AUDIOMAX_OT_ClearJobs,
+    AUDIOMAX_OT_ClearLog,
+    AUDIOMAX_OT_CleanScratch,
+    AUDIOMAX_OT_ToggleProfiling,
+    AUDIOMAX_OT_ResetProfiling,
+    AUDIOMAX_OT_ExportTrace,
     AUDIOMAX_OT_SendAudioToDAW,
     AUDIOMAX_OT_SendDAWPopup,
     AUDIOMAX_OT_SelectDAW,
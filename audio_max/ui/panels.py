@@ -1,7 +1,11 @@
 import bpy
+import time
 
-from ..external.host_priority import get_best_host
 from ..core import global_cache
+from ..core.jobs import get_job_queue, RUNNING, QUEUED, DONE, FINISHED_STATES
+from ..utils import logging as amax_log
+from ..utils import profiling
+from .operators import ensure_host_discovery
 
 
 # -------------------------------------------------
@@ -15,11 +19,13 @@ def draw_main_ui(self, context):
     box = layout.box()
     box.label(text="Host Detection", icon="SOUND")
 
-    hosts = global_cache.get_cached_daws()
-    if hosts:
-        best = get_best_host(hosts)
+    ensure_host_discovery()
+    best = global_cache.get_best_daw()
+    if best:
         # Mostra apenas o nome do executável, não o caminho completo
         box.label(text=f"Best Host: {best}", icon="CHECKBOX_HLT")
+    elif global_cache.is_discovering():
+        box.label(text="Detecting hosts...", icon="TIME")
     else:
         box.label(text="No Host Found", icon="ERROR")
 
@@ -28,6 +34,41 @@ def draw_main_ui(self, context):
     box.operator("audiomax.select_daw", icon="EXPORT")
 
 
+# -------------------------------------------------
+# JOBS — progresso, ETA e cancelamento da fila
+# -------------------------------------------------
+
+def draw_jobs(layout):
+    queue = get_job_queue()
+    if not queue.jobs:
+        return
+
+    box = layout.box()
+    box.label(text="Jobs:", icon="SORTTIME")
+
+    for job in queue.jobs:
+        row = box.row(align=True)
+
+        if job.state == RUNNING:
+            text = f"{job.name} — {job.stage_name}"
+            eta = job.eta
+            if eta is not None:
+                text += f" (~{eta:.0f}s)"
+            row.progress(factor=job.progress, type="BAR", text=text)
+            row.operator("audiomax.cancel_job", text="", icon="X").job_id = job.id
+
+        elif job.state == QUEUED:
+            row.label(text=f"{job.name}: na fila", icon="TIME")
+            row.operator("audiomax.cancel_job", text="", icon="X").job_id = job.id
+
+        else:
+            icon = "CHECKBOX_HLT" if job.state == DONE else "ERROR"
+            row.label(text=f"{job.name}: {job.state} ({job.elapsed:.1f}s)", icon=icon)
+
+    if any(job.state in FINISHED_STATES for job in queue.jobs):
+        box.operator("audiomax.clear_jobs", icon="TRASH")
+
+
 # -------------------------------------------------
 # VIEW 3D PANEL
 # -------------------------------------------------
@@ -60,10 +101,12 @@ class AUDIOMAX_PT_MainPanel(bpy.types.Panel):
         # --- Host Detection ---
         box = layout.box()
         box.label(text="Host Detection", icon="SOUND")
-        hosts = global_cache.get_cached_daws()
-        if hosts:
-            best = get_best_host(hosts)
+        ensure_host_discovery()
+        best = global_cache.get_best_daw()
+        if best:
             box.label(text=f"Best: {best}", icon="CHECKBOX_HLT")
+        elif global_cache.is_discovering():
+            box.label(text="Detecting hosts...", icon="TIME")
         else:
             box.label(text="No Host Found", icon="ERROR")
 
@@ -73,6 +116,9 @@ class AUDIOMAX_PT_MainPanel(bpy.types.Panel):
         box = layout.box()
         box.label(text="Convert Audio from VSE:", icon="SOUND")
         box.operator("audiomax.convert_vse_audio", icon="EXPORT")
+        box.operator("audiomax.export_vse_formats", icon="EXPORT")
+
+        draw_jobs(layout)
 
         layout.separator()
 
@@ -89,6 +135,126 @@ class AUDIOMAX_PT_MainPanel(bpy.types.Panel):
         box.operator("audiomax.analyze_audio", icon="GRAPH")
 
 
+# -------------------------------------------------
+# RECENT LOG — últimas mensagens (buffer em memória, sem ler arquivo)
+# -------------------------------------------------
+
+LOG_ICONS = {
+    amax_log.DEBUG: "INFO",
+    amax_log.INFO: "INFO",
+    amax_log.WARNING: "ERROR",
+    amax_log.ERROR: "CANCEL",
+}
+
+
+class AUDIOMAX_PT_RecentLog(bpy.types.Panel):
+    bl_label = "Recent Log"
+    bl_idname = "AUDIOMAX_PT_recent_log"
+    bl_space_type = "SEQUENCE_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "AudioMax"
+    bl_parent_id = "AUDIOMAX_PT_main_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    max_lines = 12
+
+    def draw(self, context):
+        layout = self.layout
+        records = amax_log.get_recent_records(self.max_lines)
+
+        if not records:
+            layout.label(text="Nenhuma mensagem")
+            return
+
+        col = layout.column(align=True)
+        for created, level, message in reversed(records):
+            col.label(text=f"{time.strftime('%H:%M:%S', time.localtime(created))} {message}", icon=LOG_ICONS.get(level, "INFO"))
+
+        layout.operator("audiomax.clear_log", icon="TRASH")
+
+
+# -------------------------------------------------
+# PROFILING — resumo por operação (utils.profiling)
+# -------------------------------------------------
+
+class AUDIOMAX_PT_Profiling(bpy.types.Panel):
+    bl_label = "Profiling"
+    bl_idname = "AUDIOMAX_PT_profiling"
+    bl_space_type = "SEQUENCE_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "AudioMax"
+    bl_parent_id = "AUDIOMAX_PT_main_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    max_rows = 10
+
+    def draw(self, context):
+        layout = self.layout
+
+        row = layout.row(align=True)
+        if profiling.is_enabled():
+            row.operator("audiomax.toggle_profiling", text="Stop", icon="PAUSE")
+        else:
+            row.operator("audiomax.toggle_profiling", text="Start", icon="REC")
+            row.operator("audiomax.toggle_profiling", text="Start + Memory", icon="MEMORY").memory = True
+        row.operator("audiomax.reset_profiling", text="", icon="TRASH")
+
+        rows = profiling.summary()[:self.max_rows]
+        if not rows:
+            layout.label(text="Nenhuma medição")
+            return
+
+        table = layout.column(align=True)
+        header = table.row()
+        header.label(text="Operação")
+        header.label(text="N")
+        header.label(text="Total ms")
+        header.label(text="Média ms")
+
+        for item in rows:
+            line = table.row()
+            line.label(text=item["name"])
+            line.label(text=str(item["count"]))
+            line.label(text=f"{item['total_ms']:.1f}")
+            line.label(text=f"{item['mean_ms']:.1f}")
+
+        layout.operator("audiomax.export_trace", icon="EXPORT")
+
+
+# -------------------------------------------------
+# SCRATCH — uso da área de rascunho (core.scratch)
+# -------------------------------------------------
+
+class AUDIOMAX_PT_Scratch(bpy.types.Panel):
+    bl_label = "Scratch Files"
+    bl_idname = "AUDIOMAX_PT_scratch"
+    bl_space_type = "SEQUENCE_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "AudioMax"
+    bl_parent_id = "AUDIOMAX_PT_main_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        from ..core.scratch import get_scratch_store
+
+        layout = self.layout
+        # Só lê os números em cache: scan da pasta no redraw travaria a UI
+        stats = get_scratch_store().cached_stats()
+        if stats is None:
+            layout.label(text="Calculando...")
+            layout.operator("audiomax.clean_scratch", icon="TRASH")
+            return
+
+        col = layout.column(align=True)
+        col.label(text=f"{stats['files']} arquivos, {stats['bytes'] / 1e6:.1f} MB")
+        col.label(text=f"Em uso no VSE: {stats['referenced_files']} ({stats['referenced_bytes'] / 1e6:.1f} MB)")
+        col.progress(factor=min(stats["usage"], 1.0), type="BAR",
+                     text=f"Cota: {stats['max_bytes'] / 1e9:.1f} GB")
+        col.label(text=f"Despejados: {stats['evictions']} ({stats['evicted_bytes'] / 1e6:.1f} MB)")
+
+        layout.operator("audiomax.clean_scratch", icon="TRASH")
+
+
 # -------------------------------------------------
 # EXPORT CLASSES — todas as classes usadas pelo __init__.py
 # -------------------------------------------------
@@ -96,4 +262,7 @@ class AUDIOMAX_PT_MainPanel(bpy.types.Panel):
 PANEL_CLASSES = (
     AUDIOMAX_PT_View3D,
     AUDIOMAX_PT_MainPanel,   # ← corrigido: estava faltando aqui
+    AUDIOMAX_PT_RecentLog,
+    AUDIOMAX_PT_Profiling,
+    AUDIOMAX_PT_Scratch,
 )
\ No newline at end of file
@@ -1,6 +1,9 @@
 import os
-import datetime
-from .paths import get_temp_dir
+import sys
+import time
+import atexit
+import threading
+from collections import deque
 
 
 # -------------------------------------------------
@@ -9,52 +12,237 @@ from .paths import get_temp_dir
 
 DEBUG_MODE = True
 LOG_TO_FILE = False
+LOG_TO_CONSOLE = True
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+# Nível mínimo registrado (debug ainda depende de DEBUG_MODE)
+MIN_LEVEL = DEBUG
+
+# Intervalo da thread de escrita e limite da fila em memória
+FLUSH_INTERVAL = 0.1
+MAX_QUEUE = 100000
+
+# Rotação do arquivo de log
+MAX_LOG_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+# Entradas guardadas para o painel "Recent Log"
+RECENT_SIZE = 200
 
 
 # -------------------------------------------------
 # INTERNAL
 # -------------------------------------------------
 
-def _timestamp():
-    return datetime.datetime.now().strftime("%H:%M:%S")
+# (criado em, nível, mensagem) — append em deque é atômico
+_PENDING = deque(maxlen=MAX_QUEUE)
+_RECENT = deque(maxlen=RECENT_SIZE)
+
+_WRITE_LOCK = threading.Lock()
+_START_LOCK = threading.Lock()
+_WAKE = threading.Event()
+_WRITER = None
+_FILE = None
+_FILE_PATH = None
+
+_VERSION = 0
+
+
+def _timestamp(created: float = None):
+    created = time.time() if created is None else created
+    return time.strftime("%H:%M:%S", time.localtime(created))
+
+
+def _format(record) -> str:
+    created, level, message = record
+    return f"[AudioMax {LEVEL_NAMES.get(level, level)} {_timestamp(created)}] {message}"
+
+
+def _log_path() -> str:
+    from .paths import get_temp_dir
+    return os.path.join(get_temp_dir(), "audio_max.log")
+
+
+def _rotate():
+    global _FILE
+    _FILE.close()
+    _FILE = None
+
+    for index in range(LOG_BACKUPS - 1, 0, -1):
+        src = f"{_FILE_PATH}.{index}"
+        if os.path.exists(src):
+            os.replace(src, f"{_FILE_PATH}.{index + 1}")
+
+    if LOG_BACKUPS > 0:
+        os.replace(_FILE_PATH, f"{_FILE_PATH}.1")
+    else:
+        os.remove(_FILE_PATH)
+
+
+def _write_to_file(lines: list):
+    global _FILE, _FILE_PATH
+
+    if _FILE is None:
+        _FILE_PATH = _log_path()
+        _FILE = open(_FILE_PATH, "a", encoding="utf-8")
+
+    _FILE.write("\n".join(lines) + "\n")
+    _FILE.flush()
+
+    if _FILE.tell() >= MAX_LOG_BYTES:
+        _rotate()
+
+
+def _drain():
+    """
+    Escreve tudo o que está na fila em um lote (console + arquivo).
+    """
+    with _WRITE_LOCK:
+        records = []
+        while _PENDING:
+            try:
+                records.append(_PENDING.popleft())
+            except IndexError:
+                break
+
+        if not records:
+            return
+
+        lines = [_format(r) for r in records]
 
+        if LOG_TO_CONSOLE:
+            try:
+                sys.stdout.write("\n".join(lines) + "\n")
+                sys.stdout.flush()
+            except (OSError, ValueError, AttributeError):
+                pass
 
-def _write_to_file(message: str):
-    if not LOG_TO_FILE:
+        if LOG_TO_FILE:
+            try:
+                _write_to_file(lines)
+            except OSError:
+                pass
+
+
+def _writer_loop():
+    while True:
+        _WAKE.wait(FLUSH_INTERVAL)
+        _WAKE.clear()
+        _drain()
+
+
+def _ensure_writer():
+    global _WRITER
+    if _WRITER is not None:
         return
 
-    log_file = os.path.join(get_temp_dir(), "audio_max.log")
+    with _START_LOCK:
+        if _WRITER is None:
+            thread = threading.Thread(target=_writer_loop, name="AudioMaxLogWriter", daemon=True)
+            thread.start()
+            _WRITER = thread
 
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(message + "\n")
 
+def _log(level: int, message, args):
+    global _VERSION
+
+    # Filtra antes de formatar: mensagens descartadas não custam nada
+    if level < MIN_LEVEL:
+        return
+
+    if args:
+        try:
+            message = message % args
+        except (TypeError, ValueError):
+            message = f"{message} {args}"
 
-def _log(level: str, message: str):
-    formatted = f"[AudioMax {level} {_timestamp()}] {message}"
+    record = (time.time(), level, message)
+    _PENDING.append(record)
+    _RECENT.append(record)
+    _VERSION += 1
 
-    print(formatted)
-    _write_to_file(formatted)
+    _ensure_writer()
+    if level >= ERROR:
+        _WAKE.set()
 
 
 # -------------------------------------------------
 # PUBLIC API
 # -------------------------------------------------
+# Mensagens aceitam argumentos no estilo %: debug("lido %s em %.1f ms", path, ms)
+# só formata se o nível estiver ativo.
 
-def info(message: str):
-    _log("INFO", message)
+def info(message: str, *args):
+    _log(INFO, message, args)
 
 
-def warning(message: str):
-    _log("WARNING", message)
+def warning(message: str, *args):
+    _log(WARNING, message, args)
 
 
-def error(message: str):
-    _log("ERROR", message)
+def error(message: str, *args):
+    _log(ERROR, message, args)
 
 
-def debug(message: str):
+def debug(message: str, *args):
     if DEBUG_MODE:
-        _log("DEBUG", message)
+        _log(DEBUG, message, args)
+
+
+def is_enabled(level: int) -> bool:
+    """
+    Para pular trabalho caro (ex.: montar um f-string grande) em loops.
+    """
+    if level == DEBUG and not DEBUG_MODE:
+        return False
+    return level >= MIN_LEVEL
+
+
+def flush():
+    """
+    Escreve a fila agora, na thread atual.
+    """
+    _drain()
+
+
+def get_recent(count: int = None, min_level: int = DEBUG) -> list:
+    """
+    Últimas entradas do log (mais antiga primeiro), já formatadas.
+    """
+    records = [r for r in list(_RECENT) if r[1] >= min_level]
+    if count is not None:
+        records = records[-count:]
+    return [_format(r) for r in records]
+
+
+def get_recent_records(count: int = None) -> list:
+    """
+    Últimas entradas como (criado em, nível, mensagem).
+    """
+    records = list(_RECENT)
+    return records[-count:] if count is not None else records
+
+
+def get_version() -> int:
+    """
+    Muda a cada mensagem; a UI redesenha quando muda.
+    """
+    return _VERSION
+
+
+def clear_recent():
+    global _VERSION
+    _RECENT.clear()
+    _VERSION += 1
+
+
+atexit.register(flush)
 
 
 # -------------------------------------------------
@@ -66,6 +254,22 @@ def set_debug(enabled: bool):
     DEBUG_MODE = enabled
 
 
+def set_level(level: int):
+    global MIN_LEVEL
+    MIN_LEVEL = level
+
+
 def set_log_to_file(enabled: bool):
-    global LOG_TO_FILE
-    LOG_TO_FILE = enabled
\ No newline at end of file
+    global LOG_TO_FILE, _FILE
+    flush()
+    LOG_TO_FILE = enabled
+
+    if not enabled and _FILE is not None:
+        with _WRITE_LOCK:
+            _FILE.close()
+            _FILE = None
+
+
+def set_log_to_console(enabled: bool):
+    global LOG_TO_CONSOLE
+    LOG_TO_CONSOLE = enabled
@@ -1,6 +1,5 @@
 import os
 import sys
-import tempfile
 from .system_info import is_windows, is_mac, is_linux
 try:
     import bpy
@@ -33,6 +32,42 @@ def get_ffmpeg_path() -> str:
     return ""
 
 
+def resolve_ffmpeg() -> str:
+    """
+    FFmpeg embutido quando existir; senão o do PATH do sistema.
+    """
+    bundled = get_ffmpeg_path()
+    if bundled and os.path.isfile(bundled):
+        return bundled
+
+    import shutil
+    return shutil.which("ffmpeg") or "ffmpeg"
+
+
+# -------------------------------------------------
+# BUNDLED LIBS
+# -------------------------------------------------
+
+def get_libs_dir() -> str:
+    base_dir = os.path.dirname(os.path.dirname(__file__))
+    return os.path.join(base_dir, "libs")
+
+
+def add_bundled_wheels():
+    """
+    Coloca os wheels puros de libs/ no sys.path (importados via zipimport).
+    Vão para o fim: uma versão já instalada no Python do Blender tem prioridade.
+    """
+    libs = get_libs_dir()
+    if not os.path.isdir(libs):
+        return
+
+    for name in sorted(os.listdir(libs)):
+        path = os.path.join(libs, name)
+        if name.endswith(".whl") and path not in sys.path:
+            sys.path.append(path)
+
+
 # -------------------------------------------------
 # ABSOLUTE PATH (Blender Safe)
 # -------------------------------------------------
@@ -78,6 +113,7 @@ def get_temp_dir() -> str:
     """
     Retorna pasta temporária exclusiva do Audio Max.
     """
+    import tempfile
     base = tempfile.gettempdir()
     addon_temp = os.path.join(base, "audio_max")
 
@@ -0,0 +1,286 @@
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+ENABLED = False
+TRACE_MEMORY = False
+
+# Spans guardados para o trace (o resumo por operação não tem limite)
+MAX_SPANS = 50000
+
+_SPANS = deque(maxlen=MAX_SPANS)
+_SUMMARY = {}
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+_ORIGIN = time.perf_counter()
+_STARTED_TRACEMALLOC = False
+
+
+# -------------------------------------------------
+# SPAN
+# -------------------------------------------------
+
+class _NullSpan:
+    """
+    Usado quando a instrumentação está desligada: não mede nada.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """
+    Mede tempo de parede, tempo de CPU (da thread) e, com TRACE_MEMORY,
+    o pico de memória alocada dentro do bloco (tracemalloc).
+    """
+
+    __slots__ = ("name", "args", "start", "cpu_start", "mem_start", "mem_peak", "memory")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+        self.memory = False
+
+    def set(self, **args):
+        """
+        Anexa informações ao span (aparecem no trace).
+        """
+        self.args.update(args)
+
+    def __enter__(self):
+        stack = _stack()
+
+        self.memory = TRACE_MEMORY and _tracemalloc().is_tracing()
+        if self.memory:
+            tracemalloc = _tracemalloc()
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                parent = stack[-1]
+                parent.mem_peak = max(parent.mem_peak, peak)
+            tracemalloc.reset_peak()
+            self.mem_start = self.mem_peak = current
+
+        stack.append(self)
+        self.cpu_start = time.thread_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        cpu = time.thread_time() - self.cpu_start
+
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+
+        memory = None
+        if self.memory and _tracemalloc().is_tracing():
+            _, peak = _tracemalloc().get_traced_memory()
+            self.mem_peak = max(self.mem_peak, peak)
+            memory = self.mem_peak - self.mem_start
+            if stack and stack[-1].memory:
+                stack[-1].mem_peak = max(stack[-1].mem_peak, self.mem_peak)
+
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+
+        _record(self.name, self.start, end - self.start, cpu, memory, self.args)
+        return False
+
+
+def _tracemalloc():
+    # tracemalloc só é importado quando a medição de memória é usada
+    import tracemalloc
+    return tracemalloc
+
+
+def _stack() -> list:
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    return stack
+
+
+def _record(name: str, start: float, wall: float, cpu: float, memory, args: dict):
+    event = {
+        "name": name,
+        "ts": (start - _ORIGIN) * 1e6,
+        "dur": wall * 1e6,
+        "cpu": cpu,
+        "memory": memory,
+        "tid": threading.get_ident(),
+        "thread": threading.current_thread().name,
+        "args": args,
+    }
+
+    with _LOCK:
+        _SPANS.append(event)
+
+        entry = _SUMMARY.get(name)
+        if entry is None:
+            entry = _SUMMARY[name] = {"count": 0, "wall": 0.0, "cpu": 0.0, "max": 0.0, "memory": None}
+
+        entry["count"] += 1
+        entry["wall"] += wall
+        entry["cpu"] += cpu
+        entry["max"] = max(entry["max"], wall)
+        if memory is not None:
+            entry["memory"] = max(entry["memory"] or 0, memory)
+
+
+# -------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------
+
+def span(name: str, **args):
+    """
+    with span("eq.multiband", bands=len(bands)): ...
+    """
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, args)
+
+
+def traced(name=None):
+    """
+    Decorador: @traced ou @traced("nome"). Desligado, custa um if.
+    """
+    def decorate(func):
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            with Span(label, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    if callable(name):
+        func, name = name, None
+        return decorate(func)
+    return decorate
+
+
+def enable(memory: bool = False):
+    """
+    Liga a instrumentação. memory=True liga o tracemalloc (mais lento).
+    """
+    global ENABLED, TRACE_MEMORY, _STARTED_TRACEMALLOC
+    tracemalloc = _tracemalloc()
+
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _STARTED_TRACEMALLOC = True
+
+    TRACE_MEMORY = memory
+    ENABLED = True
+
+
+def disable():
+    global ENABLED, TRACE_MEMORY, _STARTED_TRACEMALLOC
+
+    ENABLED = False
+    TRACE_MEMORY = False
+
+    tracemalloc = _tracemalloc()
+    if _STARTED_TRACEMALLOC and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _STARTED_TRACEMALLOC = False
+
+
+def is_enabled() -> bool:
+    return ENABLED
+
+
+def reset():
+    with _LOCK:
+        _SPANS.clear()
+        _SUMMARY.clear()
+
+
+def get_spans() -> list:
+    with _LOCK:
+        return list(_SPANS)
+
+
+def summary() -> list:
+    """
+    Uma linha por operação, da que mais consumiu tempo para a que menos:
+    {"name", "count", "total_ms", "mean_ms", "max_ms", "cpu_ms", "peak_kb"}
+    """
+    with _LOCK:
+        items = [(name, dict(entry)) for name, entry in _SUMMARY.items()]
+
+    rows = []
+    for name, entry in items:
+        rows.append({
+            "name": name,
+            "count": entry["count"],
+            "total_ms": entry["wall"] * 1000,
+            "mean_ms": entry["wall"] * 1000 / entry["count"],
+            "max_ms": entry["max"] * 1000,
+            "cpu_ms": entry["cpu"] * 1000,
+            "peak_kb": entry["memory"] / 1024 if entry["memory"] is not None else None,
+        })
+
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows
+
+
+def export_chrome_trace(path: str) -> str:
+    """
+    Salva os spans no formato Trace Event do Chrome
+    (abre em chrome://tracing ou ui.perfetto.dev).
+    """
+    import json
+
+    pid = os.getpid()
+    events = []
+    threads = {}
+
+    for event in get_spans():
+        args = dict(event["args"])
+        args["cpu_ms"] = round(event["cpu"] * 1000, 3)
+        if event["memory"] is not None:
+            args["peak_kb"] = round(event["memory"] / 1024, 1)
+
+        threads[event["tid"]] = event["thread"]
+        events.append({
+            "name": event["name"],
+            "cat": "audiomax",
+            "ph": "X",
+            "ts": round(event["ts"], 3),
+            "dur": round(event["dur"], 3),
+            "pid": pid,
+            "tid": event["tid"],
+            "args": {k: v if isinstance(v, (int, float, str, bool)) or v is None else repr(v)
+                     for k, v in args.items()},
+        })
+
+    for tid, thread_name in threads.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                       "args": {"name": thread_name}})
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    return path
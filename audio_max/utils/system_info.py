@@ -1,5 +1,4 @@
 import sys
-import platform
 
 
 # -------------------------------------------------
@@ -30,6 +29,7 @@ def get_architecture() -> str:
     """
     Retorna '32bit' ou '64bit'
     """
+    import platform
     return platform.architecture()[0]
 
 
@@ -38,6 +38,7 @@ def get_architecture() -> str:
 # -------------------------------------------------
 
 def get_python_version() -> str:
+    import platform
     return platform.python_version()
 
 
@@ -0,0 +1,73 @@
+"""
+bpy falso para rodar o addon fora do Blender (benchmarks / scripts).
+
+Cobre só o que o Audio Max usa no import e no register(): tipos base de
+Panel/Operator, props, utils.register_class, app.timers e context.
+"""
+import sys
+import types
+
+
+class _Timers:
+
+    def __init__(self):
+        self.registered = []
+
+    def register(self, func, first_interval=0.0, persistent=False):
+        self.registered.append(func)
+
+    def unregister(self, func):
+        if func in self.registered:
+            self.registered.remove(func)
+
+    def is_registered(self, func):
+        return func in self.registered
+
+
+def _prop(*args, **kwargs):
+    return None
+
+
+def build() -> types.ModuleType:
+    bpy = types.ModuleType("bpy")
+    bpy.__file__ = "<bpy stub>"
+
+    bpy.types = types.SimpleNamespace(
+        Panel=type("Panel", (), {}),
+        Operator=type("Operator", (), {}),
+        PropertyGroup=type("PropertyGroup", (), {}),
+        Scene=type("Scene", (), {}),
+    )
+
+    bpy.props = types.SimpleNamespace(**{
+        name: _prop for name in (
+            "StringProperty", "BoolProperty", "IntProperty", "FloatProperty",
+            "EnumProperty", "PointerProperty", "CollectionProperty",
+        )
+    })
+
+    registered = []
+    bpy.utils = types.SimpleNamespace(
+        register_class=registered.append,
+        unregister_class=lambda cls: registered.remove(cls) if cls in registered else None,
+        registered=registered,
+    )
+
+    bpy.app = types.SimpleNamespace(timers=_Timers(), version=(5, 0, 0), background=True)
+    bpy.path = types.SimpleNamespace(
+        abspath=lambda path: path,
+        ensure_ext=lambda path, ext: path if path.endswith(ext) else path + ext,
+    )
+    bpy.context = types.SimpleNamespace(scene=None, window_manager=None)
+    bpy.ops = types.SimpleNamespace()
+
+    return bpy
+
+
+def install() -> types.ModuleType:
+    """
+    Registra o stub em sys.modules (se ainda não houver um bpy real).
+    """
+    if "bpy" not in sys.modules:
+        sys.modules["bpy"] = build()
+    return sys.modules["bpy"]
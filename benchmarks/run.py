@@ -0,0 +1,269 @@
+"""
+Benchmarks headless do Audio Max (sem Blender).
+
+    python benchmarks/run.py                         # roda e imprime
+    python benchmarks/run.py -o results.json         # salva JSON
+    python benchmarks/run.py --baseline base.json    # falha se regredir
+    python benchmarks/run.py --only eq. --seconds 60 --channels 2
+
+Cada benchmark roda `--repeat` vezes; a mediana é comparada com a da
+baseline. Sai com código 1 se algum ficar mais lento que
+baseline * (1 + threshold).
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import bpy_stub, synthetic  # noqa: E402
+
+
+# -------------------------------------------------
+# SUITE
+# -------------------------------------------------
+
+def _audio_benchmarks(segment, workdir: str) -> dict:
+    from audio_max.core import audio_processing as proc
+    from audio_max.core import eq, loudness, peaks, waveform
+    from audio_max.core.chain import ProcessingChain
+    from audio_max.core.frame_metrics import segment_to_array
+
+    wav_path = os.path.join(workdir, "bench.wav")
+    segment.export(wav_path, format="wav")
+    out_path = os.path.join(workdir, "bench_out.wav")
+
+    bands = [
+        {"type": "lowpass", "freq": 120, "gain": 2.0},
+        {"type": "band", "low": 120, "high": 2000, "gain": -1.0},
+        {"type": "band", "low": 2000, "high": 8000, "gain": 1.5},
+        {"type": "highpass", "freq": 8000, "gain": -3.0},
+    ]
+
+    steps = [
+        {"op": "highpass", "cutoff": 80},
+        {"op": "peaking", "freq": 3000, "gain": -2.0},
+        {"op": "gain", "db": -3.0},
+        {"op": "normalize"},
+    ]
+
+    def sequential():
+        out = eq.apply_highpass(segment, 80)
+        out = eq.apply_peaking(out, 3000, -2.0)
+        return proc.normalize(proc.apply_gain(out, -3.0))
+
+    return {
+        # processing
+        "processing.load_audio": lambda: proc.load_audio(wav_path),
+        "processing.load_audio_range": lambda: proc.load_audio(wav_path, 1000, 2000),
+        "processing.export_audio": lambda: proc.export_audio(segment, wav_path, out_path),
+        "processing.normalize": lambda: proc.normalize(segment),
+        "processing.apply_gain": lambda: proc.apply_gain(segment, -3.0),
+        "processing.trim": lambda: proc.trim(segment, 1000, len(segment) - 1000),
+        "chain.sequential_segment": sequential,
+        "chain.float_segment": lambda: ProcessingChain(steps).process_segment(segment),
+        "chain.process_chain_file": lambda: proc.process_chain(wav_path, steps, out_path),
+        # analysis
+        "peaks.detect_peaks": lambda: peaks.detect_peaks(segment),
+        "peaks.detect_peak_regions": lambda: peaks.detect_peak_regions(segment),
+        "peaks.detect_clipping": lambda: peaks.detect_clipping(segment),
+        "peaks.detect_clipping_regions": lambda: peaks.detect_clipping_regions(segment),
+        "peaks.detect_silences": lambda: peaks.detect_silences(segment),
+        "peaks.get_rms_over_time": lambda: peaks.get_rms_over_time(segment),
+        "loudness.measure_segment": lambda: loudness.measure_loudness(segment),
+        "loudness.measure_file": lambda: loudness.measure_file(wav_path),
+        "waveform.build_levels": lambda: waveform.build_levels([segment_to_array(segment) / 32768.0]),
+        # eq
+        "eq.apply_lowpass": lambda: eq.apply_lowpass(segment, 1000),
+        "eq.apply_highpass": lambda: eq.apply_highpass(segment, 200, order=4),
+        "eq.apply_peaking": lambda: eq.apply_peaking(segment, 1000, 3.0),
+        "eq.apply_3band_eq": lambda: eq.apply_3band_eq(segment, 2.0, -1.0, 3.0),
+        "eq.apply_multiband_eq": lambda: eq.apply_multiband_eq(segment, bands),
+        "eq.apply_fir_eq": lambda: eq.apply_fir_eq(segment, bands),
+    }
+
+
+def _detector_benchmarks(workdir: str, tree: dict) -> dict:
+    from audio_max.external import daw_detector, host_index
+
+    root = os.path.join(workdir, "hosts")
+    stats = synthetic.make_host_tree(root, **tree)
+
+    # Só a árvore sintética: sem PATH, sem .desktop do sistema
+    daw_detector._get_base_paths = lambda: [root]
+    daw_detector._detect_from_path = lambda: []
+    host_index._get_base_paths = daw_detector._get_base_paths
+    host_index._detect_from_path = daw_detector._detect_from_path
+    host_index._desktop_dirs = lambda: []
+
+    index_path = os.path.join(workdir, "host_index.json")
+
+    def cold():
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        return host_index.HostIndex(index_path).refresh()
+
+    def warm():
+        return host_index.HostIndex(index_path).refresh()
+
+    cold()
+    print(f"  árvore sintética: {stats['dirs']} pastas, {stats['files']} arquivos, "
+          f"{len(stats['hosts'])} hosts")
+
+    return {
+        "detector.scan_legacy": lambda: daw_detector.detect_all_audio_hosts(use_index=False),
+        "detector.index_cold": cold,
+        "detector.index_warm": warm,
+    }
+
+
+# -------------------------------------------------
+# RUN
+# -------------------------------------------------
+
+def _time(func, repeat: int) -> list:
+    func()  # aquecimento (imports, caches de design de filtro)
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - started)
+    return runs
+
+
+def run_suite(args) -> dict:
+    bpy_stub.install()
+    import audio_max  # noqa: F401  (import completo, como no Blender)
+    from audio_max.utils.logging import set_debug
+    set_debug(False)
+
+    workdir = tempfile.mkdtemp(prefix="amax_bench_")
+    results = {}
+
+    try:
+        segment = synthetic.make_segment(args.seconds, args.channels, args.sample_rate, args.seed)
+        benchmarks = _audio_benchmarks(segment, workdir)
+        benchmarks.update(_detector_benchmarks(workdir, {
+            "breadth": args.tree_breadth,
+            "depth": args.tree_depth,
+            "files_per_dir": args.tree_files,
+            "seed": args.seed,
+        }))
+
+        for name, func in benchmarks.items():
+            if args.only and not any(fnmatch.fnmatch(name, f"*{pattern}*") for pattern in args.only):
+                continue
+
+            runs = _time(func, args.repeat)
+            results[name] = {
+                "median": statistics.median(runs),
+                "min": min(runs),
+                "runs": runs,
+            }
+            print(f"  {name:<32} {results[name]['median'] * 1000:10.2f} ms")
+
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": _version("numpy"),
+            "scipy": _version("scipy"),
+            "seconds": args.seconds,
+            "channels": args.channels,
+            "sample_rate": args.sample_rate,
+            "repeat": args.repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def _version(module: str):
+    try:
+        return __import__(module).__version__
+    except ImportError:
+        return None
+
+
+# -------------------------------------------------
+# COMPARE
+# -------------------------------------------------
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Retorna a lista de regressões: (nome, baseline_s, atual_s, razão).
+    Benchmarks que não existem nos dois lados são ignorados.
+    """
+    regressions = []
+
+    for name, base in baseline.get("results", {}).items():
+        now = current["results"].get(name)
+        if now is None or base["median"] <= 0:
+            continue
+
+        ratio = now["median"] / base["median"]
+        flag = "REGRESSÃO" if ratio > 1.0 + threshold else ""
+        print(f"  {name:<32} {base['median'] * 1000:10.2f} -> {now['median'] * 1000:10.2f} ms "
+              f"({ratio:5.2f}x) {flag}")
+
+        if flag:
+            regressions.append((name, base["median"], now["median"], ratio))
+
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks headless do Audio Max")
+    parser.add_argument("-o", "--output", help="salva os resultados em JSON")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="tolerância antes de acusar regressão (0.25 = 25%%)")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--tree-breadth", type=int, default=6)
+    parser.add_argument("--tree-depth", type=int, default=4)
+    parser.add_argument("--tree-files", type=int, default=40)
+    parser.add_argument("--only", action="append", help="filtra benchmarks por nome (pode repetir)")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore", message="Couldn't find ffmpeg")
+
+    print(f"Audio Max benchmarks: {args.seconds:g}s, {args.channels} canais, {args.sample_rate} Hz")
+    current = run_suite(args)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Resultados salvos em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        print(f"Comparando com {args.baseline} (tolerância {args.threshold:.0%}):")
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) mais lentos que a baseline.")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
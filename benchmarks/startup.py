@@ -0,0 +1,176 @@
+"""
+Custo de inicialização do addon: import + register() em um Python novo.
+
+    python benchmarks/startup.py                      # mede e imprime
+    python benchmarks/startup.py -o startup.json      # salva JSON
+    python benchmarks/startup.py --baseline old.json  # falha se regredir
+    python benchmarks/startup.py --ref f6cbff3        # antes x depois
+
+Cada rodada é um processo separado (cache de import frio no Python,
+como na abertura do Blender). Também lista as dependências pesadas que
+o register() carregou — o esperado é nenhuma.
+
+--ref mede também o addon de um commit (git archive em uma pasta
+temporária, com o bpy falso desta árvore) e compara com a árvore atual.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.run import compare  # noqa: E402
+
+# Não deveriam ser carregados só por abrir o Blender com o addon ativo
+HEAVY_MODULES = ("pydub", "numpy", "scipy", "pythonosc", "concurrent.futures",
+                 "multiprocessing", "audio_max.core.eq", "audio_max.core.peaks",
+                 "audio_max.core.audio_processing", "audio_max.external.daw_detector")
+
+_PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+sys.path.append({stub_dir!r})
+started = time.perf_counter()
+import bpy_stub
+bpy_stub.install()
+baseline = set(sys.modules)
+stub = time.perf_counter() - started
+
+started = time.perf_counter()
+import audio_max
+imported = time.perf_counter()
+audio_max.register()
+registered = time.perf_counter()
+
+import threading
+loaded = sorted(set(sys.modules) - baseline)
+print(json.dumps({{
+    "import": imported - started,
+    "register": registered - imported,
+    "modules": loaded,
+    "threads": [t.name for t in threading.enumerate() if t is not threading.main_thread()],
+}}))
+"""
+
+
+def probe(root: str = ROOT) -> dict:
+    """
+    Um processo novo importando o audio_max de `root`. O bpy falso vem
+    sempre desta árvore (commits antigos não têm benchmarks/).
+    """
+    stub_dir = os.path.join(ROOT, "benchmarks")
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(root=root, stub_dir=stub_dir)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def checkout_ref(ref: str) -> str:
+    """
+    Extrai audio_max/ do commit `ref` em uma pasta temporária.
+    """
+    target = tempfile.mkdtemp(prefix="amax_startup_")
+    archive = subprocess.run(["git", "-C", ROOT, "archive", ref, "audio_max"],
+                             capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", target], input=archive, check=True)
+    return target
+
+
+def run_startup(repeat: int, root: str = ROOT) -> dict:
+    runs = [probe(root) for _ in range(repeat)]
+    last = runs[-1]
+
+    results = {}
+    for key in ("import", "register"):
+        values = [r[key] for r in runs]
+        results[f"startup.{key}"] = {"median": statistics.median(values), "min": min(values), "runs": values}
+
+    totals = [r["import"] + r["register"] for r in runs]
+    results["startup.total"] = {"median": statistics.median(totals), "min": min(totals), "runs": totals}
+
+    addon_modules = [m for m in last["modules"] if m.startswith("audio_max")]
+    heavy = [m for m in HEAVY_MODULES if m in last["modules"]]
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "modules_loaded": len(last["modules"]),
+            "addon_modules": addon_modules,
+            "heavy_modules": heavy,
+            "threads": last["threads"],
+        },
+        "results": results,
+    }
+
+
+def report(run: dict):
+    meta = run["meta"]
+    for name, result in run["results"].items():
+        print(f"  {name:<20} {result['median'] * 1000:8.2f} ms (min {result['min'] * 1000:.2f})")
+    print(f"  módulos carregados: {meta['modules_loaded']} ({len(meta['addon_modules'])} do addon)")
+    print(f"  dependências pesadas: {', '.join(meta['heavy_modules']) or 'nenhuma'}")
+    print(f"  threads iniciadas: {', '.join(meta['threads']) or 'nenhuma'}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tempo de import + register() do Audio Max")
+    parser.add_argument("-o", "--output", help="salva os resultados em JSON")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="tolerância antes de acusar regressão (0.25 = 25%%)")
+    parser.add_argument("--ref", help="commit git a medir também, como antes (ex.: a versão anterior)")
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    reference = None
+    if args.ref:
+        root = checkout_ref(args.ref)
+        try:
+            reference = run_startup(args.repeat, root)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+        reference["meta"]["ref"] = args.ref
+
+        print(f"Antes ({args.ref}):")
+        report(reference)
+        print("Depois (árvore atual):")
+
+    current = run_startup(args.repeat)
+    report(current)
+
+    if reference is not None:
+        current["reference"] = reference
+        print(f"Comparando com {args.ref}:")
+        compare(current, reference, args.threshold)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Resultados salvos em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        print(f"Comparando com {args.baseline} (tolerância {args.threshold:.0%}):")
+        if compare(current, baseline, args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Dados sintéticos determinísticos para os benchmarks.
+"""
+import os
+
+import numpy as np
+
+
+# -------------------------------------------------
+# AUDIO
+# -------------------------------------------------
+
+def make_samples(seconds: float = 30.0,
+                 channels: int = 2,
+                 sample_rate: int = 44100,
+                 seed: int = 1234) -> np.ndarray:
+    """
+    Array int16 (frames, canais) alternando trechos de 0.5–3 s de:
+    tom, ruído, silêncio e rajadas clipadas. Mesmo seed = mesmo áudio.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sample_rate)
+    out = np.zeros((total, channels), dtype=np.float64)
+
+    pos = 0
+    kinds = ("tone", "noise", "silence", "clipped")
+
+    while pos < total:
+        length = min(int(rng.uniform(0.5, 3.0) * sample_rate), total - pos)
+        kind = kinds[rng.integers(len(kinds))]
+        t = np.arange(length) / sample_rate
+
+        if kind == "tone":
+            freq = rng.uniform(60, 8000)
+            chunk = 0.5 * np.sin(2 * np.pi * freq * t)[:, None]
+        elif kind == "noise":
+            chunk = rng.normal(0, 0.15, (length, channels))
+        elif kind == "silence":
+            chunk = rng.normal(0, 0.0005, (length, channels))
+        else:
+            chunk = 1.6 * np.sin(2 * np.pi * rng.uniform(100, 1000) * t)[:, None]
+
+        out[pos:pos + length] = chunk
+        pos += length
+
+    return (np.clip(out, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def make_segment(seconds: float = 30.0, channels: int = 2, sample_rate: int = 44100, seed: int = 1234):
+    from pydub import AudioSegment
+
+    samples = make_samples(seconds, channels, sample_rate, seed)
+    return AudioSegment(samples.tobytes(), frame_rate=sample_rate, sample_width=2, channels=channels)
+
+
+# -------------------------------------------------
+# FILESYSTEM
+# -------------------------------------------------
+
+HOST_NAMES = ("reaper", "carla-rack", "ardour8", "bitwig-studio", "vsthost", "audacity")
+
+
+def make_host_tree(root: str,
+                   breadth: int = 6,
+                   depth: int = 4,
+                   files_per_dir: int = 40,
+                   hosts_every: int = 25,
+                   seed: int = 1234) -> dict:
+    """
+    Árvore de pastas parecida com /opt: breadth^depth pastas, arquivos
+    comuns e, de vez em quando, um executável com nome de DAW.
+    Retorna {"dirs", "files", "hosts"}.
+    """
+    rng = np.random.default_rng(seed)
+    stats = {"dirs": 0, "files": 0, "hosts": []}
+    os.makedirs(root, exist_ok=True)
+
+    def fill(path, level):
+        stats["dirs"] += 1
+
+        for i in range(files_per_dir):
+            if rng.integers(hosts_every) == 0:
+                name = f"{HOST_NAMES[rng.integers(len(HOST_NAMES))]}-{stats['files']}"
+                stats["hosts"].append(os.path.join(path, name))
+            else:
+                name = f"lib{stats['files']}_{i}.so"
+
+            file_path = os.path.join(path, name)
+            with open(file_path, "wb"):
+                pass
+            os.chmod(file_path, 0o755)
+            stats["files"] += 1
+
+        if level < depth:
+            for b in range(breadth):
+                sub = os.path.join(path, f"pkg{level}_{b}")
+                os.makedirs(sub, exist_ok=True)
+                fill(sub, level + 1)
+
+    fill(root, 1)
+    return stats
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# O pacote do addon importa sem o Blender (bpy = None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
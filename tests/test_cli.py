@@ -0,0 +1,29 @@
+"""
+Coleta de entradas da linha de comando.
+"""
+import pytest
+
+from audio_max.cli import collect_inputs
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+
+
+def test_output_dir_inside_input_is_skipped(tmp_path):
+    for name in ("a.wav", "sub/b.wav", "out/a.wav", "out/sub/b.wav"):
+        _touch(tmp_path / "in" / name)
+
+    files = collect_inputs([str(tmp_path / "in")], exclude=[str(tmp_path / "in" / "out")])
+    assert [relative for _, relative in files] == ["a.wav", "sub/b.wav"]
+
+    pattern = str(tmp_path / "in" / "**" / "*.wav")
+    files = collect_inputs([pattern], exclude=[str(tmp_path / "in" / "out")])
+    assert len(files) == 2
+
+
+def test_input_inside_output_dir_is_an_error(tmp_path):
+    _touch(tmp_path / "in" / "a.wav")
+    with pytest.raises(ValueError):
+        collect_inputs([str(tmp_path / "in")], exclude=[str(tmp_path / "in")])
@@ -0,0 +1,25 @@
+"""
+EQ por crossover em sample rates baixos: crossovers fixos acima de
+Nyquist são descartados em vez de levantar erro.
+"""
+import numpy as np
+
+from audio_max.core.chain import ProcessingChain
+from audio_max.core.crossover import clamp_crossovers
+
+
+def test_clamp_drops_bands_above_nyquist():
+    assert clamp_crossovers([200, 4000], [1, 2, 3], 8000) == ([200], [1, 2])
+    assert clamp_crossovers([200, 4000], [1, 2, 3], 48000) == ([200, 4000], [1, 2, 3])
+
+
+def test_eq3_on_8khz_audio_is_flat_at_0db():
+    t = np.arange(4000) / 8000
+    samples = (0.5 * np.sin(2 * np.pi * 1000 * t)).astype(np.float32)[:, None]
+
+    out = ProcessingChain([{"op": "eq3"}]).process(samples.copy(), 8000)
+
+    # Soma plana em magnitude (o crossover só gira a fase)
+    tail = slice(1000, None)
+    rms = lambda x: float(np.sqrt(np.mean(x[tail] ** 2)))
+    assert abs(rms(out) - rms(samples)) < 0.01
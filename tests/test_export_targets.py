@@ -0,0 +1,18 @@
+"""
+Validação dos formatos de exportação.
+"""
+import pytest
+
+from audio_max.core.export_targets import parse_target
+
+
+@pytest.mark.parametrize("rate", [88200, 96000])
+def test_mp3_rejects_rates_above_48k(rate):
+    with pytest.raises(ValueError):
+        parse_target({"format": "MP3", "sample_rate": rate})
+
+
+def test_supported_rates_pass():
+    assert parse_target({"format": "MP3", "sample_rate": 48000})["sample_rate"] == 48000
+    assert parse_target({"format": "OGG", "sample_rate": 96000})["sample_rate"] == 96000
+    assert parse_target({"format": "FLAC", "sample_rate": 96000, "bit_depth": 24})["bit_depth"] == 24
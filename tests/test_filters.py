@@ -0,0 +1,29 @@
+"""
+Filtros LP/HP com corte fora de (0, Nyquist), como em áudio de 8 kHz.
+"""
+import numpy as np
+
+from audio_max.core.chain import ProcessingChain
+from audio_max.core.filters import SOSFilter, design_highpass, design_lowpass
+
+
+def _tone(sample_rate=8000, freq=440.0, seconds=0.5):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)[:, None]
+
+
+def test_lowpass_above_nyquist_passes_through():
+    samples = _tone()
+    out = SOSFilter(design_lowpass(5000, 8000), 1).process(samples)
+    np.testing.assert_allclose(out, samples)
+
+
+def test_highpass_above_nyquist_silences():
+    out = SOSFilter(design_highpass(5000, 8000), 1).process(_tone())
+    assert not np.any(out)
+
+
+def test_chain_filters_accept_high_cutoffs():
+    samples = _tone()
+    chain = ProcessingChain([{"op": "lowpass", "cutoff": 5000, "order": 4}])
+    np.testing.assert_allclose(chain.process(samples.copy(), 8000), samples)
@@ -0,0 +1,145 @@
+"""
+HostPool contra o host de teste (osc_standin.py): nenhum teste precisa
+de uma DAW instalada.
+"""
+import sys
+import time
+
+import pytest
+
+from audio_max.external import osc_pool
+from audio_max.external.osc_pool import HostPool, standin_pool, standin_template
+from audio_max.external.render_runner import RenderRunner, RenderTask
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "in.wav"
+    path.write_bytes(b"RIFF" + b"\0" * 64)
+    return path
+
+
+def _wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_warm_render_reuses_host(source, tmp_path):
+    with standin_pool(size=1, health_interval=0.2) as pool:
+        first = pool.render(str(source), str(tmp_path / "a.wav"), timeout=20)
+        second = pool.render(str(source), str(tmp_path / "b.wav"), timeout=20)
+
+        assert first["error"] is None and second["error"] is None
+        assert (tmp_path / "b.wav").read_bytes() == source.read_bytes()
+        assert first["host_port"] == second["host_port"]
+        assert pool.status()["starts"] == 1
+
+
+def test_restart_after_kill(source, tmp_path):
+    with standin_pool(size=1, health_interval=0.1, delay=1.0) as pool:
+        request = pool.submit(str(source), str(tmp_path / "out.wav"), timeout=30)
+        assert _wait_for(lambda: any(h.current is request for h in pool.hosts.values()))
+
+        host = next(iter(pool.hosts.values()))
+        host.proc.kill()
+
+        result = request.wait(30)
+        assert result is not None and result["error"] is None
+        assert result["attempts"] == 2
+        assert result["host_port"] != host.port
+
+        status = pool.status()
+        assert status["restarts"] == 1
+        assert status["starts"] == 2
+
+
+def test_startup_timeout_fails_queue(source, tmp_path, monkeypatch):
+    monkeypatch.setattr(osc_pool, "MAX_STARTUP_FAILURES", 2)
+
+    with standin_pool(size=1, health_interval=0.1, startup_timeout=0.3, startup=60.0) as pool:
+        request = pool.submit(str(source), str(tmp_path / "out.wav"))
+
+        result = request.wait(15)
+        assert result is not None
+        assert result["output"] is None and "iniciar" in result["error"]
+
+        status = pool.status()
+        assert status["failed"] and status["queued"] == 0
+        assert status["startup_failures"] == 2
+
+        # Pool falho não inicia mais hosts
+        later = pool.render(str(source), str(tmp_path / "later.wav"))
+        assert later["error"] == status["failed"]
+        assert pool.status()["starts"] == 2
+
+
+def test_queued_request_times_out_from_submit(source, tmp_path):
+    with standin_pool(size=1, health_interval=0.1, startup_timeout=60, startup=60.0) as pool:
+        started = time.monotonic()
+        result = pool.render(str(source), str(tmp_path / "out.wav"), timeout=0.5)
+
+        assert result["error"] and result["output"] is None
+        assert time.monotonic() - started < 5
+
+
+def test_real_daw_requires_template():
+    assert osc_pool.get_osc_template("/opt/REAPER/reaper") is None
+    with pytest.raises(ValueError):
+        HostPool("/usr/bin/carla")
+
+
+def test_missing_input_fails_at_load(source, tmp_path):
+    with standin_pool(size=1, health_interval=0.2) as pool:
+        missing = pool.render(str(tmp_path / "nope.wav"), str(tmp_path / "a.wav"), timeout=20)
+        assert missing["output"] is None and "abrir" in missing["error"]
+        assert missing["attempts"] == 1
+
+        # O host continua utilizável depois da recusa
+        ok = pool.render(str(source), str(tmp_path / "b.wav"), timeout=20)
+        assert ok["error"] is None
+        assert pool.status()["starts"] == 1
+
+
+def test_cancel_in_flight_stops_host(source, tmp_path):
+    with standin_pool(size=1, health_interval=0.2, delay=5.0) as pool:
+        request = pool.submit(str(source), str(tmp_path / "out.wav"), timeout=30)
+        queued = pool.submit(str(source), str(tmp_path / "queued.wav"), timeout=30)
+        assert _wait_for(lambda: any(h.state == osc_pool.BUSY for h in pool.hosts.values()))
+
+        pool.cancel(queued)
+        pool.cancel(request)
+
+        assert request.result["error"] == "Cancelado"
+        assert queued.result["error"] == "Cancelado"
+        assert pool.status()["queued"] == 0 and not pool.hosts
+
+
+def test_runner_routes_osc_tasks_through_pool(source, tmp_path):
+    template = standin_template()
+    tasks = [RenderTask(sys.executable, str(source), str(tmp_path / f"{i}.wav"), osc_template=template)
+             for i in range(3)]
+
+    try:
+        results = RenderRunner(workers=2, timeout=30).run(tasks)
+        status = osc_pool.get_host_pool(sys.executable).status()
+    finally:
+        osc_pool.shutdown_pools()
+
+    assert [r["error"] for r in results] == [None, None, None]
+    assert all(r["returncode"] == 0 for r in results)
+    assert status["renders"] == 3 and status["starts"] <= 2
+
+
+def test_registered_template_selects_pool():
+    osc_pool.set_osc_template("/opt/carla/carla", "{host} --osc {osc_port} {reply_port}")
+    try:
+        assert RenderTask("/opt/carla/carla", "in.wav", "out.wav").osc_template
+        assert HostPool("/opt/carla/carla").template.startswith("{host}")
+    finally:
+        osc_pool.set_osc_template("/opt/carla/carla", None)
+
+    assert RenderTask("/opt/carla/carla", "in.wav", "out.wav").osc_template is None
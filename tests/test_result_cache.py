@@ -0,0 +1,83 @@
+"""
+Chaves do cache de resultados: conteúdo inteiro, operação e parâmetros.
+"""
+import functools
+import os
+
+import numpy as np
+
+from audio_max.core import result_cache
+from audio_max.core.audio_processing import normalize
+from audio_max.core.result_cache import ResultCache, encode_params, fingerprint, operation_name
+
+
+def test_fingerprint_sees_changes_anywhere(tmp_path):
+    path = tmp_path / "long.wav"
+    data = bytearray(os.urandom(3 * result_cache.HASH_BLOCK_BYTES + 17))
+    path.write_bytes(data)
+    before = fingerprint(str(path))
+
+    # Mesmo tamanho e mtime forçado diferente: só o conteúdo mudou
+    data[len(data) // 3] ^= 0xFF
+    path.write_bytes(data)
+    os.utime(path, ns=(1, 1))
+
+    assert fingerprint(str(path)) != before
+
+
+def test_unstable_operations_have_no_name():
+    def make(k):
+        def step(segment):
+            return segment + k
+        return step
+
+    assert operation_name(normalize) == "audio_max.core.audio_processing.normalize"
+    assert operation_name(lambda s: s) is None
+    assert operation_name(make(1)) is None
+    assert operation_name(functools.partial(normalize)) is None
+    assert operation_name(ResultCache("unused").get) is None
+
+
+def test_array_params_hash_their_bytes():
+    a = np.zeros(10000)
+    b = a.copy()
+    b[5000] = 1.0
+
+    assert encode_params({"curve": a}) != encode_params({"curve": b})
+    assert encode_params({"curve": a}) == encode_params({"curve": a.copy()})
+
+
+def test_uncacheable_calls_bypass_cache(tmp_path):
+    source = tmp_path / "in.bin"
+    source.write_bytes(b"abc")
+    cache = ResultCache(str(tmp_path / "cache"))
+
+    assert cache.make_key(str(source), operation_name(lambda s: s)) is None
+    assert cache.make_key(str(source), "op", {"obj": object()}) is None
+
+    calls = []
+    for value in (1, 2):
+        cache.get_or_compute(str(source), None, {}, lambda v=value: calls.append(v) or v)
+    assert calls == [1, 2]
+
+
+def test_traced_analysis_is_cached(tmp_path, monkeypatch):
+    from audio_max.core import peaks
+    from audio_max.core.audio_processing import export_audio
+    from pydub.generators import Sine
+
+    source = str(tmp_path / "tone.wav")
+    export_audio(Sine(440).to_audio_segment(500), source, source)
+
+    cache = ResultCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(peaks, "get_result_cache", lambda: cache)
+
+    assert operation_name(peaks.detect_peaks) == "audio_max.core.peaks.detect_peaks"
+
+    first = peaks.analyze_file(source, peaks.detect_peaks)
+    assert cache.stats()["misses"] == 1
+
+    second = peaks.analyze_file(source, peaks.detect_peaks)
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["memory_hits"] == 1
+    assert second == first
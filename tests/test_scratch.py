@@ -0,0 +1,32 @@
+"""
+Contabilidade da área de rascunho: a UI lê só o snapshot em memória.
+"""
+import os
+
+from audio_max.core.scratch import ScratchStore
+
+
+def _write(store, size):
+    path = store.new_path("wav")
+    with store.write(path) as part:
+        with open(part, "wb") as f:
+            f.write(b"\0" * size)
+    return path
+
+
+def test_cached_stats_follow_writes_and_evictions(tmp_path):
+    store = ScratchStore(str(tmp_path), max_bytes=3000, min_age=0)
+    store.stats()
+
+    paths = [_write(store, 1000) for _ in range(3)]
+    store.sync_references(paths[-1:])
+    cached = store.cached_stats()
+    assert (cached["files"], cached["bytes"], cached["referenced_files"]) == (3, 3000, 1)
+
+    _write(store, 1000)  # passa da cota: o mais antigo sai
+    cached = store.cached_stats()
+    assert cached["files"] == 3 and cached["evictions"] == 1
+    assert not os.path.exists(paths[0])
+
+    fresh = store.stats()
+    assert {k: fresh[k] for k in ("files", "bytes")} == {k: cached[k] for k in ("files", "bytes")}
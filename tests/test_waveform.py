@@ -0,0 +1,40 @@
+"""
+WaveformPyramid.query: colunas mapeadas no intervalo pedido, não nos
+buckets que existem.
+"""
+import numpy as np
+
+from audio_max.core.waveform import WaveformPyramid, build_levels
+
+SAMPLE_RATE = 8192  # buckets de 256 * 2**k caem em segundos inteiros
+
+
+def _pyramid(seconds=10, loud_seconds=5):
+    samples = np.zeros((seconds * SAMPLE_RATE, 1), dtype=np.float32)
+    samples[:loud_seconds * SAMPLE_RATE:2] = 0.9
+    samples[1:loud_seconds * SAMPLE_RATE:2] = -0.9
+    return WaveformPyramid(build_levels([samples]), SAMPLE_RATE)
+
+
+def test_view_past_end_is_not_stretched():
+    result = _pyramid().query(0, 20, 20)
+
+    assert len(result["max"]) == 20
+    np.testing.assert_allclose(result["max"][:5], 0.9)
+    assert not result["max"][5:].any()
+    assert not result["rms"][10:].any()
+
+
+def test_view_before_start_is_empty():
+    result = _pyramid().query(-5, 5, 10)
+
+    assert not result["max"][:5].any()
+    np.testing.assert_allclose(result["max"][5:], 0.9)
+
+
+def test_zoom_beyond_finest_level_repeats_buckets():
+    result = _pyramid().query(1.0, 1.01, 50)
+
+    assert len(result["min"]) == 50
+    np.testing.assert_allclose(result["min"], -0.9)
+    np.testing.assert_allclose(result["rms"], 0.9, rtol=1e-5)